@@ -1,372 +1,330 @@
-# import necessary libraries/packages
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
-from datetime import datetime, timedelta
-import re
-from tkcalendar import DateEntry
-
-
-class Task:
-    # create a Task with name, date deadline, time, and priority level
-    def __init__(self, name, deadline, time_str, priority):
-        self.name = name
-        self.deadline = deadline
-        self.time_str = time_str
-        self.priority = priority
-        self.completed = False
-        self.notified = False  # prevent repeat alerts
-
-    # Return True if the task's date/time is before current time
-    def is_overdue(self):
-        try:
-            full_datetime = f"{self.deadline} {self.time_str}"
-            return datetime.strptime(full_datetime, "%Y-%m-%d %H:%M") < datetime.now()
-        except ValueError:
-            return False
-
-    # Return True if the task is due within the next 10 minutes
-    def is_due_soon(self):
-        try:
-            full_datetime = f"{self.deadline} {self.time_str}"
-            task_time = datetime.strptime(full_datetime, "%Y-%m-%d %H:%M")
-            now = datetime.now()
-            return now <= task_time <= now + timedelta(minutes=10)
-        except ValueError:
-            return False
-
-
-class TaskManagerApp:
-    #window, inputs, control and table set up
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Group 10 Task Manager")
-        self.root.geometry("750x520")
-
-        self.tasks = []
-
-        #Input Frame
-        frame = tk.Frame(root)
-        frame.pack(pady=10)
-
-        # Task name label and name input
-        tk.Label(frame, text="Task:").grid(row=0, column=0)
-        self.task_entry = tk.Entry(frame, width=25)
-        self.task_entry.grid(row=0, column=1, padx=5)
-
-        # select Date or input date
-        tk.Label(frame, text="Date:").grid(row=1, column=0)
-        self.deadline_entry = DateEntry(
-            frame,
-            width=22,
-            background="darkblue",
-            foreground="white",
-            date_pattern="yyyy-mm-dd"
-        )
-        self.deadline_entry.grid(row=1, column=1, padx=5)
-
-        # Time drop down
-        tk.Label(frame, text="Time (HH:MM):").grid(row=2, column=0)
-        time_values = [f"{h:02d}:{m:02d}" for h in range(0, 24) for m in (0, 30)]
-        self.time_combo = ttk.Combobox(frame, values=time_values, width=22)
-        self.time_combo.grid(row=2, column=1, padx=5)
-        self.time_combo.set(datetime.now().strftime("%H:%M"))
-
-        # Priority dropdown
-        tk.Label(frame, text="Priority Level:").grid(row=3, column=0)
-        self.priority_combo = ttk.Combobox(frame, values=["Low", "Medium", "High"], width=22)
-        self.priority_combo.grid(row=3, column=1, padx=5)
-        self.priority_combo.set("Medium")
-
-        # Add Task button
-        add_btn = tk.Button(frame, text="Add Task", command=self.add_task)
-        add_btn.grid(row=4, column=1, pady=5, sticky="e")
-
-        #Task List (Table)
-        self.tree = ttk.Treeview(
-            root,
-            columns=("Name", "Deadline", "Time", "Priority", "Status"),
-            show="headings"
-        )
-        for col, text in zip(("Name", "Deadline", "Time", "Priority", "Status"),
-                             ("Task Name", "Date", "Time", "Priority", "Status")):
-            self.tree.heading(col, text=text)
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Bind drag-and-drop function
-        self.tree.bind("<ButtonPress-1>", self.on_drag_start)
-        self.tree.bind("<B1-Motion>", self.on_drag_motion)
-        self.tree.bind("<ButtonRelease-1>", self.on_drag_drop)
-        self.drag_data = {"start_index": None}
-
-        # Buttons
-        btn_frame = tk.Frame(root)
-        btn_frame.pack(pady=5)
-
-        # Mark complete, Delete task, Edit task,Filter search,Clear search and Export to calendar Buttons
-        tk.Button(btn_frame, text="Mark Complete", command=self.mark_complete).grid(row=0, column=0, padx=5)
-        tk.Button(btn_frame, text="Delete Task", command=self.delete_task).grid(row=0, column=1, padx=5)
-        tk.Button(btn_frame, text="Edit Task", command=self.edit_task).grid(row=0, column=2, padx=5)
-        tk.Button(btn_frame, text="Filter Search", command=self.filter_tasks).grid(row=0, column=3, padx=5)
-        tk.Button(btn_frame, text="Clear Search", command=self.update_tree).grid(row=0, column=4, padx=5)
-        tk.Button(btn_frame, text="Export to Calendar", command=self.export_calendar).grid(row=0, column=5, padx=5)
-
-        # Sort dropdown to choose sorting type
-        tk.Label(btn_frame, text="Sort:").grid(row=0, column=6, padx=(15, 5))
-        self.sort_combo = ttk.Combobox(btn_frame, values=["Sort by Priority", "Sort by Date/Time"], width=18)
-        self.sort_combo.grid(row=0, column=7)
-        self.sort_combo.bind("<<ComboboxSelected>>", self.auto_sort)
-
-        # Progress bar for task completion
-        self.progress = ttk.Progressbar(root, orient="horizontal", length=500, mode="determinate")
-        self.progress.pack(pady=10)
-        self.update_progress()
-
-        # Begin recurring notification checks
-        self.check_notifications()
-
-    # Record index of the row where drag started
-    def on_drag_start(self, event):
-        item = self.tree.identify_row(event.y)
-        if item:
-            self.drag_data["start_index"] = self.tree.index(item)
-
-    # Placeholder for drag motion handling
-    def on_drag_motion(self, event):
-        pass
-
-    # drop selsected task and reorder the tasks list when mouse is released
-    def on_drag_drop(self, event):
-        if self.drag_data["start_index"] is None:
-            return
-        target_item = self.tree.identify_row(event.y)
-        if not target_item:
-            return
-        new_index = self.tree.index(target_item)
-        old_index = self.drag_data["start_index"]
-        if new_index != old_index:
-            task = self.tasks.pop(old_index)
-            self.tasks.insert(new_index, task)
-            self.update_tree()
-        self.drag_data["start_index"] = None
-
-    # Add new task
-    def add_task(self):
-        name = self.task_entry.get()
-        deadline = self.deadline_entry.get()
-        time_str = self.time_combo.get()
-        priority = self.priority_combo.get()
-
-        if not name or not deadline or not time_str:
-            messagebox.showerror("Error", "Please fill all fields.")
-            return
-
-        try:
-            datetime.strptime(deadline, "%Y-%m-%d")
-            datetime.strptime(time_str, "%H:%M")
-        except ValueError:
-            messagebox.showerror("Invalid Format", "Use YYYY-MM-DD for date and HH:MM for time.")
-            return
-
-        task = Task(name, deadline, time_str, priority)
-        self.tasks.append(task)
-        self.update_tree()
-        self.clear_entries()
-
-    # Open edit window to modify name, date, time, and priority
-    def edit_task(self):
-        selected = self.tree.focus()
-        if not selected:
-            messagebox.showwarning("Select Task", "Please select a task to edit.")
-            return
-
-        task_name = self.tree.item(selected, "values")[0]
-        task_to_edit = next((t for t in self.tasks if t.name == task_name), None)
-        if not task_to_edit:
-            return
-
-        edit_window = tk.Toplevel(self.root)
-        edit_window.title("Edit Task")
-        edit_window.geometry("360x300")
-        edit_window.configure(bg="#F5F6FA")
-        edit_window.resizable(False, False)
-
-        tk.Label(edit_window, text="Edit Task Details", font=("Arial", 13, "bold"), bg="#F5F6FA", fg="#333").pack(pady=10)
-
-        #create a labeled entry field
-        def labeled_entry(label, default_value):
-            frame = tk.Frame(edit_window, bg="#F5F6FA")
-            frame.pack(pady=4)
-            tk.Label(frame, text=label, bg="#F5F6FA", fg="#333").pack(anchor="w")
-            entry = tk.Entry(frame, width=35, relief="solid", borderwidth=1)
-            entry.pack()
-            entry.insert(0, default_value)
-            return entry
-
-        name_entry = labeled_entry("Task Name:", task_to_edit.name)
-        date_entry = labeled_entry("Date (YYYY-MM-DD):", task_to_edit.deadline)
-        time_entry = labeled_entry("Time (HH:MM):", task_to_edit.time_str)
-
-        tk.Label(edit_window, text="Priority:", bg="#F5F6FA", fg="#333").pack(anchor="w", padx=15)
-        priority_combo = ttk.Combobox(edit_window, values=["Low", "Medium", "High"], width=32)
-        priority_combo.pack(pady=4)
-        priority_combo.set(task_to_edit.priority)
-
-        # Save  edited values back to the Task object after validation
-        def save_changes():
-            new_name = name_entry.get().strip()
-            new_deadline = date_entry.get().strip()
-            new_time = time_entry.get().strip()
-            new_priority = priority_combo.get().strip()
-
-            if not new_name or not new_deadline or not new_time:
-                messagebox.showerror("Error", "All fields must be filled.")
-                return
-
-            try:
-                datetime.strptime(new_deadline, "%Y-%m-%d")
-                datetime.strptime(new_time, "%H:%M")
-            except ValueError:
-                messagebox.showerror("Invalid Format", "Use YYYY-MM-DD for date and HH:MM for time.")
-                return
-
-            task_to_edit.name = new_name
-            task_to_edit.deadline = new_deadline
-            task_to_edit.time_str = new_time
-            task_to_edit.priority = new_priority
-
-            self.update_tree()
-            messagebox.showinfo("Task Updated", f"'{new_name}' was updated successfully.")
-            edit_window.destroy()
-
-        btn_frame = tk.Frame(edit_window, bg="#F5F6FA")
-        btn_frame.pack(pady=15)
-        tk.Button(btn_frame, text="Save Changes", command=save_changes, bg="#007BFF", fg="white",
-                  relief="flat", padx=12, pady=6).grid(row=0, column=0, padx=8)
-        tk.Button(btn_frame, text="Cancel", command=edit_window.destroy, bg="#B0B0B0", fg="white",
-                  relief="flat", padx=12, pady=6).grid(row=0, column=1, padx=8)
-
-    # Clear the Add Task inputs and reset to default settings
-    def clear_entries(self):
-        self.task_entry.delete(0, tk.END)
-        self.deadline_entry.set_date(datetime.now())
-        self.time_combo.set(datetime.now().strftime("%H:%M"))
-        self.priority_combo.set("Medium")
-
-    # update the table from the tasks list and apply tags/colors
-    def update_tree(self):
-        self.tree.delete(*self.tree.get_children())
-        for task in self.tasks:
-            status = "Completed" if task.completed else "Pending"
-            tag = "completed" if task.completed else ("overdue" if task.is_overdue() else "")
-            self.tree.insert("", "end", values=(task.name, task.deadline, task.time_str, task.priority, status), tags=(tag,))
-        self.tree.tag_configure("overdue", background="tomato")
-        self.tree.tag_configure("completed", background="lightgreen")
-        self.update_progress()
-
-    # Mark the selected task as completed
-    def mark_complete(self):
-        selected = self.tree.focus()
-        if not selected:
-            messagebox.showwarning("Select Task", "Please select a task to mark complete.")
-            return
-        task_name = self.tree.item(selected, "values")[0]
-        for t in self.tasks:
-            if t.name == task_name:
-                t.completed = True
-        self.update_tree()
-
-    # Delete the selected task from the list
-    def delete_task(self):
-        selected = self.tree.focus()
-        if not selected:
-            messagebox.showwarning("Select Task", "Please select a task to delete.")
-            return
-        task_name = self.tree.item(selected, "values")[0]
-        self.tasks = [t for t in self.tasks if t.name != task_name]
-        self.update_tree()
-
-    # filter search Prompt
-    def filter_tasks(self):
-        keyword = simpledialog.askstring("Filter Search", "Enter keyword or regex:")
-        if not keyword:
-            return
-        try:
-            pattern = re.compile(keyword, re.IGNORECASE)
-        except re.error:
-            messagebox.showerror("Invalid Pattern", "Invalid regular expression.")
-            return
-        filtered = [t for t in self.tasks if pattern.search(t.name)]
-        self.tree.delete(*self.tree.get_children())
-        for t in filtered:
-            status = "Completed" if t.completed else "Pending"
-            tag = "completed" if t.completed else ("overdue" if t.is_overdue() else "")
-            self.tree.insert("", "end", values=(t.name, t.deadline, t.time_str, t.priority, status), tags=(tag,))
-        self.tree.tag_configure("overdue", background="tomato")
-        self.tree.tag_configure("completed", background="lightgreen")
-
-    # Sort tasks drop down
-    def auto_sort(self, event=None):
-        option = self.sort_combo.get()
-        if option == "Sort by Priority":
-            order = {"High": 1, "Medium": 2, "Low": 3}
-            self.tasks.sort(key=lambda x: order.get(x.priority, 3))
-        elif option == "Sort by Date/Time":
-            try:
-                self.tasks.sort(key=lambda x: datetime.strptime(f"{x.deadline} {x.time_str}", "%Y-%m-%d %H:%M"))
-            except ValueError:
-                messagebox.showerror("Invalid Date/Time", "One or more tasks have invalid date/time.")
-        self.update_tree()
-
-    # Export created tasks to desktop to enable exporting to local calender
-    def export_calendar(self):
-        if not self.tasks:
-            messagebox.showwarning("No Tasks", "There are no tasks to export.")
-            return
-        ics_content = "BEGIN:VCALENDAR\nVERSION:2.0\nCALSCALE:GREGORIAN\n"
-        for t in self.tasks:
-            try:
-                dtstart = datetime.strptime(f"{t.deadline} {t.time_str}", "%Y-%m-%d %H:%M")
-                ics_content += (
-                    "BEGIN:VEVENT\n"
-                    f"SUMMARY:{t.name}\n"
-                    f"DTSTART:{dtstart.strftime('%Y%m%dT%H%M%S')}\n"
-                    f"DTEND:{dtstart.strftime('%Y%m%dT%H%M%S')}\n"
-                    f"DESCRIPTION:Priority - {t.priority}\n"
-                    "END:VEVENT\n"
-                )
-            except ValueError:
-                continue
-        ics_content += "END:VCALENDAR"
-        file_path = filedialog.asksaveasfilename(defaultextension=".ics", filetypes=[("Calendar files", "*.ics")])
-        if not file_path:
-            return
-        with open(file_path, "w") as f:
-            f.write(ics_content)
-        messagebox.showinfo("Export Successful", f"Tasks exported to {file_path}")
-
-    # Updates the progress bar according to completed tasks
-    def update_progress(self):
-        if not self.tasks:
-            self.progress["value"] = 0
-            return
-        completed = sum(t.completed for t in self.tasks)
-        self.progress["value"] = (completed / len(self.tasks)) * 100
-
-    # notify users of overdue or upcoming tasks  every minute
-    def check_notifications(self):
-        for t in self.tasks:
-            if not t.completed and not t.notified:
-                if t.is_overdue():
-                    messagebox.showwarning("Task Overdue", f"⚠ '{t.name}' is overdue!")
-                    t.notified = True
-                elif t.is_due_soon():
-                    messagebox.showinfo("Upcoming Task", f"🕒 '{t.name}' is due soon!")
-                    t.notified = True
-        self.root.after(60000, self.check_notifications)  # check every minute
-
-
-# starts the main loop
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = TaskManagerApp(root)
-    root.mainloop()
+# import necessary libraries/packages
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+import re
+import argparse
+from date_field import DateField
+from task_engine import TaskEngine
+from task_journal import TaskJournal, DEFAULT_JOURNAL
+from tree_sync import TreeSync
+from virtual_tree import VirtualTreeview
+from notifications import desktop_backend
+from search_index import scan_names
+from recurrence import REPEAT_CHOICES
+from app_controller import AppController
+
+# Filter scans over at least this many names run in a separate process
+PROCESS_SCAN_MIN = 200000
+
+
+class TaskManagerApp:
+    #window, inputs, control and table set up
+    # virtual=True only creates table rows for the tasks in view (for very long lists)
+    # store is a TaskJournal or TaskStore that saves every change (None keeps tasks in memory only)
+    # columnar=True keeps numpy columns for the deadline scans and sorts (see task_columns.py)
+    # desktop is an optional notifications.desktop_backend() that also gets the due/overdue notices
+    # api_port serves the HTTP/JSON API in task_api.py on that port once the saved tasks are loaded
+    def __init__(self, root, virtual=False, store=None, columnar=False, desktop=None, api_port=None):
+        self.root = root
+        self.root.title("Group 10 Task Manager")
+        self.root.geometry("750x550")
+
+        # All task changes go through the engine; this class only handles the window
+        self.engine = TaskEngine(store, columnar)
+        # Saving, loading, the API, undo, notifications, export/import and the edit windows
+        self.controller = AppController(root, self.engine, desktop, api_port)
+
+        #Input Frame
+        frame = tk.Frame(root)
+        frame.pack(pady=10)
+
+        # Task name label and name input
+        tk.Label(frame, text="Task:").grid(row=0, column=0)
+        self.task_entry = tk.Entry(frame, width=25)
+        self.task_entry.grid(row=0, column=1, padx=5)
+
+        # select Date or input date
+        tk.Label(frame, text="Date:").grid(row=1, column=0)
+        # tkcalendar is only imported when the calendar is first opened
+        self.deadline_entry = DateField(frame, width=22)
+        self.deadline_entry.grid(row=1, column=1, padx=5)
+
+        # Time drop down
+        tk.Label(frame, text="Time (HH:MM):").grid(row=2, column=0)
+        time_values = [f"{h:02d}:{m:02d}" for h in range(0, 24) for m in (0, 30)]
+        self.time_combo = ttk.Combobox(frame, values=time_values, width=22)
+        self.time_combo.grid(row=2, column=1, padx=5)
+        self.time_combo.set(datetime.now().strftime("%H:%M"))
+
+        # Priority dropdown
+        tk.Label(frame, text="Priority Level:").grid(row=3, column=0)
+        self.priority_combo = ttk.Combobox(frame, values=["Low", "Medium", "High"], width=22)
+        self.priority_combo.grid(row=3, column=1, padx=5)
+        self.priority_combo.set("Medium")
+
+        # Repeat dropdown; an RRULE such as FREQ=WEEKLY;BYDAY=MO,WE can also be typed in
+        tk.Label(frame, text="Repeat:").grid(row=4, column=0)
+        self.repeat_combo = ttk.Combobox(frame, values=REPEAT_CHOICES, width=22)
+        self.repeat_combo.grid(row=4, column=1, padx=5)
+
+        # Add Task button
+        add_btn = tk.Button(frame, text="Add Task", command=self.add_task)
+        add_btn.grid(row=5, column=1, pady=5, sticky="e")
+
+        #Task List (Table)
+        tree_class = VirtualTreeview if virtual else ttk.Treeview
+        self.tree = tree_class(
+            root,
+            columns=("Name", "Deadline", "Time", "Priority", "Status"),
+            show="headings"
+        )
+        for col, text in zip(("Name", "Deadline", "Time", "Priority", "Status"),
+                             ("Task Name", "Date", "Time", "Priority", "Status")):
+            self.tree.heading(col, text=text)
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tree.tag_configure("overdue", background="tomato")
+        self.tree.tag_configure("completed", background="lightgreen")
+        self.tree_sync = self.tree if virtual else TreeSync(self.tree)
+        # Changes ask for a redraw with controller.refresh(); the table is redrawn once per idle cycle
+        self.controller.render.add("tree", self.update_tree)
+
+        # Bind drag-and-drop function
+        self.tree.bind("<ButtonPress-1>", self.on_drag_start)
+        self.tree.bind("<B1-Motion>", self.on_drag_motion)
+        self.tree.bind("<ButtonRelease-1>", self.on_drag_drop)
+        self.drag_data = {"start_index": None, "block": None}
+
+        # Buttons
+        btn_frame = tk.Frame(root)
+        btn_frame.pack(pady=5)
+
+        # Mark complete, Delete task, Edit task,Filter search,Clear search and Export to calendar Buttons
+        tk.Button(btn_frame, text="Mark Complete", command=self.mark_complete).grid(row=0, column=0, padx=5)
+        tk.Button(btn_frame, text="Delete Task", command=self.delete_task).grid(row=0, column=1, padx=5)
+        tk.Button(btn_frame, text="Edit Task", command=self.edit_task).grid(row=0, column=2, padx=5)
+        tk.Button(btn_frame, text="Filter Search", command=self.filter_tasks).grid(row=0, column=3, padx=5)
+        tk.Button(btn_frame, text="Clear Search", command=self.update_tree).grid(row=0, column=4, padx=5)
+        export_btn = tk.Button(btn_frame, text="Export to Calendar", command=self.controller.export_calendar)
+        export_btn.grid(row=0, column=5, padx=5)
+        import_btn = tk.Button(btn_frame, text="Import Tasks", command=self.controller.import_tasks)
+        import_btn.grid(row=0, column=6, padx=5)
+        # Shift/Ctrl-click picks several rows; Mark Complete and Delete Task act on all of them
+        tk.Button(btn_frame, text="Select All", command=self.select_all).grid(row=1, column=0, padx=5, pady=(5, 0))
+        tk.Button(btn_frame, text="Change Selected", command=self.bulk_edit).grid(row=1, column=1, padx=5, pady=(5, 0))
+        undo, redo = self.controller.undo, self.controller.redo
+        tk.Button(btn_frame, text="Undo", command=undo).grid(row=1, column=2, padx=5, pady=(5, 0))
+        tk.Button(btn_frame, text="Redo", command=redo).grid(row=1, column=3, padx=5, pady=(5, 0))
+        for key, command in (("<Control-z>", undo), ("<Control-y>", redo), ("<Control-Z>", redo)):
+            self.root.bind(key, command)
+
+        # Sort dropdown to choose sorting type
+        tk.Label(btn_frame, text="Sort:").grid(row=0, column=7, padx=(15, 5))
+        self.sort_combo = ttk.Combobox(btn_frame, values=["Sort by Priority", "Sort by Date/Time"], width=18)
+        self.sort_combo.grid(row=0, column=8)
+        self.sort_combo.bind("<<ComboboxSelected>>", self.auto_sort)
+
+        # Progress bar for task completion, the summary line and the notification panel
+        self.controller.make_status(export_btn, import_btn)
+
+        # Load saved tasks once the window has painted, and save them when it closes
+        self.controller.start()
+
+    @property
+    def tasks(self):
+        return self.engine.tasks
+
+    # Record the list position of the task where drag started (row IIDs are task IDs; while filter
+    # results show, the table holds only some of the tasks, so row numbers are not list positions).
+    # Pressing on a row of a multi-row selection drags the whole selection, so keep it selected.
+    def on_drag_start(self, event):
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return
+        self.drag_data["start_index"] = self.tasks.index(int(item))
+        self.drag_data["block"] = None
+        if item in self.tree.selection() and not event.state & 0x0005:
+            block = self.tree_sync.selected_ids()
+            if len(block) > 1:
+                self.drag_data["block"] = block
+                return "break"
+
+    # Placeholder for drag motion handling
+    def on_drag_motion(self, event):
+        pass
+
+    # drop selsected task and reorder the tasks list when mouse is released
+    def on_drag_drop(self, event):
+        if self.drag_data["start_index"] is None:
+            return
+        target_item = self.tree.identify_row(event.y)
+        if not target_item:
+            return
+        new_index = self.tasks.index(int(target_item))
+        old_index = self.drag_data["start_index"]
+        block = self.drag_data["block"]
+        if block and int(target_item) in block:
+            # released on the selection itself: a plain click, which selects just that row
+            self.tree_sync.select([int(target_item)])
+        elif block:
+            self.controller.move_many(block, new_index)
+        elif new_index != old_index:
+            self.controller.move(old_index, new_index)
+        self.drag_data["start_index"] = None
+        self.drag_data["block"] = None
+
+    # Add new task
+    def add_task(self):
+        name = self.task_entry.get()
+        deadline = self.deadline_entry.get()
+        time_str = self.time_combo.get()
+        priority = self.priority_combo.get()
+        repeat = self.repeat_combo.get()
+
+        if self.controller.add(name, deadline, time_str, priority, repeat):
+            self.clear_entries()
+
+    # Return the task on the focused row (row IIDs are task IDs), or None
+    def selected_task(self):
+        selected = self.tree.focus()
+        return self.tasks.get(int(selected)) if selected else None
+
+    # IDs of the tasks on every selected row (after Select All, also rows scrolled out of view)
+    def selected_ids(self):
+        return self.tree_sync.selected_ids()
+
+    # Select every task shown, i.e. all of them or all the filter results
+    def select_all(self):
+        self.tree_sync.select_all()
+
+    # Open edit window to modify name, date, time, priority and repeat
+    def edit_task(self):
+        task_to_edit = self.selected_task()
+        if not task_to_edit:
+            messagebox.showwarning("Select Task", "Please select a task to edit.")
+            return
+        self.controller.edit_window(task_to_edit.id)
+
+    # Give every selected task a new priority and/or a new date and time in one batch
+    def bulk_edit(self):
+        task_ids = self.selected_ids()
+        if not task_ids:
+            messagebox.showwarning("Select Task", "Please select the tasks to change.")
+            return
+        self.controller.bulk_edit_window(task_ids)
+
+    # Clear the Add Task inputs and reset to default settings
+    def clear_entries(self):
+        self.task_entry.delete(0, tk.END)
+        self.deadline_entry.set_date(datetime.now())
+        self.time_combo.set(datetime.now().strftime("%H:%M"))
+        self.priority_combo.set("Medium")
+        self.repeat_combo.set("")
+
+    # update the table from the tasks list, only touching rows that changed
+    def update_tree(self):
+        self.controller.workers.cancel("filter")  # a filter still running would replace the full list
+        self.tree_sync.sync(self.tasks)
+
+    # Mark the selected tasks as completed, with one table refresh for the whole batch
+    def mark_complete(self):
+        task_ids = self.selected_ids()
+        if not task_ids:
+            messagebox.showwarning("Select Task", "Please select a task to mark complete.")
+            return
+        self.controller.complete(task_ids)
+
+    # Delete the selected tasks from the list (asks first when there is more than one)
+    def delete_task(self):
+        task_ids = self.selected_ids()
+        if not task_ids:
+            messagebox.showwarning("Select Task", "Please select a task to delete.")
+            return
+        if len(task_ids) > 1 and not messagebox.askyesno("Delete Tasks", f"Delete {len(task_ids)} tasks?"):
+            return
+        self.controller.delete(task_ids)
+
+    # filter search Prompt
+    def filter_tasks(self):
+        from tkinter import simpledialog
+        keyword = simpledialog.askstring("Filter Search", "Enter keyword or regex:")
+        if not keyword:
+            return
+        try:
+            filtered = self.engine.filter(keyword, scan=False)
+        except re.error:
+            messagebox.showerror("Invalid Pattern", "Invalid regular expression.")
+            return
+        if filtered is not None:
+            self.controller.workers.cancel("filter")
+            self.tree_sync.sync(filtered)
+            return
+        # The search index cannot narrow this pattern: scan every name in the background.
+        # A newer filter replaces this one before its result is shown.
+        snapshot = tuple(self.tasks)
+        names = [t.name for t in snapshot]
+        self.controller.workers.submit(scan_names, names, keyword, key="filter", cpu=len(names) >= PROCESS_SCAN_MIN,
+                                       on_done=lambda hits: self.tree_sync.sync([snapshot[i] for i in hits]))
+
+    # Sort tasks drop down
+    def auto_sort(self, event=None):
+        option = self.sort_combo.get()
+        if option == "Sort by Priority":
+            by = "priority"
+        elif option == "Sort by Date/Time":
+            by = "date"
+        else:
+            by = None
+        if by:
+            self.engine.sort(by)
+            self.controller.save()
+        self.controller.refresh()
+
+# starts the main loop
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Group 10 Task Manager")
+    parser.add_argument("--virtual", action="store_true", help="only create table rows for tasks in view")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL, help="journal file tasks are saved in")
+    parser.add_argument("--db", help="save tasks in this SQLite file instead of a journal")
+    parser.add_argument("--shared", action="store_true",
+                        help="let several windows or programs use the --db file at once and see each other's changes")
+    parser.add_argument("--columnar", action="store_true", help="vectorised deadline checks and sorts (needs numpy)")
+    parser.add_argument("--desktop-notify", action="store_true",
+                        help="also send due/overdue notices to the desktop (needs notify-send or plyer)")
+    parser.add_argument("--api", metavar="PORT", nargs="?", type=int, const=8765,
+                        help="serve the local HTTP/JSON API (task_api.py) on 127.0.0.1:PORT (default 8765)")
+    parser.add_argument("--profile", metavar="FILE", nargs="?", const="task_manager_profile.json",
+                        help="time handlers and event-loop lag, show them live and write them to FILE on exit")
+    args = parser.parse_args()
+    if args.shared and not args.db:
+        parser.error("--shared needs --db")
+    if args.columnar:
+        import task_columns
+        if task_columns.np is None:
+            parser.error("--columnar needs numpy (pip install numpy)")
+    desktop = None
+    if args.desktop_notify:
+        desktop = desktop_backend()
+        if desktop is None:
+            parser.error("--desktop-notify needs notify-send or the plyer package")
+    if args.profile:
+        import atexit
+        from instrumentation import Instrumentation
+        profiler = Instrumentation()
+        profiler.instrument_core()
+        profiler.instrument(TaskManagerApp, (
+            "on_drag_drop", "add_task", "edit_task", "bulk_edit", "update_tree", "mark_complete",
+            "delete_task", "filter_tasks", "auto_sort"))
+        atexit.register(profiler.dump, args.profile)
+    if args.db:
+        from task_store import TaskStore
+        store = TaskStore(args.db, shared=args.shared)
+    else:
+        store = TaskJournal(args.journal)
+    root = tk.Tk()
+    app = TaskManagerApp(root, virtual=args.virtual, store=store, columnar=args.columnar, desktop=desktop,
+                         api_port=args.api)
+    if args.profile:
+        profiler.watch_loop(root)
+        profiler.show_overlay(root)
+    root.mainloop()
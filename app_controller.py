@@ -0,0 +1,443 @@
+import os
+import queue
+import tkinter as tk
+from tkinter import ttk, messagebox
+from deadline_scheduler import DeadlineScheduler, OVERDUE
+from render_scheduler import RenderScheduler
+from notifications import Notifier, NotificationPanel
+from workers import WorkerPool
+from task_engine import TaskError
+from recurrence import REPEAT_CHOICES, repeat_choice
+
+# Pending changes are written out at most this often
+SAVE_DELAY_MS = 500
+# How often to look for changes other windows saved to a shared database
+SYNC_MS = 500
+
+
+# The window-side logic both apps (TASKMANAGER.py and main.py) share around one TaskEngine:
+# loading, saving off the Tk thread, the API, shared-store polling, undo, notifications,
+# export/import jobs, the edit windows, the progress summary and closing.
+# The apps only build their inputs and table and call in here.
+class AppController:
+    # desktop is an optional notifications.desktop_backend() that also gets the due/overdue notices
+    # api_port serves the HTTP/JSON API in task_api.py on that port once the saved tasks are loaded
+    def __init__(self, root, engine, desktop=None, api_port=None):
+        self.root = root
+        self.engine = engine
+        self.desktop = desktop
+        # Slow work (file export/import, full filter scans, saving) runs here; results come back on the Tk thread
+        self.workers = WorkerPool(root)
+        # Changes ask for a redraw with refresh(); each part is redrawn once per idle cycle
+        self.render = RenderScheduler(root)
+        # Deadline notifications fire from a single timer armed for the next due task
+        self.scheduler = DeadlineScheduler(root, self.check_notifications)
+        self.progress = None
+        self.summary_label = None
+        self.notices = None
+        self.notifier = None
+        self.export_btn = None
+        self.import_btn = None
+        self.export_job = None
+        self.import_job = None
+        self._save_timer = None
+        self._save_job = None
+        self._sync_timer = None
+        self.api_port = api_port
+        self.api = None
+        self._loader = engine.load() if engine.store else None
+
+    @property
+    def tasks(self):
+        return self.engine.tasks
+
+    # Progress bar, summary line and notification panel, packed below whatever the app built so far.
+    # export_btn/import_btn are relabelled to cancel while their job runs.
+    def make_status(self, export_btn, import_btn):
+        self.export_btn = export_btn
+        self.import_btn = import_btn
+        self.progress = ttk.Progressbar(self.root, orient="horizontal", length=500, mode="determinate")
+        self.progress.pack(pady=10)
+        # Open tasks per priority, overdue and done counts
+        self.summary_label = tk.Label(self.root, anchor="w")
+        self.summary_label.pack()
+        self.render.add("progress", self.update_progress)
+        self.update_progress()
+        # Due-soon and overdue notices appear here without blocking; bursts are summed up in one line
+        self.notices = NotificationPanel(self.root)
+        self.notifier = Notifier(self.root, self.notices.show, self.desktop)
+
+    # Load saved tasks once the window has painted, and save them when it closes
+    def start(self):
+        self.root.bind("<Map>", self.on_first_map)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+    # The window is on screen; start loading after Tk's idle-time redraw has painted it
+    def on_first_map(self, event):
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>")
+        if self._loader:
+            self.root.after_idle(self.load_chunk)
+        else:
+            self.start_api()
+            self.poll_store()
+
+    # Add the next chunk of saved tasks; the table is refreshed after the first and last chunk
+    def load_chunk(self):
+        first = not self.tasks
+        chunk = next(self._loader, None)
+        if chunk is None:
+            self._loader = None
+            self.refresh()
+            self.save()
+            self.start_api()
+            self.poll_store()
+            return
+        for task in chunk:
+            self.scheduler.schedule(task)
+        if first:
+            self.refresh()
+        self.root.after(1, self.load_chunk)
+
+    # Redraw the table and summary once Tk is idle, however many changes happen before then
+    def refresh(self):
+        self.render.mark("tree", "progress")
+
+    # Write the engine's pending changes in one batch shortly after
+    def save(self):
+        if self._save_timer is None and self.engine.pending:
+            self._save_timer = self.root.after(SAVE_DELAY_MS, self.flush_store)
+
+    # The pending changes are copied here and written to disk on a worker thread
+    def flush_store(self):
+        self._save_timer = None
+        batch = self.engine.take_pending()
+        if batch is None:
+            self.save()  # still loading, or the last write has not finished
+            return
+        self._save_job = self.workers.submit(self.engine.store.write, batch, on_done=self.save_done,
+                                             on_error=self.save_failed)
+
+    def save_done(self, result):
+        self._save_job = None
+        self.engine.saved(result)
+        self.save()
+
+    # Keep the changes; the next save tries again
+    def save_failed(self, error):
+        self._save_job = None
+        self.engine.save_failed()
+        messagebox.showerror("Save Failed", f"Could not save tasks: {error}")
+
+    # Serve the HTTP/JSON API; requests are applied on this (Tk) thread in batches
+    def start_api(self):
+        if self.api_port is None or self.api:
+            return
+        from task_api import TaskApiServer
+        self.api = TaskApiServer(self.engine, self.root, self.tasks_changed, self.api_port)
+        try:
+            self.api.start()
+        except OSError as e:
+            self.api = None
+            messagebox.showerror("API Not Started", f"Could not listen on port {self.api_port}: {e}")
+
+    # Pick up what other windows or programs saved to a shared database (see TaskStore.pull), then look again
+    def poll_store(self):
+        if not getattr(self.engine.store, "shared", False):
+            return
+        changed, removed = self.engine.sync()
+        if changed or removed:
+            self.tasks_changed(changed, removed)
+        self._sync_timer = self.root.after(SYNC_MS, self.poll_store)
+
+    # Tasks changed (by a button, an API batch or another window): reschedule their deadlines, then one save and redraw
+    def tasks_changed(self, changed=(), removed=()):
+        for task in changed:
+            self.scheduler.schedule(task)
+        for task in removed:
+            self.scheduler.cancel(task)
+        self.save()
+        self.refresh()
+
+    # Add a task from the input fields; returns it, or None after showing what was wrong
+    def add(self, name, deadline, time_str, priority, repeat=""):
+        try:
+            task = self.engine.add(name, deadline, time_str, priority, repeat)
+        except TaskError as e:
+            messagebox.showerror(*e.args)
+            return None
+        self.tasks_changed([task])
+        return task
+
+    # Bulk actions change the whole selection as one batch, then refresh once.
+    # Repeating tasks move on to their next occurrence instead; schedule() drops the completed ones.
+    def complete(self, task_ids):
+        self.tasks_changed(self.engine.complete_many(task_ids))
+
+    def delete(self, task_ids):
+        self.tasks_changed(removed=self.engine.delete_many(task_ids))
+
+    # Drag and drop: one task from old_index to new_index, or a selection of tasks to index
+    def move(self, old_index, new_index):
+        self.engine.move(old_index, new_index)
+        self.tasks_changed()
+
+    def move_many(self, task_ids, index):
+        self.engine.move_many(task_ids, index)
+        self.tasks_changed()
+
+    # Undo the last change (Ctrl+Z); Redo (Ctrl+Y or Ctrl+Shift+Z) puts it back
+    def undo(self, event=None):
+        self.undo_done(self.engine.undo())
+
+    def redo(self, event=None):
+        self.undo_done(self.engine.redo())
+
+    def undo_done(self, result):
+        if result is None:
+            self.root.bell()  # nothing left to undo/redo
+            return
+        self.tasks_changed(*result)
+
+    # Save everything before the window closes
+    def close(self):
+        if self.api:
+            self.api.stop()
+        if self._sync_timer is not None:
+            self.root.after_cancel(self._sync_timer)
+        if self._save_job is not None:
+            # let the write in progress finish; engine.close() writes whatever came after it
+            try:
+                self.engine.saved(self._save_job.future.result())
+            except Exception:
+                self.engine.save_failed()
+        if self._loader is not None:
+            self._loader.close()  # closed before loading finished
+        if self.notifier:
+            self.notifier.close()
+        self.workers.shutdown()
+        self.engine.close()
+        self.root.destroy()
+
+    # Open edit window to modify name, date, time, priority and repeat
+    def edit_window(self, task_id):
+        task_to_edit = self.tasks.get(task_id)
+        if not task_to_edit:
+            return
+
+        edit_window = tk.Toplevel(self.root)
+        edit_window.title("Edit Task")
+        edit_window.geometry("360x350")
+        edit_window.configure(bg="#F5F6FA")
+        edit_window.resizable(False, False)
+
+        tk.Label(edit_window, text="Edit Task Details", font=("Arial", 13, "bold"), bg="#F5F6FA", fg="#333").pack(pady=10)
+
+        #create a labeled entry field
+        def labeled_entry(label, default_value):
+            frame = tk.Frame(edit_window, bg="#F5F6FA")
+            frame.pack(pady=4)
+            tk.Label(frame, text=label, bg="#F5F6FA", fg="#333").pack(anchor="w")
+            entry = tk.Entry(frame, width=35, relief="solid", borderwidth=1)
+            entry.pack()
+            entry.insert(0, default_value)
+            return entry
+
+        name_entry = labeled_entry("Task Name:", task_to_edit.name)
+        date_entry = labeled_entry("Date (YYYY-MM-DD):", task_to_edit.deadline)
+        time_entry = labeled_entry("Time (HH:MM):", task_to_edit.time_str)
+
+        tk.Label(edit_window, text="Priority:", bg="#F5F6FA", fg="#333").pack(anchor="w", padx=15)
+        priority_combo = ttk.Combobox(edit_window, values=["Low", "Medium", "High"], width=32)
+        priority_combo.pack(pady=4)
+        priority_combo.set(task_to_edit.priority)
+
+        tk.Label(edit_window, text="Repeat:", bg="#F5F6FA", fg="#333").pack(anchor="w", padx=15)
+        repeat_combo = ttk.Combobox(edit_window, values=REPEAT_CHOICES, width=32)
+        repeat_combo.pack(pady=4)
+        repeat_combo.set(repeat_choice(task_to_edit.repeat))
+
+        # Save  edited values back to the Task object after validation
+        def save_changes():
+            new_name = name_entry.get().strip()
+            new_deadline = date_entry.get().strip()
+            new_time = time_entry.get().strip()
+            new_priority = priority_combo.get().strip()
+            new_repeat = repeat_combo.get().strip()
+
+            try:
+                self.engine.edit(task_id, name=new_name, deadline=new_deadline, time_str=new_time,
+                                 priority=new_priority, repeat=new_repeat)
+            except TaskError as e:
+                messagebox.showerror(*e.args)
+                return
+            self.tasks_changed([task_to_edit])
+            messagebox.showinfo("Task Updated", f"'{new_name}' was updated successfully.")
+            edit_window.destroy()
+
+        btn_frame = tk.Frame(edit_window, bg="#F5F6FA")
+        btn_frame.pack(pady=15)
+        tk.Button(btn_frame, text="Save Changes", command=save_changes, bg="#007BFF", fg="white",
+                  relief="flat", padx=12, pady=6).grid(row=0, column=0, padx=8)
+        tk.Button(btn_frame, text="Cancel", command=edit_window.destroy, bg="#B0B0B0", fg="white",
+                  relief="flat", padx=12, pady=6).grid(row=0, column=1, padx=8)
+
+    # Give every selected task a new priority and/or a new date and time in one batch.
+    # Fields left blank stay as they are on each task.
+    def bulk_edit_window(self, task_ids):
+        bulk_window = tk.Toplevel(self.root)
+        bulk_window.title("Change Selected")
+        bulk_window.configure(bg="#F5F6FA")
+        bulk_window.resizable(False, False)
+        tk.Label(bulk_window, text=f"Change {len(task_ids)} tasks (blank = keep)", font=("Arial", 13, "bold"),
+                 bg="#F5F6FA", fg="#333").grid(row=0, column=0, columnspan=2, padx=15, pady=10)
+        tk.Label(bulk_window, text="Priority:", bg="#F5F6FA", fg="#333").grid(row=1, column=0, sticky="w", padx=15)
+        priority_combo = ttk.Combobox(bulk_window, values=["", "Low", "Medium", "High"], width=22, state="readonly")
+        priority_combo.grid(row=1, column=1, padx=15, pady=4)
+        tk.Label(bulk_window, text="Date (YYYY-MM-DD):", bg="#F5F6FA", fg="#333").grid(row=2, column=0, sticky="w", padx=15)
+        date_entry = tk.Entry(bulk_window, width=25, relief="solid", borderwidth=1)
+        date_entry.grid(row=2, column=1, padx=15, pady=4)
+        tk.Label(bulk_window, text="Time (HH:MM):", bg="#F5F6FA", fg="#333").grid(row=3, column=0, sticky="w", padx=15)
+        time_entry = tk.Entry(bulk_window, width=25, relief="solid", borderwidth=1)
+        time_entry.grid(row=3, column=1, padx=15, pady=4)
+
+        def apply_changes():
+            fields = {}
+            if priority_combo.get():
+                fields["priority"] = priority_combo.get()
+            if date_entry.get().strip():
+                fields["deadline"] = date_entry.get().strip()
+            if time_entry.get().strip():
+                fields["time_str"] = time_entry.get().strip()
+            if fields:
+                try:
+                    changed = self.engine.edit_many(task_ids, **fields)
+                except TaskError as e:
+                    messagebox.showerror(*e.args)
+                    return
+                # only a new date or time moves the deadline timers
+                self.tasks_changed(changed if "deadline" in fields or "time_str" in fields else ())
+            bulk_window.destroy()
+
+        tk.Button(bulk_window, text="Apply", command=apply_changes, bg="#007BFF", fg="white",
+                  relief="flat", padx=12, pady=6).grid(row=4, column=0, pady=15)
+        tk.Button(bulk_window, text="Cancel", command=bulk_window.destroy, bg="#B0B0B0", fg="white",
+                  relief="flat", padx=12, pady=6).grid(row=4, column=1, pady=15)
+
+    # Export created tasks to desktop to enable exporting to local calender.
+    # The file is written on a worker thread; pressing the button again cancels it.
+    def export_calendar(self):
+        if self.export_job:
+            self.export_job.cancel()
+            return
+        if not self.tasks:
+            messagebox.showwarning("No Tasks", "There are no tasks to export.")
+            return
+        from tkinter import filedialog
+        file_path = filedialog.asksaveasfilename(defaultextension=".ics", filetypes=[("Calendar files", "*.ics")])
+        if not file_path:
+            return
+        job = self.export_job = self.engine.export(file_path)
+        self.workers.submit(job.run, key="export", on_cancel=job.cancel,
+                            on_done=lambda _: self.export_finished(job),
+                            on_error=lambda e: self.export_finished(job, e))
+        self.export_btn.config(text="Cancel Export")
+        self.watch_export()
+
+    # Show export progress on the progress bar until the job finishes
+    def watch_export(self):
+        job = self.export_job
+        if job is None:
+            return
+        self.progress["value"] = job.done / job.total * 100
+        self.root.after(100, self.watch_export)
+
+    def export_finished(self, job, error=None):
+        self.export_job = None
+        self.export_btn.config(text="Export to Calendar")
+        self.update_progress()
+        error = error or job.error
+        if error:
+            messagebox.showerror("Export Failed", f"Could not write {job.path}: {error}")
+        elif not job.cancelled:
+            messagebox.showinfo("Export Successful", f"Tasks exported to {job.path}")
+
+    # Import tasks from a CSV or .ics file on a worker thread; pressing the button again cancels it
+    def import_tasks(self):
+        if self.import_job:
+            self.import_job.cancel()
+            return
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(filetypes=[("Task files", "*.csv *.ics"), ("All files", "*.*")])
+        if not file_path:
+            return
+        job = self.import_job = self.engine.import_file(file_path)
+        self.workers.submit(job.run, key="import", on_cancel=job.cancel,
+                            on_done=lambda _: self.import_finished(job),
+                            on_error=lambda e: self.import_finished(job, e))
+        self.import_btn.config(text="Cancel Import")
+        self.watch_import()
+
+    # Add the imported batches that have arrived so far
+    def add_import_batches(self, job):
+        while True:
+            try:
+                batch = job.batches.get_nowait()
+            except queue.Empty:
+                break
+            self.engine.add_tasks(batch)
+            for task in batch:
+                self.scheduler.schedule(task)
+
+    # Add imported tasks batch by batch as they arrive; the table is refreshed once at the end
+    def watch_import(self):
+        job = self.import_job
+        if job is None:
+            return
+        self.add_import_batches(job)
+        self.progress["value"] = job.done / job.total * 100
+        self.root.after(100, self.watch_import)
+
+    def import_finished(self, job, error=None):
+        self.add_import_batches(job)
+        self.import_job = None
+        self.import_btn.config(text="Import Tasks")
+        self.tasks_changed()
+        error = error or job.error
+        if error:
+            messagebox.showerror("Import Failed", f"Could not read {job.path}: {error}")
+            return
+        lines = [f"Imported {job.imported} tasks from {os.path.basename(job.path)}."]
+        if job.rejected_count:
+            lines.append(f"{job.rejected_count} rows were rejected:")
+            lines += [f"  line {line}: {reason}" for line, reason in job.rejected[:10]]
+            if job.rejected_count > 10:
+                lines.append("  ...")
+        messagebox.showinfo("Import Finished", "\n".join(lines))
+
+    # Updates the progress bar and summary from the task list's running counts
+    # (the bar shows job progress while exporting/importing)
+    def update_progress(self):
+        counts = self.tasks.priority_counts
+        self.summary_label.config(text=(
+            f"Open - High: {counts.get('High', 0)}   Medium: {counts.get('Medium', 0)}   Low: {counts.get('Low', 0)}"
+            f"   |   Overdue: {self.tasks.overdue_count}   Done: {self.tasks.completed_count}/{len(self.tasks)}"))
+        if self.export_job or self.import_job:
+            return
+        if not self.tasks:
+            self.progress["value"] = 0
+            return
+        self.progress["value"] = (self.tasks.completed_count / len(self.tasks)) * 100
+
+    # notify users when the scheduler reports a task as due soon or overdue; the notice is queued,
+    # so a burst of events never waits on the user
+    def check_notifications(self, t, kind):
+        if kind == OVERDUE:
+            self.tasks.mark_overdue(t)
+            self.refresh()  # recolour the row; a burst of overdue tasks is redrawn once
+        if t.completed or t.notified:
+            return
+        self.notifier.post(kind, t)
+        self.engine.mark_notified(t)
+        self.save()
@@ -0,0 +1,94 @@
+# Startup benchmark: import time of each app module and time until its window is up and idle.
+# Every run is a fresh interpreter so nothing is cached between measurements.
+# run with: python benchmarks/bench_startup.py [--runs 5] [--max-import-ms 150] [--max-idle-ms 600]
+# Exits with status 1 when a limit is exceeded, so it can guard against startup regressions.
+# The time-to-idle part needs a display; without one only import times are measured.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+# Builds the app on an empty temporary store, waits for the window to be mapped and
+# for Tk's idle-time redraw, then prints milliseconds since the interpreter got going
+IDLE_SCRIPT = """
+import time
+start = time.perf_counter()
+import os, tempfile
+import tkinter as tk
+import {module} as app_module
+tmp = tempfile.mkdtemp()
+root = tk.Tk()
+app = {make}
+root.wait_visibility(root)
+root.update_idletasks()
+print((time.perf_counter() - start) * 1000)
+app.controller.close()
+"""
+
+APPS = {
+    "TASKMANAGER": "app_module.TaskManagerApp(root, store=app_module.TaskJournal(os.path.join(tmp, 'j')))",
+    "main": "app_module.TaskManagerApp(root, db_path=os.path.join(tmp, 'tasks.db'))",
+}
+
+
+def run(script):
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    return float(result.stdout.split()[-1]), None
+
+
+def measure(script, runs):
+    times = []
+    for _ in range(runs):
+        ms, error = run(script)
+        if error:
+            return None, error
+        times.append(ms)
+    return statistics.median(times), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app startup time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement (median is shown)")
+    parser.add_argument("--max-import-ms", type=float, help="fail if an app module takes longer to import")
+    parser.add_argument("--max-idle-ms", type=float, help="fail if an app takes longer to reach its first idle")
+    args = parser.parse_args()
+
+    has_display = sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+    failed = False
+    print(f"{'app':<12}{'import ms':>12}{'first idle ms':>16}")
+    for module, make in APPS.items():
+        import_ms, error = measure(IMPORT_SCRIPT.format(module=module), args.runs)
+        if error:
+            print(f"{module:<12}  import failed: {error}")
+            failed = True
+            continue
+        idle = "no display"
+        idle_ms = None
+        if has_display:
+            idle_ms, error = measure(IDLE_SCRIPT.format(module=module, make=make), args.runs)
+            idle = f"{idle_ms:.1f}" if error is None else f"failed: {error}"
+            failed = failed or error is not None
+        print(f"{module:<12}{import_ms:>12.1f}{idle:>16}")
+        if args.max_import_ms is not None and import_ms > args.max_import_ms:
+            print(f"  {module} import time is over the {args.max_import_ms:g} ms limit")
+            failed = True
+        if args.max_idle_ms is not None and idle_ms is not None and idle_ms > args.max_idle_ms:
+            print(f"  {module} time to first idle is over the {args.max_idle_ms:g} ms limit")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
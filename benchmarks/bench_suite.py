@@ -0,0 +1,150 @@
+# Scaling benchmark: times the app's hot paths on synthetic task lists of growing size.
+# Runs without a display (TreeSync drives a HeadlessTree); --tk uses a real, hidden ttk.Treeview instead.
+# run with: python benchmarks/bench_suite.py [--sizes 1000,10000,100000,1000000] [--json out.json]
+#           python benchmarks/bench_suite.py --sizes 10000 --compare out.json   (ratios against an earlier run)
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from workload import generate_tasks, HeadlessTree, HeadlessRoot
+from task_engine import TaskEngine
+from tree_sync import TreeSync
+from deadline_scheduler import DeadlineScheduler, OVERDUE
+from render_scheduler import RenderScheduler
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+
+
+def timed(results, name, fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    seconds = time.perf_counter() - start
+    results[name] = min(seconds, results.get(name, seconds))
+    return value
+
+
+# Same reads as AppController.update_progress
+def progress_text(tasks):
+    counts = tasks.priority_counts
+    done = tasks.completed_count / len(tasks) * 100 if len(tasks) else 0
+    return (f"High: {counts.get('High', 0)} Medium: {counts.get('Medium', 0)} Low: {counts.get('Low', 0)} "
+            f"Overdue: {tasks.overdue_count} Done: {done:.0f}%")
+
+
+# One pass over every operation on a fresh list of n tasks
+def run_once(n, seed, make_tree, results, export_dir, columnar=False):
+    tasks = generate_tasks(n, seed)
+    engine = TaskEngine(columnar=columnar)
+    timed(results, "load tasks", engine.add_tasks, tasks)
+    rows = TreeSync(make_tree())
+    timed(results, "update_tree (first fill)", rows.sync, engine.tasks)
+
+    task = engine.tasks[n // 2]
+    engine.edit(task.id, name=task.name + " (edited)")
+    timed(results, "update_tree (one edit)", rows.sync, engine.tasks)
+    timed(results, "update_progress", progress_text, engine.tasks)
+
+    timed(results, "filter_tasks (keyword, builds index)", engine.filter, "report")
+    timed(results, "filter_tasks (keyword)", engine.filter, "dentist")
+    timed(results, "filter_tasks (regex)", engine.filter, r"^Pay .*bill")
+    timed(results, "filter_tasks (rare keyword)", engine.filter, "lagos v2")
+
+    timed(results, "auto_sort date (builds index)", engine.sort, "date")
+    timed(results, "update_tree (after sort)", rows.sync, engine.tasks)
+    timed(results, "auto_sort priority (builds index)", engine.sort, "priority")
+    timed(results, "auto_sort date (indexed)", engine.sort, "date")
+    rows.sync(engine.tasks)
+
+    timed(results, "drag reorder (bottom to top)", lambda: (engine.move(n - 1, 0), rows.sync(engine.tasks)))
+
+    # Deadline scheduling plus the burst of OVERDUE events for everything already past due;
+    # like the apps, each event asks for a redraw and the burst is redrawn once
+    root = HeadlessRoot()
+    render = RenderScheduler(root)
+    render.add("tree", lambda: (rows.sync(engine.tasks), progress_text(engine.tasks)))
+    fired = []
+
+    def on_event(t, kind):
+        if kind == OVERDUE:
+            engine.tasks.mark_overdue(t)
+            render.mark("tree")
+        fired.append(t)
+
+    scheduler = DeadlineScheduler(root, on_event)
+    timed(results, "schedule deadlines", lambda: [scheduler.schedule(t) for t in engine.tasks])
+    timed(results, "check_notifications (overdue burst)", lambda: (root.run_timers(), root.run_timers()))
+    timed(results, "due_events scan", engine.due_events)
+
+    path = os.path.join(export_dir, f"bench-{n}.ics")
+    job = engine.export(path)
+    timed(results, "export_calendar", job.run)
+    if job.error:
+        raise job.error
+    os.remove(path)
+
+
+def tree_factory(use_tk):
+    if not use_tk:
+        return HeadlessTree
+    import tkinter as tk
+    from tkinter import ttk
+    root = tk.Tk()
+    root.withdraw()
+    columns = ("Task", "Deadline", "Time", "Priority", "Status")
+    return lambda: ttk.Treeview(root, columns=columns, show="headings")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the task manager's hot paths at several list sizes")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated task counts (default {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size below 100k tasks; the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tk", action="store_true", help="sync a real (hidden) ttk.Treeview; needs a display")
+    parser.add_argument("--columnar", action="store_true", help="keep numpy columns next to the task list")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="show the change against results saved earlier with --json")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    make_tree = tree_factory(args.tk)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    report = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tree": "ttk" if args.tk else "headless",
+        "seed": args.seed,
+        "columnar": args.columnar,
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as export_dir:
+        for n in sizes:
+            results = {}
+            for _ in range(args.repeat if n < 100000 else 1):
+                run_once(n, args.seed, make_tree, results, export_dir, args.columnar)
+            report["results"][str(n)] = results
+            print(f"\n{n} tasks")
+            old = (baseline or {}).get(str(n), {})
+            for name, seconds in results.items():
+                line = f"  {name:<38}{seconds * 1000:>11.2f} ms"
+                if name in old and old[name] > 0:
+                    line += f"   {seconds / old[name]:6.2f}x of baseline"
+                print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
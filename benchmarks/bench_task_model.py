@@ -0,0 +1,85 @@
+# Micro-benchmark: cached deadline epoch and __slots__ Task vs the old parse-every-call Task
+# run with: python benchmarks/bench_task_model.py
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from task_model import Task
+
+
+# The Task class as it was before deadlines were cached, kept here as the baseline
+class OldTask:
+    def __init__(self, name, deadline, time_str, priority):
+        self.name = name
+        self.deadline = deadline
+        self.time_str = time_str
+        self.priority = priority
+        self.completed = False
+        self.notified = False
+
+    def is_overdue(self):
+        try:
+            full_datetime = f"{self.deadline} {self.time_str}"
+            return datetime.strptime(full_datetime, "%Y-%m-%d %H:%M") < datetime.now()
+        except ValueError:
+            return False
+
+    def is_due_soon(self):
+        try:
+            full_datetime = f"{self.deadline} {self.time_str}"
+            task_time = datetime.strptime(full_datetime, "%Y-%m-%d %H:%M")
+            now = datetime.now()
+            return now <= task_time <= now + timedelta(minutes=10)
+        except ValueError:
+            return False
+
+
+# The current Task's fields in an ordinary class with a per-object __dict__, to measure what __slots__
+# saves on its own (the old class has fewer fields, so it is not a fair memory baseline)
+class DictTask:
+    def __init__(self, name, deadline, time_str, priority, task_id):
+        self.id = task_id
+        self.name = name
+        self._deadline = deadline
+        self._time_str = time_str
+        self.priority = priority
+        self.completed = False
+        self.notified = False
+        self.repeat = ""
+        self._due = None
+
+
+def per_call(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+# make(i) builds the i-th task; IDs are passed in so every class pays for the same int objects
+def memory_per_task(make, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [make(i) for i in range(1000, 1000 + count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del tasks
+    return used / count
+
+
+if __name__ == "__main__":
+    old = OldTask("Demo", "2030-01-01", "09:00", "Medium")
+    new = Task("Demo", "2030-01-01", "09:00", "Medium")
+    for name in ("is_overdue", "is_due_soon"):
+        old_ns = per_call(getattr(old, name), 20000)
+        new_ns = per_call(getattr(new, name), 200000)
+        print(f"{name:12} old {old_ns:8.0f} ns/call   new {new_ns:6.0f} ns/call   {old_ns / new_ns:5.1f}x faster")
+
+    count = 100000
+    old_bytes = memory_per_task(lambda i: OldTask("Task", "2030-01-01", "09:00", "Medium"), count)
+    dict_bytes = memory_per_task(lambda i: DictTask("Task", "2030-01-01", "09:00", "Medium", i), count)
+    new_bytes = memory_per_task(lambda i: Task("Task", "2030-01-01", "09:00", "Medium", i), count)
+    print(f"memory       same fields with __dict__ {dict_bytes:4.0f} B/task   __slots__ {new_bytes:4.0f} B/task   "
+          f"{dict_bytes / new_bytes:4.1f}x smaller")
+    print(f"             old 6-field class {old_bytes:4.0f} B/task (no id/repeat/cached due; "
+          f"object overhead over {count} tasks)")
@@ -0,0 +1,103 @@
+# Synthetic task workloads and display-free stand-ins for the Tk objects the app code talks to
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from task_model import Task
+
+VERBS = ["Review", "Write", "Call", "Email", "Fix", "Prepare", "Book", "Pay", "Update", "Plan", "Submit", "Clean",
+         "Buy", "Read", "Test", "Deploy", "Schedule", "Renew", "Finish", "Check"]
+THINGS = ["quarterly report", "dentist", "project proposal", "bug in login page", "team meeting notes",
+          "electricity bill", "flight to Lagos", "lecture slides", "group assignment", "car insurance",
+          "birthday gift for mum", "lab results", "release notes", "database backup", "CV", "gym membership",
+          "budget spreadsheet", "client invoice", "exam revision", "garden"]
+TAGS = ["", "", "", "", "(urgent)", "for work", "at home", "before Friday", "#backlog", "v2"]
+
+
+# n tasks with a realistic mix: mostly upcoming deadlines in office hours, some overdue (and more of those
+# completed), ~50% Medium / 30% Low / 20% High priority, and a few dates that do not parse
+def generate_tasks(n, seed=0, now=None):
+    rng = random.Random(seed)
+    now = time.time() if now is None else now
+    tasks = []
+    for i in range(n):
+        name = f"{rng.choice(VERBS)} {rng.choice(THINGS)} {rng.choice(TAGS)}".strip()
+        roll = rng.random()
+        if roll < 0.15:
+            offset = -rng.uniform(3600, 30 * 86400)         # overdue
+        elif roll < 0.25:
+            offset = rng.uniform(0, 86400)                  # due within a day
+        else:
+            offset = rng.uniform(86400, 90 * 86400)
+        day = time.localtime(now + offset)
+        hour = min(23, max(0, int(rng.gauss(13, 3))))
+        deadline = time.strftime("%Y-%m-%d", day)
+        if rng.random() < 0.01:
+            deadline = f"{day.tm_year}-02-30"               # typed by hand, does not exist
+        time_str = f"{hour:02d}:{rng.choice((0, 15, 30, 45)):02d}"
+        priority = rng.choices(("Low", "Medium", "High"), (30, 50, 20))[0]
+        task = Task(name, deadline, time_str, priority)
+        task.completed = rng.random() < (0.7 if offset < 0 else 0.2)
+        tasks.append(task)
+    return tasks
+
+
+# Records just enough ttk.Treeview behaviour (children order, item values) for TreeSync to run without a display
+class HeadlessTree:
+    def __init__(self):
+        self.order = []
+        self.items = {}
+
+    def insert(self, parent, index, iid, values=(), tags=()):
+        self.items[iid] = (values, tags)
+        if index == "end":
+            self.order.append(iid)
+        else:
+            self.order.insert(index, iid)
+        return iid
+
+    def delete(self, *iids):
+        gone = set(iids)
+        for iid in iids:
+            del self.items[iid]
+        self.order = [iid for iid in self.order if iid not in gone]
+
+    def item(self, iid, values=(), tags=()):
+        self.items[iid] = (values, tags)
+
+    # Like Tk, index counts positions with the moved item already taken out
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def set_children(self, parent, *iids):
+        self.order = list(iids)
+
+    def get_children(self, parent=""):
+        return tuple(self.order)
+
+
+# Stand-in for the Tk root's timer calls; pending callbacks are run by hand with run_timers()
+class HeadlessRoot:
+    def __init__(self):
+        self._timers = {}
+        self._next = 0
+
+    def after(self, ms, callback, *args):
+        self._next += 1
+        timer = f"after#{self._next}"
+        self._timers[timer] = (callback, args)
+        return timer
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, timer):
+        self._timers.pop(timer, None)
+
+    def run_timers(self):
+        timers, self._timers = self._timers, {}
+        for callback, args in timers.values():
+            callback(*args)
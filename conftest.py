@@ -0,0 +1 @@
+# Lets pytest import the app's modules (task_store, task_api, ...) from the repository root
@@ -0,0 +1,59 @@
+# A date entry that only loads tkcalendar (and its babel locale data) when the calendar is first opened
+import tkinter as tk
+from datetime import datetime
+
+
+class DateField:
+    # Same get()/set_date()/grid() calls the apps used on tkcalendar.DateEntry
+    def __init__(self, master, width=22):
+        self.frame = tk.Frame(master)
+        self.entry = tk.Entry(self.frame, width=width - 3)
+        self.entry.pack(side="left")
+        self.button = tk.Button(self.frame, text="▼", width=2, padx=0, pady=0, command=self.open_calendar)
+        self.button.pack(side="left")
+        self._popup = None
+        self.set_date(datetime.now())
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def get(self):
+        return self.entry.get().strip()
+
+    def set_date(self, date):
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, date.strftime("%Y-%m-%d"))
+
+    # Drop a calendar below the field; the import happens here, on first use
+    def open_calendar(self):
+        if self._popup is not None:
+            self._popup.destroy()
+            self._popup = None
+            return
+        try:
+            from tkcalendar import Calendar
+        except ImportError:
+            self.button.config(state="disabled")  # typing the date still works
+            return
+        try:
+            selected = datetime.strptime(self.get(), "%Y-%m-%d")
+        except ValueError:
+            selected = datetime.now()
+        self._popup = tk.Toplevel(self.frame)
+        self._popup.overrideredirect(True)
+        self._popup.geometry(f"+{self.entry.winfo_rootx()}+{self.entry.winfo_rooty() + self.entry.winfo_height()}")
+        calendar = Calendar(self._popup, selectmode="day", year=selected.year, month=selected.month, day=selected.day,
+                            date_pattern="yyyy-mm-dd", background="darkblue", foreground="white")
+        calendar.pack()
+        calendar.bind("<<CalendarSelected>>", lambda e: self._picked(calendar.get_date()))
+        self._popup.bind("<Escape>", lambda e: self.open_calendar())
+        self._popup.focus_set()
+
+    def _picked(self, value):
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, value)
+        self._popup.destroy()
+        self._popup = None
@@ -0,0 +1,79 @@
+# Fires "due soon" and "overdue" events at the exact second using one Tk timer
+import heapq
+import itertools
+import math
+import time
+from task_model import DUE_SOON_SECONDS
+
+DUE_SOON = "due_soon"
+OVERDUE = "overdue"
+
+
+class DeadlineScheduler:
+    # Longest single wait, so a changed clock or a suspended machine is noticed within the hour
+    MAX_WAIT_MS = 60 * 60 * 1000
+
+    def __init__(self, root, on_event):
+        self.root = root
+        self.on_event = on_event    # called as on_event(task, kind)
+        self._heap = []             # (when, version, kind, task)
+        self._versions = {}         # task -> version of its live heap entries
+        self._counter = itertools.count()
+        self._timer = None
+        self._timer_at = None
+
+    # Queue events for a new or edited task; older entries for it become stale
+    def schedule(self, task):
+        version = next(self._counter)
+        self._versions[task] = version
+        due = task.due
+        if due is None or task.completed:
+            del self._versions[task]
+            return
+        if due >= time.time():
+            heapq.heappush(self._heap, (due - DUE_SOON_SECONDS, version, DUE_SOON, task))
+        heapq.heappush(self._heap, (due, version, OVERDUE, task))
+        self._compact()
+        self._arm()
+
+    # Forget a completed or deleted task; its heap entries are skipped when they come up
+    def cancel(self, task):
+        self._versions.pop(task, None)
+
+    def _live(self, entry):
+        return self._versions.get(entry[3]) == entry[1]
+
+    # Rebuild the heap once stale entries outnumber live ones
+    def _compact(self):
+        if len(self._heap) > 4 * len(self._versions) + 64:
+            self._heap = [entry for entry in self._heap if self._live(entry)]
+            heapq.heapify(self._heap)
+
+    # Point the single Tk timer at the earliest live event
+    def _arm(self):
+        while self._heap and not self._live(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return
+        when = self._heap[0][0]
+        if self._timer is not None:
+            if self._timer_at <= when:
+                return
+            self.root.after_cancel(self._timer)
+        delay = min(self.MAX_WAIT_MS, max(0, math.ceil((when - time.time()) * 1000)))
+        self._timer_at = when
+        self._timer = self.root.after(delay, self._fire)
+
+    # Deliver every event that is due, then re-arm for the next one
+    def _fire(self):
+        self._timer = None
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._live(entry):
+                continue
+            when, version, kind, task = entry
+            if kind == OVERDUE:
+                del self._versions[task]
+            self.on_event(task, kind)
+        self._arm()
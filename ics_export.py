@@ -0,0 +1,102 @@
+# Streams tasks out as an iCalendar (.ics) file, one event at a time
+import os
+import threading
+import time
+
+PRODID = "-//Group 10//Task Manager//EN"
+# Write buffer size; events are generated one at a time so memory stays flat
+BUFFER_BYTES = 64 * 1024
+
+
+# Escape a TEXT value (RFC 5545 section 3.3.11)
+def escape_text(value):
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+# Fold a content line into 75-octet pieces without splitting a UTF-8 character (RFC 5545 section 3.1)
+def fold_line(line):
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    pieces = []
+    start, limit = 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines begin with a space
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def ics_time(epoch):
+    return time.strftime("%Y%m%dT%H%M%S", time.localtime(epoch))
+
+
+# Yield the calendar one block at a time: header, one VEVENT per task with a valid deadline, footer.
+# An open repeating task is one VEVENT with an RRULE from its current occurrence, not one per occurrence.
+def iter_ics(tasks):
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{PRODID}\r\nCALSCALE:GREGORIAN\r\n"
+    for t in tasks:
+        due = t.due
+        if due is None:
+            continue
+        start = ics_time(due)
+        yield (
+            "BEGIN:VEVENT\r\n"
+            f"UID:task-{t.id}@group10-task-manager\r\n"
+            f"DTSTAMP:{stamp}\r\n"
+            + fold_line(f"SUMMARY:{escape_text(t.name)}")
+            + f"DTSTART:{start}\r\n"
+            f"DTEND:{start}\r\n"
+            + (fold_line(f"RRULE:{t.repeat}") if t.repeat and not t.completed else "")
+            + fold_line(f"DESCRIPTION:Priority - {escape_text(t.priority)}")
+            + "END:VEVENT\r\n"
+        )
+    yield "END:VCALENDAR\r\n"
+
+
+class ExportJob:
+    # Tasks written between progress updates
+    PROGRESS_STEP = 500
+
+    # tasks should be a snapshot (e.g. a tuple) so the list can keep changing while the job runs
+    def __init__(self, path, tasks):
+        self.path = path
+        self.tasks = tasks
+        self.total = len(tasks)
+        self.done = 0
+        self.error = None
+        self.finished = False
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    # Write to a temporary file and only replace the target once the whole calendar is out.
+    # Blocks; the apps call it on a worker thread.
+    def run(self):
+        tmp = self.path + ".part"
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="", buffering=BUFFER_BYTES) as f:
+                for count, block in enumerate(iter_ics(self.tasks)):
+                    f.write(block)
+                    if count % self.PROGRESS_STEP == 0:
+                        self.done = min(count, self.total)
+                        if self._cancel.is_set():
+                            break
+            if self._cancel.is_set():
+                os.remove(tmp)
+            else:
+                os.replace(tmp, self.path)
+                self.done = self.total
+        except OSError as e:
+            self.error = e
+        finally:
+            self.finished = True
@@ -0,0 +1,129 @@
+# Opt-in timing of the app's handlers plus Tk event-loop lag (run an app with --profile).
+# Wrapped calls cost two perf_counter() reads and a deque append; nothing is wrapped unless asked.
+import functools
+import json
+import time
+from collections import deque
+
+
+class Stat:
+    __slots__ = ("count", "total", "worst", "samples")
+
+    def __init__(self, keep):
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.samples = deque(maxlen=keep)   # most recent durations, for the percentiles
+
+
+# Nearest-rank percentile of an already sorted list
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Instrumentation:
+    # Recent durations kept per operation
+    SAMPLES = 5000
+    # How often the event-loop lag probe asks to run
+    LAG_INTERVAL_MS = 100
+    LAG = "event loop lag"
+
+    def __init__(self):
+        self.stats = {}
+        self._overlay = None
+        self._lag_due = None
+
+    def record(self, name, seconds):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = Stat(self.SAMPLES)
+        stat.count += 1
+        stat.total += seconds
+        stat.samples.append(seconds)
+        if seconds > stat.worst:
+            stat.worst = seconds
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return timed
+
+    # Time these methods on every instance of cls; call before the instances are built,
+    # since buttons and bindings keep the bound methods they were given
+    def instrument(self, cls, names):
+        for name in names:
+            setattr(cls, name, self.wrap(f"{cls.__name__}.{name}", getattr(cls, name)))
+
+    # Time a module-level function (callers inside the module look it up at call time)
+    def instrument_function(self, module, name):
+        setattr(module, name, self.wrap(f"{module.__name__}.{name}", getattr(module, name)))
+
+    # The shared hot spots under both apps: date parsing, table syncing and redraws, searching, sorting and saving,
+    # plus the AppController handlers both windows call into
+    def instrument_core(self):
+        import task_model
+        from tree_sync import TreeSync
+        from task_engine import TaskEngine
+        from render_scheduler import RenderScheduler
+        from app_controller import AppController
+        self.instrument_function(task_model, "parse_due")
+        self.instrument(TreeSync, ("sync",))
+        self.instrument(RenderScheduler, ("flush",))
+        self.instrument(TaskEngine, ("add_tasks", "filter", "sort", "undo", "redo", "flush"))
+        self.instrument(AppController, (
+            "load_chunk", "flush_store", "save_done", "poll_store", "tasks_changed", "export_calendar",
+            "watch_export", "export_finished", "import_tasks", "watch_import", "import_finished",
+            "update_progress", "check_notifications"))
+
+    # Ask Tk to run a probe every LAG_INTERVAL_MS; how late it actually runs is the event-loop lag
+    def watch_loop(self, root):
+        self._lag_due = time.perf_counter() + self.LAG_INTERVAL_MS / 1000
+        root.after(self.LAG_INTERVAL_MS, self._lag_probe, root)
+
+    def _lag_probe(self, root):
+        now = time.perf_counter()
+        self.record(self.LAG, max(0.0, now - self._lag_due))
+        self._lag_due = now + self.LAG_INTERVAL_MS / 1000
+        root.after(self.LAG_INTERVAL_MS, self._lag_probe, root)
+
+    # Rows of (name, count, p50, p95, p99, worst, total) in milliseconds, most total time first
+    def summary(self):
+        rows = []
+        for name, stat in self.stats.items():
+            ordered = sorted(stat.samples)
+            rows.append((name, stat.count, percentile(ordered, 0.50) * 1000, percentile(ordered, 0.95) * 1000,
+                         percentile(ordered, 0.99) * 1000, stat.worst * 1000, stat.total * 1000))
+        rows.sort(key=lambda row: row[6], reverse=True)
+        return rows
+
+    def dump(self, path):
+        fields = ("count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "total_ms")
+        data = {row[0]: dict(zip(fields, row[1:])) for row in self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"written": time.strftime("%Y-%m-%dT%H:%M:%S"), "operations": data}, f, indent=2)
+
+    # A small always-on-top window with the live table, refreshed every second
+    def show_overlay(self, root):
+        import tkinter as tk
+        self._overlay = tk.Toplevel(root)
+        self._overlay.title("Latency")
+        self._overlay.attributes("-topmost", True)
+        label = tk.Label(self._overlay, font=("Courier", 9), justify="left", anchor="nw")
+        label.pack(fill="both", expand=True, padx=6, pady=6)
+
+        def refresh():
+            if not self._overlay.winfo_exists():
+                return
+            lines = [f"{'operation':<34}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"]
+            for name, count, p50, p95, p99, worst, _ in self.summary():
+                lines.append(f"{name[:34]:<34}{count:>7}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{worst:>9.1f}")
+            label.config(text="\n".join(lines))
+            self._overlay.after(1000, refresh)
+        refresh()
@@ -1,22 +1,38 @@
-person 3:  import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
-from datetime import datetime
+import re
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tree_sync import TreeSync
+from virtual_tree import VirtualTreeview
+from search_index import scan_names
+
+# Filter scans over at least this many names run in a separate process
+PROCESS_SCAN_MIN = 200000
 
 class ListPanel:
-    def __init__(self, parent, get_tasks, set_tasks, callbacks):
+    # callbacks: mark_complete(task_ids), delete_task(task_ids), bulk_edit(task_ids), edit_task(task_id),
+    # move_task(old, new), move_tasks(task_ids, index), export_calendar(), import_tasks(), undo(), redo()
+    # workers is an optional WorkerPool; with one, filters the search index cannot answer scan in the background.
+    # render is an optional RenderScheduler with a "tree" part, so redraws after changes are coalesced.
+    def __init__(self, parent, get_tasks, set_tasks, callbacks, virtual=False, workers=None, render=None):
         self.frame = tk.Frame(parent)
         self.frame.pack(fill="both", expand=True, padx=10, pady=10)
         self.get_tasks = get_tasks
         self.set_tasks = set_tasks
         self.callbacks = callbacks
+        self.workers = workers
+        self.render = render
 
-        self.tree = ttk.Treeview(self.frame, columns=("Name", "Deadline", "Time", "Priority", "Status"), show="headings")
+        tree_class = VirtualTreeview if virtual else ttk.Treeview
+        self.tree = tree_class(self.frame, columns=("Name", "Deadline", "Time", "Priority", "Status"), show="headings")
         for col, text in zip(("Name", "Deadline", "Time", "Priority", "Status"), ("Task Name", "Date", "Time", "Priority", "Status")):
             self.tree.heading(col, text=text)
         self.tree.pack(fill="both", expand=True)
+        self.tree.tag_configure("overdue", background="tomato")
+        self.tree.tag_configure("completed", background="lightgreen")
+        self.tree_sync = self.tree if virtual else TreeSync(self.tree)
         self.tree.bind("<ButtonPress-1>", self._on_drag_start)
         self.tree.bind("<ButtonRelease-1>", self._on_drag_drop)
-        self.drag_data = {"start_index": None}
+        self.drag_data = {"start_index": None, "block": None}
 
         btn_frame = tk.Frame(parent)
         btn_frame.pack(pady=5)
@@ -25,12 +41,31 @@ class ListPanel:
         tk.Button(btn_frame, text="Edit Task", command=self._edit_task).grid(row=0, column=2, padx=5)
         tk.Button(btn_frame, text="Filter Search", command=self._filter_tasks).grid(row=0, column=3, padx=5)
         tk.Button(btn_frame, text="Clear Search", command=self.update_tree).grid(row=0, column=4, padx=5)
-        tk.Button(btn_frame, text="Export to Calendar", command=self._export_calendar).grid(row=0, column=5, padx=5)
+        self.export_btn = tk.Button(btn_frame, text="Export to Calendar", command=self._export_calendar)
+        self.export_btn.grid(row=0, column=5, padx=5)
+        self.import_btn = tk.Button(btn_frame, text="Import Tasks", command=self._import_tasks)
+        self.import_btn.grid(row=0, column=6, padx=5)
+        # Shift/Ctrl-click picks several rows; Mark Complete and Delete Task act on all of them
+        tk.Button(btn_frame, text="Select All", command=self.tree_sync.select_all).grid(row=1, column=0, padx=5, pady=(5, 0))
+        tk.Button(btn_frame, text="Change Selected", command=self._bulk_edit).grid(row=1, column=1, padx=5, pady=(5, 0))
+        tk.Button(btn_frame, text="Undo", command=self._undo).grid(row=1, column=2, padx=5, pady=(5, 0))
+        tk.Button(btn_frame, text="Redo", command=self._redo).grid(row=1, column=3, padx=5, pady=(5, 0))
+        for key, command in (("<Control-z>", self._undo), ("<Control-y>", self._redo), ("<Control-Z>", self._redo)):
+            parent.bind(key, command)
 
+    # Pressing on a row of a multi-row selection drags the whole selection.
+    # Positions are looked up by task ID: filter results show only some tasks, so row numbers are not list positions.
     def _on_drag_start(self, event):
         item = self.tree.identify_row(event.y)
-        if item:
-            self.drag_data["start_index"] = self.tree.index(item)
+        if not item:
+            return
+        self.drag_data["start_index"] = self.get_tasks().index(int(item))
+        self.drag_data["block"] = None
+        if item in self.tree.selection() and not event.state & 0x0005:
+            block = self.tree_sync.selected_ids()
+            if len(block) > 1:
+                self.drag_data["block"] = block
+                return "break"
 
     def _on_drag_drop(self, event):
         if self.drag_data["start_index"] is None:
@@ -38,91 +73,128 @@ class ListPanel:
         target_item = self.tree.identify_row(event.y)
         if not target_item:
             return
-        new_index = self.tree.index(target_item)
+        new_index = self.get_tasks().index(int(target_item))
         old_index = self.drag_data["start_index"]
-        if new_index != old_index:
-            tasks = self.get_tasks()
-            task = tasks.pop(old_index)
-            tasks.insert(new_index, task)
-            self.set_tasks(tasks)
-            self.update_tree()
+        block = self.drag_data["block"]
+        if block and int(target_item) in block:
+            self.tree_sync.select([int(target_item)])
+        elif block:
+            self.callbacks["move_tasks"](block, new_index)
+            self.refresh()
+        elif new_index != old_index:
+            self.callbacks["move_task"](old_index, new_index)
+            self.refresh()
         self.drag_data["start_index"] = None
+        self.drag_data["block"] = None
+
+    # Redraw the table after a change (once per idle cycle when there is a RenderScheduler)
+    def refresh(self):
+        if self.render:
+            self.render.mark("tree")
+        else:
+            self.update_tree()
 
     def update_tree(self):
-        self.tree.delete(*self.tree.get_children())
-        tasks = self.get_tasks()
-        for task in tasks:
-            status = "Completed" if getattr(task, "completed", False) else "Pending"
-            tag = "completed" if getattr(task, "completed", False) else ("overdue" if getattr(task, "is_overdue") and task.is_overdue() else "")
-            self.tree.insert("", "end", values=(task.name, task.deadline, task.time_str, task.priority, status), tags=(tag,))
-        self.tree.tag_configure("overdue", background="tomato")
-        self.tree.tag_configure("completed", background="lightgreen")
+        if self.workers:
+            self.workers.cancel("filter")  # a filter still running would replace the full list
+        self.tree_sync.sync(self.get_tasks())
 
-    def _selected_task_name(self):
+    # Row IIDs are task IDs
+    def _selected_task_id(self):
         sel = self.tree.focus()
         if not sel:
             return None
-        return self.tree.item(sel, "values")[0]
+        return int(sel)
+
+    # Every selected row, including rows scrolled out of view after Select All
+    def _selected_task_ids(self):
+        return self.tree_sync.selected_ids()
 
     def _mark_complete(self):
-        name = self._selected_task_name()
-        if not name:
+        task_ids = self._selected_task_ids()
+        if not task_ids:
             messagebox.showwarning("Select Task", "Please select a task to mark complete.")
             return
-        self.callbacks["mark_complete"](name)
-        self.update_tree()
+        self.callbacks["mark_complete"](task_ids)
+        self.refresh()
 
     def _delete_task(self):
-        name = self._selected_task_name()
-        if not name:
+        task_ids = self._selected_task_ids()
+        if not task_ids:
             messagebox.showwarning("Select Task", "Please select a task to delete.")
             return
-        self.callbacks["delete_task"](name)
-        self.update_tree()
+        if len(task_ids) > 1 and not messagebox.askyesno("Delete Tasks", f"Delete {len(task_ids)} tasks?"):
+            return
+        self.callbacks["delete_task"](task_ids)
+        self.refresh()
+
+    def _bulk_edit(self):
+        task_ids = self._selected_task_ids()
+        if not task_ids:
+            messagebox.showwarning("Select Task", "Please select the tasks to change.")
+            return
+        self.callbacks["bulk_edit"](task_ids)
 
     def _edit_task(self):
-        name = self._selected_task_name()
-        if not name:
+        task_id = self._selected_task_id()
+        if task_id is None:
             messagebox.showwarning("Select Task", "Please select a task to edit.")
             return
-        self.callbacks["edit_task"](name)
-        self.update_tree()
+        self.callbacks["edit_task"](task_id)
+        self.refresh()
 
     def _filter_tasks(self):
+        from tkinter import simpledialog
         keyword = simpledialog.askstring("Filter Search", "Enter keyword or regex:")
         if not keyword:
             return
         try:
-            import re
-            pattern = re.compile(keyword, re.IGNORECASE)
-        except Exception:
+            tasks = self.get_tasks().search(keyword, scan=not self.workers)
+        except re.error:
             messagebox.showerror("Invalid Pattern", "Invalid regular expression.")
             return
-        tasks = [t for t in self.get_tasks() if pattern.search(t.name)]
-        self.tree.delete(*self.tree.get_children())
-        for t in tasks:
-            status = "Completed" if getattr(t, "completed", False) else "Pending"
-            tag = "completed" if getattr(t, "completed", False) else ("overdue" if getattr(t, "is_overdue") and t.is_overdue() else "")
-            self.tree.insert("", "end", values=(t.name, t.deadline, t.time_str, t.priority, status), tags=(tag,))
-        self.tree.tag_configure("overdue", background="tomato")
-        self.tree.tag_configure("completed", background="lightgreen")
+        if tasks is not None:
+            if self.workers:
+                self.workers.cancel("filter")
+            self.tree_sync.sync(tasks)
+            return
+        # scan every name on a worker; a newer filter replaces this one
+        snapshot = tuple(self.get_tasks())
+        names = [t.name for t in snapshot]
+        self.workers.submit(scan_names, names, keyword, key="filter", cpu=len(names) >= PROCESS_SCAN_MIN,
+                            on_done=lambda hits: self.tree_sync.sync([snapshot[i] for i in hits]))
 
     def _export_calendar(self):
         self.callbacks["export_calendar"]()
 
+    def _import_tasks(self):
+        self.callbacks["import_tasks"]()
+
+    # Buttons and Ctrl+Z / Ctrl+Y (Ctrl+Shift+Z)
+    def _undo(self, event=None):
+        self.callbacks["undo"]()
+
+    def _redo(self, event=None):
+        self.callbacks["redo"]()
+
 if __name__ == "__main__":
-    from task_model import Task
+    from task_model import Task, TaskList
     root = tk.Tk()
-    tasks = [Task("A", "2099-01-01", "09:00", "Low")]
+    tasks = TaskList([Task("A", "2099-01-01", "09:00", "Low")])
     def get_tasks(): return tasks
     def set_tasks(t):
-        nonlocal tasks
-        tasks = t
-    def dummy_mark(name): print("mark", name)
-    def dummy_delete(name): print("del", name)
-    def dummy_edit(name): print("edit", name)
+        pass
+    def dummy_mark(task_ids): print("mark", task_ids)
+    def dummy_delete(task_ids): print("del", task_ids)
+    def dummy_bulk(task_ids): print("bulk edit", task_ids)
+    def dummy_edit(task_id): print("edit", task_id)
     def dummy_export(): print("export")
-    callbacks = {"mark_complete": dummy_mark, "delete_task": dummy_delete, "edit_task": dummy_edit, "export_calendar": dummy_export}
+    def dummy_import(): print("import")
+    def move(old, new): tasks.move(old, new)
+    def move_block(task_ids, index): print("move", task_ids, "to", index)
+    def dummy_undo(): print("undo")
+    def dummy_redo(): print("redo")
+    callbacks = {"mark_complete": dummy_mark, "delete_task": dummy_delete, "edit_task": dummy_edit, "bulk_edit": dummy_bulk, "export_calendar": dummy_export, "move_task": move, "move_tasks": move_block, "import_tasks": dummy_import, "undo": dummy_undo, "redo": dummy_redo}
     panel = ListPanel(root, get_tasks, set_tasks, callbacks)
     panel.update_tree()
     root.mainloop()
\ No newline at end of file
@@ -1,159 +1,86 @@
-import tkinter as tk
-from datetime import datetime
-from task_model import Task
-from input_panel import InputPanel
-from list_panel import ListPanel
-from tkinter import messagebox, filedialog
-import re
-
-class TaskManagerApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Group 10 Task Manager")
-        self.root.geometry("750x520")
-        self.tasks = []
-        self.input_panel = InputPanel(root, self.add_task_callback)
-        callbacks = {"mark_complete": self.mark_complete_callback, "delete_task": self.delete_task_callback, "edit_task": self.edit_task_callback, "export_calendar": self.export_calendar}
-        self.list_panel = ListPanel(root, self.get_tasks, self.set_tasks, callbacks)
-        self.progress = None
-        self._make_progress()
-        self.list_panel.update_tree()
-        self.check_notifications()
-
-    def _make_progress(self):
-        from tkinter import ttk
-        self.progress = ttk.Progressbar(self.root, orient="horizontal", length=500, mode="determinate")
-        self.progress.pack(pady=10)
-        self.update_progress()
-
-    def add_task_callback(self, name, deadline, time_str, priority):
-        if not name or not deadline or not time_str:
-            messagebox.showerror("Error", "Please fill all fields.")
-            return
-        try:
-            datetime.strptime(deadline, "%Y-%m-%d")
-            datetime.strptime(time_str, "%H:%M")
-        except ValueError:
-            messagebox.showerror("Invalid Format", "Use YYYY-MM-DD for date and HH:MM for time.")
-            return
-        task = Task(name, deadline, time_str, priority)
-        self.tasks.append(task)
-        self.list_panel.update_tree()
-        self.input_panel.clear()
-
-    def get_tasks(self):
-        return self.tasks
-
-    def set_tasks(self, new_tasks):
-        self.tasks = new_tasks
-
-    def update_progress(self):
-        if not self.tasks:
-            self.progress["value"] = 0
-            return
-        completed = sum(1 for t in self.tasks if getattr(t, "completed", False))
-        self.progress["value"] = (completed / len(self.tasks)) * 100
-
-    def mark_complete_callback(self, name):
-        for t in self.tasks:
-            if t.name == name:
-                t.completed = True
-        self.list_panel.update_tree()
-        self.update_progress()
-
-    def delete_task_callback(self, name):
-        self.tasks = [t for t in self.tasks if t.name != name]
-        self.list_panel.update_tree()
-        self.update_progress()
-
-    def edit_task_callback(self, name):
-        task_to_edit = next((t for t in self.tasks if t.name == name), None)
-        if not task_to_edit:
-            return
-        edit_window = tk.Toplevel(self.root)
-        edit_window.title("Edit Task")
-        edit_window.geometry("360x300")
-        edit_window.configure(bg="#F5F6FA")
-        edit_window.resizable(False, False)
-        tk.Label(edit_window, text="Edit Task Details", font=("Arial", 13, "bold"), bg="#F5F6FA", fg="#333").pack(pady=10)
-        def labeled_entry(label, default):
-            frm = tk.Frame(edit_window, bg="#F5F6FA")
-            frm.pack(pady=4)
-            tk.Label(frm, text=label, bg="#F5F6FA", fg="#333").pack(anchor="w")
-            e = tk.Entry(frm, width=35, relief="solid", borderwidth=1)
-            e.pack()
-            e.insert(0, default)
-            return e
-        name_entry = labeled_entry("Task Name:", task_to_edit.name)
-        date_entry = labeled_entry("Date (YYYY-MM-DD):", task_to_edit.deadline)
-        time_entry = labeled_entry("Time (HH:MM):", task_to_edit.time_str)
-        tk.Label(edit_window, text="Priority:", bg="#F5F6FA", fg="#333").pack(anchor="w", padx=15)
-        from tkinter import ttk
-        priority_combo = ttk.Combobox(edit_window, values=["Low", "Medium", "High"], width=32)
-        priority_combo.pack(pady=4)
-        priority_combo.set(task_to_edit.priority)
-        def save_changes():
-            new_name = name_entry.get().strip()
-            new_deadline = date_entry.get().strip()
-            new_time = time_entry.get().strip()
-            new_priority = priority_combo.get().strip()
-            if not new_name or not new_deadline or not new_time:
-                messagebox.showerror("Error", "All fields must be filled.")
-                return
-            try:
-                datetime.strptime(new_deadline, "%Y-%m-%d")
-                datetime.strptime(new_time, "%H:%M")
-            except ValueError:
-                messagebox.showerror("Invalid Format", "Use YYYY-MM-DD for date and HH:MM for time.")
-                return
-            task_to_edit.name = new_name
-            task_to_edit.deadline = new_deadline
-            task_to_edit.time_str = new_time
-            task_to_edit.priority = new_priority
-            self.list_panel.update_tree()
-            messagebox.showinfo("Task Updated", f"'{new_name}' was updated successfully.")
-            edit_window.destroy()
-        btn_frame = tk.Frame(edit_window, bg="#F5F6FA")
-        btn_frame.pack(pady=15)
-        tk.Button(btn_frame, text="Save Changes", command=save_changes, bg="#007BFF", fg="white", relief="flat", padx=12, pady=6).grid(row=0, column=0, padx=8)
-        tk.Button(btn_frame, text="Cancel", command=edit_window.destroy, bg="#B0B0B0", fg="white", relief="flat", padx=12, pady=6).grid(row=0, column=1, padx=8)
-
-    def export_calendar(self):
-        if not self.tasks:
-            messagebox.showwarning("No Tasks", "There are no tasks to export.")
-            return
-        ics_content = "BEGIN:VCALENDAR\nVERSION:2.0\nCALSCALE:GREGORIAN\n"
-        for t in self.tasks:
-            try:
-                dtstart = datetime.strptime(f"{t.deadline} {t.time_str}", "%Y-%m-%d %H:%M")
-                ics_content += "BEGIN:VEVENT\n"
-                ics_content += f"SUMMARY:{t.name}\n"
-                ics_content += f"DTSTART:{dtstart.strftime('%Y%m%dT%H%M%S')}\n"
-                ics_content += f"DTEND:{dtstart.strftime('%Y%m%dT%H%M%S')}\n"
-                ics_content += f"DESCRIPTION:Priority - {t.priority}\n"
-                ics_content += "END:VEVENT\n"
-            except ValueError:
-                continue
-        ics_content += "END:VCALENDAR"
-        file_path = filedialog.asksaveasfilename(defaultextension=".ics", filetypes=[("Calendar files", "*.ics")])
-        if not file_path:
-            return
-        with open(file_path, "w") as f:
-            f.write(ics_content)
-        messagebox.showinfo("Export Successful", f"Tasks exported to {file_path}")
-
-    def check_notifications(self):
-        for t in self.tasks:
-            if not t.completed and not t.notified:
-                if t.is_overdue():
-                    messagebox.showwarning("Task Overdue", f"⚠ '{t.name}' is overdue!")
-                    t.notified = True
-                elif t.is_due_soon():
-                    messagebox.showinfo("Upcoming Task", f"🕒 '{t.name}' is due soon!")
-                    t.notified = True
-        self.root.after(60000, self.check_notifications)
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = TaskManagerApp(root)
-    root.mainloop()
+import argparse
+import tkinter as tk
+from task_engine import TaskEngine
+from task_store import TaskStore, DEFAULT_DB
+from input_panel import InputPanel
+from list_panel import ListPanel
+from notifications import desktop_backend
+from app_controller import AppController
+
+class TaskManagerApp:
+    # desktop is an optional notifications.desktop_backend() that also gets the due/overdue notices
+    # api_port serves the HTTP/JSON API in task_api.py on that port once the saved tasks are loaded
+    # shared=True lets other windows use db_path at the same time; their changes show up here as they save
+    def __init__(self, root, virtual=False, db_path=None, columnar=False, desktop=None, api_port=None,
+                 shared=False):
+        self.root = root
+        self.root.title("Group 10 Task Manager")
+        self.root.geometry("750x550")
+        self.engine = TaskEngine(TaskStore(db_path, shared) if db_path else None, columnar)
+        # Saving, loading, the API, undo, notifications, export/import and the edit windows
+        self.controller = AppController(root, self.engine, desktop, api_port)
+        c = self.controller
+        self.input_panel = InputPanel(root, self.add_task_callback)
+        callbacks = {"mark_complete": c.complete, "delete_task": c.delete, "edit_task": c.edit_window, "bulk_edit": c.bulk_edit_window, "export_calendar": c.export_calendar, "move_task": c.move, "move_tasks": c.move_many, "import_tasks": c.import_tasks, "undo": c.undo, "redo": c.redo}
+        # Changes mark the table and summary dirty; each is redrawn once per idle cycle
+        self.list_panel = ListPanel(root, self.get_tasks, self.set_tasks, callbacks, virtual, c.workers, c.render)
+        c.render.add("tree", self.list_panel.update_tree)
+        c.make_status(self.list_panel.export_btn, self.list_panel.import_btn)
+        self.list_panel.update_tree()
+        c.start()
+
+    @property
+    def tasks(self):
+        return self.engine.tasks
+
+    def add_task_callback(self, name, deadline, time_str, priority, repeat=""):
+        if self.controller.add(name, deadline, time_str, priority, repeat):
+            self.input_panel.clear()
+
+    def get_tasks(self):
+        return self.tasks
+
+    def set_tasks(self, new_tasks):
+        self.engine.reorder(new_tasks)
+        self.controller.save()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Group 10 Task Manager")
+    parser.add_argument("--virtual", action="store_true", help="only create table rows for tasks in view")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite file tasks are saved in")
+    parser.add_argument("--shared", action="store_true",
+                        help="let several windows or programs use the --db file at once and see each other's changes")
+    parser.add_argument("--columnar", action="store_true", help="vectorised deadline checks and sorts (needs numpy)")
+    parser.add_argument("--desktop-notify", action="store_true",
+                        help="also send due/overdue notices to the desktop (needs notify-send or plyer)")
+    parser.add_argument("--api", metavar="PORT", nargs="?", type=int, const=8765,
+                        help="serve the local HTTP/JSON API (task_api.py) on 127.0.0.1:PORT (default 8765)")
+    parser.add_argument("--profile", metavar="FILE", nargs="?", const="task_manager_profile.json",
+                        help="time handlers and event-loop lag, show them live and write them to FILE on exit")
+    args = parser.parse_args()
+    if args.columnar:
+        import task_columns
+        if task_columns.np is None:
+            parser.error("--columnar needs numpy (pip install numpy)")
+    desktop = None
+    if args.desktop_notify:
+        desktop = desktop_backend()
+        if desktop is None:
+            parser.error("--desktop-notify needs notify-send or the plyer package")
+    if args.profile:
+        import atexit
+        from instrumentation import Instrumentation
+        profiler = Instrumentation()
+        profiler.instrument_core()
+        profiler.instrument(TaskManagerApp, ("add_task_callback",))
+        profiler.instrument(ListPanel, (
+            "_on_drag_drop", "update_tree", "_mark_complete", "_delete_task", "_edit_task", "_filter_tasks",
+            "_export_calendar", "_import_tasks"))
+        atexit.register(profiler.dump, args.profile)
+    root = tk.Tk()
+    app = TaskManagerApp(root, virtual=args.virtual, db_path=args.db, columnar=args.columnar, desktop=desktop,
+                         api_port=args.api, shared=args.shared)
+    if args.profile:
+        profiler.watch_loop(root)
+        profiler.show_overlay(root)
+    root.mainloop()
@@ -0,0 +1,108 @@
+# Due-soon and overdue notices shown inside the window instead of one modal dialog per task.
+# Notices are queued and a burst is summed up in one line ("37 tasks overdue"), shown at a limited rate,
+# so the deadline scan never waits for the user to click OK.
+import time
+import tkinter as tk
+from collections import deque
+from deadline_scheduler import DUE_SOON, OVERDUE
+
+TITLES = {OVERDUE: "Task Overdue", DUE_SOON: "Upcoming Task"}
+
+
+# One line for n notices of a kind; names are the most recent task names queued for it
+def summary(kind, n, names):
+    if n == 1 and names:
+        return f"⚠ '{names[0]}' is overdue!" if kind == OVERDUE else f"🕒 '{names[0]}' is due soon!"
+    shown = ", ".join(f"'{name}'" for name in names[-3:])
+    more = f" and {n - 3} more" if n > 3 else ""
+    if kind == OVERDUE:
+        return f"⚠ {n} tasks overdue: {shown}{more}"
+    return f"🕒 {n} tasks due soon: {shown}{more}"
+
+
+# Desktop notifications through plyer or notify-send, sent from a background thread; None if neither exists
+def desktop_backend():
+    import threading
+    try:
+        from plyer import notification
+        send = lambda title, text: notification.notify(title=title, message=text, app_name="Group 10 Task Manager")
+    except ImportError:
+        import shutil
+        import subprocess
+        if not shutil.which("notify-send"):
+            return None
+        send = lambda title, text: subprocess.run(["notify-send", title, text], check=False)
+    return lambda title, text: threading.Thread(target=send, args=(title, text), daemon=True).start()
+
+
+class Notifier:
+    # Task names kept for the summary lines; counts are always exact
+    MAX_QUEUED = 1000
+    # Wait this long for the rest of a burst before showing anything
+    COALESCE_MS = 250
+    # Show at most one round of notices this often; more arrivals are summed into the next round
+    MIN_INTERVAL_MS = 3000
+
+    # show(text, warning) puts a line on screen; desktop(title, text) is an optional second destination
+    def __init__(self, root, show, desktop=None):
+        self.root = root
+        self.show = show
+        self.desktop = desktop
+        self._queue = deque(maxlen=self.MAX_QUEUED)    # (kind, task name), oldest dropped when full
+        self._counts = {}
+        self._timer = None
+        self._next_round = 0.0
+
+    # Queue a notice; returns straight away
+    def post(self, kind, task):
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        self._queue.append((kind, task.name))
+        if self._timer is None:
+            wait = max(self.COALESCE_MS, round((self._next_round - time.monotonic()) * 1000))
+            self._timer = self.root.after(wait, self._flush)
+
+    def _flush(self):
+        self._timer = None
+        self._next_round = time.monotonic() + self.MIN_INTERVAL_MS / 1000
+        counts, self._counts = self._counts, {}
+        names = {}
+        for kind, name in self._queue:
+            names.setdefault(kind, []).append(name)
+        self._queue.clear()
+        for kind in (OVERDUE, DUE_SOON):
+            if not counts.get(kind):
+                continue
+            text = summary(kind, counts[kind], names.get(kind, []))
+            self.show(text, kind == OVERDUE)
+            if self.desktop:
+                self.desktop(TITLES[kind], text)
+
+    def close(self):
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+
+
+class NotificationPanel:
+    # Lines on screen at once, and how long each one stays (click a line to dismiss it sooner)
+    MAX_LINES = 4
+    SHOW_MS = 10000
+
+    def __init__(self, master):
+        self.frame = tk.Frame(master)
+        self.frame.pack(fill="x", padx=10, pady=(0, 5))
+        self._lines = deque()
+
+    def show(self, text, warning=False):
+        line = tk.Label(self.frame, text=text, anchor="w", padx=6, bg="mistyrose" if warning else "lightyellow")
+        line.pack(fill="x", pady=1)
+        line.bind("<Button-1>", lambda event: self._hide(line))
+        line.after(self.SHOW_MS, self._hide, line)
+        self._lines.append(line)
+        while len(self._lines) > self.MAX_LINES:
+            self._hide(self._lines[0])
+
+    def _hide(self, line):
+        if line in self._lines:
+            self._lines.remove(line)
+            line.destroy()
@@ -0,0 +1,206 @@
+# Repeat rules for tasks: a subset of the iCalendar RRULE (RFC 5545 section 3.3.10).
+# A repeating task is still one task; its deadline and time are the occurrence currently due, and
+# completing it moves them on to the next one. Occurrences are generated one at a time, so a daily
+# rule with no end costs no more memory than a one-off task.
+import calendar
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+FREQUENCIES = {"DAILY": "day", "WEEKLY": "week", "MONTHLY": "month", "YEARLY": "year"}
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# Choices offered in the Repeat boxes; anything else typed there is read as an RRULE
+PRESETS = {"": "", "none": "", "daily": "FREQ=DAILY", "weekly": "FREQ=WEEKLY", "monthly": "FREQ=MONTHLY",
+           "yearly": "FREQ=YEARLY"}
+REPEAT_CHOICES = ("", "Daily", "Weekly", "Monthly", "Yearly")
+
+
+class Rule:
+    __slots__ = ("freq", "interval", "count", "until", "byday")
+
+    def __init__(self, freq, interval=1, count=None, until=None, byday=()):
+        self.freq = freq
+        self.interval = interval
+        self.count = count      # occurrences left, counting the current one (None for no limit)
+        self.until = until      # last allowed occurrence as a local datetime (None for no end)
+        self.byday = byday      # weekday numbers (Monday is 0) for WEEKLY rules
+
+    # Canonical RRULE value, as saved with the task and written to calendar files
+    def __str__(self):
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[d] for d in self.byday))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%dT%H%M%S}")
+        return ";".join(parts)
+
+
+# An UNTIL value as a local datetime; a date alone allows the whole of that day
+def _until(value):
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").replace(hour=23, minute=59, second=59)
+    dt = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        dt = dt.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return dt
+
+
+# Read a repeat rule: a preset name ("daily", "weekly", ...) or RRULE text, with or without "RRULE:".
+# Returns a Rule, or None for no repeat; raises ValueError with a message for the user.
+def parse_rule(text):
+    text = (text or "").strip()
+    if text.lower() in PRESETS:
+        text = PRESETS[text.lower()]
+        if not text:
+            return None
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    parts = {}
+    for part in text.upper().split(";"):
+        key, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"'{part}' is not NAME=VALUE.")
+        parts[key.strip()] = value.strip()
+    freq = parts.pop("FREQ", None)
+    if freq not in FREQUENCIES:
+        raise ValueError("FREQ must be DAILY, WEEKLY, MONTHLY or YEARLY.")
+    rule = Rule(freq)
+    try:
+        if "INTERVAL" in parts:
+            rule.interval = int(parts.pop("INTERVAL"))
+        if "COUNT" in parts:
+            rule.count = int(parts.pop("COUNT"))
+        if "UNTIL" in parts:
+            rule.until = _until(parts.pop("UNTIL"))
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be whole numbers and UNTIL a YYYYMMDD date.") from None
+    if rule.interval < 1 or (rule.count is not None and rule.count < 1):
+        raise ValueError("INTERVAL and COUNT must be at least 1.")
+    if rule.count is not None and rule.until is not None:
+        raise ValueError("Use COUNT or UNTIL, not both.")
+    if "BYDAY" in parts:
+        days = parts.pop("BYDAY").split(",")
+        if freq != "WEEKLY" or not set(days) <= set(WEEKDAYS):
+            raise ValueError("BYDAY is only supported as plain weekdays (MO,TU,...) with FREQ=WEEKLY.")
+        rule.byday = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+    parts.pop("WKST", None)  # weeks always start on Monday here, as they do by default
+    if parts:
+        raise ValueError(f"{', '.join(sorted(parts))} is not supported.")
+    return rule
+
+
+# What a Repeat box shows for a saved rule: its preset name when it has one ("Weekly"), else the RRULE
+def repeat_choice(repeat):
+    for choice in REPEAT_CHOICES:
+        if PRESETS[choice.lower()] == repeat:
+            return choice
+    return repeat
+
+
+# Check a repeat rule like validate_task does; returns (title, message) for an error, or None
+def validate_repeat(text):
+    try:
+        parse_rule(text)
+    except ValueError as e:
+        return "Invalid Repeat", f"Repeat must be Daily, Weekly, Monthly, Yearly or an RRULE. {e}"
+    return None
+
+
+# The canonical form of a repeat rule, "" for none (raises ValueError like parse_rule)
+def normalize(text):
+    rule = parse_rule(text)
+    return "" if rule is None else str(rule)
+
+
+# Short label for the table, e.g. "weekly" or "every 2 weeks on MO,WE"
+@lru_cache(maxsize=256)
+def describe(text):
+    try:
+        rule = parse_rule(text)
+    except ValueError:
+        return "repeats"
+    if rule is None:
+        return ""
+    unit = FREQUENCIES[rule.freq]
+    label = rule.freq.lower() if rule.interval == 1 else f"every {rule.interval} {unit}s"
+    if rule.byday:
+        label += " on " + ",".join(WEEKDAYS[d] for d in rule.byday)
+    if rule.count is not None:
+        label += f", {rule.count} left"
+    elif rule.until is not None:
+        label += f" until {rule.until:%Y-%m-%d}"
+    return label
+
+
+# Candidate dates for a rule, in order, from the period that contains start (not yet limited by it)
+def _candidates(rule, start):
+    step = rule.interval
+    if rule.freq == "DAILY":
+        day = start
+        while True:
+            yield day
+            day += timedelta(days=step)
+    elif rule.freq == "WEEKLY":
+        week = start - timedelta(days=start.weekday())
+        days = rule.byday or (start.weekday(),)
+        while True:
+            for d in days:
+                yield week + timedelta(days=d)
+            week += timedelta(weeks=step)
+    else:
+        months = step if rule.freq == "MONTHLY" else 12 * step
+        index = start.year * 12 + start.month - 1
+        while True:
+            year, month = divmod(index, 12)
+            # months without this day (the 31st, February 29th) have no occurrence
+            if start.day <= calendar.monthrange(year, month + 1)[1]:
+                yield start.replace(year=year, month=month + 1)
+            index += months
+
+
+# Yield the occurrences of a rule as datetimes, starting with start itself (which always counts as
+# the first, as in RFC 5545), until COUNT or UNTIL runs out; rules without either never end.
+def occurrences(rule, start):
+    if isinstance(rule, str):
+        rule = parse_rule(rule)
+    left = rule.count
+    if rule.until is not None and start > rule.until:
+        return
+    yield start
+    if left is not None:
+        left -= 1
+    try:
+        for dt in _candidates(rule, start):
+            if dt <= start:
+                continue
+            if left == 0 or (rule.until is not None and dt > rule.until):
+                return
+            yield dt
+            if left is not None:
+                left -= 1
+    except (OverflowError, ValueError):
+        return  # past the year 9999
+
+
+# Where a repeating task moves when it is completed: its first occurrence after `after` (a datetime).
+# Returns (deadline, time_str, repeat) with COUNT reduced by the occurrences passed over,
+# or None when the rule has no occurrence left (or the task's date is not valid).
+def advance(repeat, deadline, time_str, after):
+    try:
+        start = datetime.strptime(f"{deadline} {time_str}", "%Y-%m-%d %H:%M")
+        rule = parse_rule(repeat)
+    except ValueError:
+        return None
+    if rule is None:
+        return None
+    passed = 0
+    for dt in occurrences(rule, start):
+        if dt > after and passed:
+            if rule.count is not None:
+                rule.count -= passed
+            return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M"), str(rule)
+        passed += 1
+    return None
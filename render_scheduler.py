@@ -0,0 +1,27 @@
+# Coalesces redraw requests: changes mark parts of the window dirty, and each dirty part is redrawn
+# once when Tk next goes idle, however many changes came before it.
+class RenderScheduler:
+    def __init__(self, root):
+        self.root = root
+        self._parts = {}        # name -> function that redraws it, in the order they are drawn
+        self._dirty = set()
+        self._pending = None
+
+    def add(self, name, redraw):
+        self._parts[name] = redraw
+
+    # Ask for these parts to be redrawn on the next idle cycle
+    def mark(self, *names):
+        self._dirty.update(names)
+        if self._pending is None:
+            self._pending = self.root.after_idle(self.flush)
+
+    # Redraw the dirty parts now (also run by the idle callback)
+    def flush(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        dirty, self._dirty = self._dirty, set()
+        for name, redraw in self._parts.items():
+            if name in dirty:
+                redraw()
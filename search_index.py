@@ -0,0 +1,176 @@
+# Trigram index over task names, used to narrow down filter searches before the exact match
+import re
+
+REGEX_META = set(".^$*+?{}[]\\|()")
+
+# Letters re.IGNORECASE treats as the same but str.lower() keeps apart (the first of each group is kept)
+CASE_EQUIVALENTS = ("s\u017f", "i\u0131\u0130", "\u00b5\u03bc", "\u03b9\u0345\u1fbe", "\u0390\u1fd3",
+                    "\u03b0\u1fe3", "\u03b2\u03d0", "\u03b5\u03f5", "\u03b8\u03d1", "\u03ba\u03f0",
+                    "\u03c0\u03d6", "\u03c1\u03f1", "\u03c3\u03c2", "\u03c6\u03d5", "\u1e61\u1e9b",
+                    "\ufb06\ufb05")
+_FOLD = str.maketrans({c: group[0] for group in CASE_EQUIVALENTS for c in group[1:]})
+# Escapes whose body runs past the letter: \xNN, \uNNNN, \UNNNNNNNN
+ESCAPE_DIGITS = {"x": 2, "u": 4, "U": 8}
+
+
+# Lower case the way re.IGNORECASE compares letters, so the index and the regex agree
+# (İ is mapped before lower(), which would otherwise turn it into two characters)
+def fold(text):
+    if text.isascii():
+        return text.lower()
+    return text.translate(_FOLD).lower().translate(_FOLD)
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Return literal strings (folded, see fold()) that every match of the regex must contain.
+# Conservative: anything it does not understand simply ends the current literal run,
+# and patterns with alternation or inline flags give no literals at all (no pre-filter).
+def required_literals(pattern):
+    if "|" in pattern or "(?" in pattern:
+        return []
+    runs = []
+    run = []
+
+    def end_run():
+        if len(run) >= 3:
+            runs.append(fold("".join(run)))
+        run.clear()
+
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if nxt and not nxt.isalnum():
+                run.append(nxt)  # escaped punctuation is a literal
+                i += 2
+            else:
+                end_run()        # \d, \w, \b, \x41, \1 ... are not
+                i = _skip_escape(pattern, i)
+        elif c == "[" or c == "(":
+            # skip a character class or a whole group
+            end_run()
+            i = _skip_group(pattern, i)
+        elif c in "*?":
+            if run:
+                run.pop()        # the previous character is optional
+            end_run()
+            i += 1
+        elif c == "{":
+            if run:
+                run.pop()
+            end_run()
+            close = pattern.find("}", i)
+            i = len(pattern) if close == -1 else close + 1
+        elif c == "+":
+            last = run[-1:]      # at least one copy of the previous character
+            end_run()
+            run.extend(last)
+            i += 1
+        elif c in REGEX_META:
+            end_run()
+            i += 1
+        else:
+            run.append(c)
+            i += 1
+    end_run()
+    return runs
+
+
+# Positions of the names that match pattern (case-insensitive). Works on plain strings only,
+# so it can run on a worker thread or in another process while the task list keeps changing.
+def scan_names(names, pattern):
+    search = re.compile(pattern, re.IGNORECASE).search
+    return [i for i, name in enumerate(names) if search(name)]
+
+
+# Return the index just past the letter or digit escape starting at pattern[start] (a backslash)
+def _skip_escape(pattern, start):
+    i = start + 1
+    c = pattern[i:i + 1]
+    if c in ESCAPE_DIGITS:
+        return i + 1 + ESCAPE_DIGITS[c]
+    if c == "N" and pattern[i + 1:i + 2] == "{":
+        close = pattern.find("}", i)
+        return len(pattern) if close == -1 else close + 1
+    if c.isdigit():
+        # an octal escape (\0, \101) or a group reference (\1, \12): take up to three digits.
+        # A digit that was really plain text is only left out of the literals, which is safe.
+        end = i
+        while end < min(i + 3, len(pattern)) and pattern[end] in "0123456789":
+            end += 1
+        return end
+    return i + 1
+
+
+# Return the index just past the class or group starting at pattern[start]
+def _skip_group(pattern, start):
+    depth = 0
+    i = start
+    in_class = False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]" and i > class_start + 1:
+                in_class = False
+                if depth == 0:
+                    return i + 1
+        elif c == "[":
+            in_class = True
+            class_start = i if pattern[i + 1:i + 2] != "^" else i + 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                i += 1
+                # a group followed by a quantifier may repeat; nothing after it is known either
+                return i
+        i += 1
+    return i
+
+
+class TrigramIndex:
+    def __init__(self):
+        self._postings = {}  # trigram -> set of task ids
+
+    def add(self, task_id, name):
+        for gram in trigrams(fold(name)):
+            ids = self._postings.get(gram)
+            if ids is None:
+                self._postings[gram] = {task_id}
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id, name):
+        for gram in trigrams(fold(name)):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._postings[gram]
+
+    # Task ids whose names contain every trigram of every literal, or None if the literals give no trigrams
+    def candidates(self, literals):
+        postings = []
+        for literal in literals:
+            for gram in trigrams(literal):
+                ids = self._postings.get(gram)
+                if not ids:
+                    return set()
+                postings.append(ids)
+        if not postings:
+            return None
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
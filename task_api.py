@@ -0,0 +1,371 @@
+# Opt-in local HTTP/JSON API so other tools can push tasks in and query them
+# (TASKMANAGER.py --api [PORT], main.py --api [PORT], or headless with task_cli.py serve).
+# Listens on 127.0.0.1 only. The asyncio server runs on its own thread; each request becomes a small
+# function queued for the Tk thread, which applies whatever has arrived as one batch, then redraws and
+# saves once. Requests never touch the task list from the server thread.
+#
+#   GET   /tasks?match=REGEX&status=open|done|all   list tasks
+#   GET   /tasks/due?within=SECONDS                  {"overdue": [...], "due_soon": [...]}
+#   POST  /tasks           {"name", "deadline", "time_str", "priority", "repeat"}, a list of them
+#                          or {"tasks": [...]} (all or none)
+#   PATCH /tasks/ID        any of {"name", "deadline", "time_str", "priority", "repeat"}
+#   POST  /tasks/complete  {"ids": [...]}
+#   POST  /tasks/delete    {"ids": [...]}
+#   GET   /export.ics      the calendar, streamed
+# Requests that change tasks must be sent as Content-Type: application/json. A web page can only send
+# that after a CORS preflight, which this server never answers, so pages cannot change tasks.
+import asyncio
+import json
+import queue
+import re
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from ics_export import iter_ics
+from task_engine import TaskError
+from task_model import PRIORITY_RANK, DUE_SOON_SECONDS
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+EDITABLE = ("name", "deadline", "time_str", "priority", "repeat")
+LOCAL_HOSTS = (HOST, "localhost")
+
+
+# A request that cannot be served; args are (HTTP status, message)
+class ApiError(Exception):
+    pass
+
+
+def task_json(task):
+    return {"id": task.id, "name": task.name, "deadline": task.deadline, "time_str": task.time_str,
+            "priority": task.priority, "completed": task.completed, "notified": task.notified, "repeat": task.repeat}
+
+
+def check_priority(value):
+    if not isinstance(value, str) or value not in PRIORITY_RANK:
+        raise ApiError(400, f"priority must be one of {', '.join(PRIORITY_RANK)}")
+    return value
+
+
+def id_list(body):
+    ids = body.get("ids") if isinstance(body, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+        raise ApiError(400, 'expected {"ids": [task IDs]}')
+    return ids
+
+
+class TaskApiServer:
+    # How often the Tk thread picks up requests while they are arriving, and when none have for a while
+    POLL_MS = 5
+    IDLE_POLL_MS = 50
+    BUSY_SECONDS = 1.0
+    # Request work done per Tk turn; anything left waits for the next turn so the window keeps redrawing
+    BATCH_SECONDS = 0.015
+    # Largest request body, and most tasks added by one request
+    MAX_BODY = 8 * 1024 * 1024
+    MAX_TASKS = 10000
+    # Headless mode: pending changes are flushed to the store this long after the first one
+    FLUSH_SECONDS = 0.5
+    # Calendar blocks per write while streaming an export
+    EXPORT_BLOCKS = 500
+
+    # engine is the app's TaskEngine. root is the Tk root whose thread applies requests; with root=None
+    # (task_cli.py serve) they are applied on the server's own loop and saved by the server.
+    # on_change(changed, removed) runs on the applying thread after a batch that changed tasks.
+    def __init__(self, engine, root=None, on_change=None, port=DEFAULT_PORT):
+        self.engine = engine
+        self.root = root
+        self.on_change = on_change
+        self.port = port
+        self._requests = queue.Queue()  # (function, future) waiting for the Tk thread
+        self._loop = None
+        self._thread = None
+        self._timer = None
+        self._last_busy = 0.0
+        self._flush_timer = None
+
+    # Serve from a background thread alongside the Tk mainloop; returns once the port is open.
+    # The search index is built up front so the first ?match= request does not stall the window.
+    def start(self):
+        self.engine.tasks.build_search_index()
+        ready = threading.Event()
+        failure = []
+        self._thread = threading.Thread(target=self._run, args=(ready, failure), name="task-api", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+        self._timer = self.root.after(self.IDLE_POLL_MS, self._drain)
+
+    def _run(self, ready, failure):
+        loop = self._loop = asyncio.new_event_loop()
+        try:
+            server = loop.run_until_complete(asyncio.start_server(self._handle, HOST, self.port))
+        except OSError as e:
+            failure.append(e)
+            ready.set()
+            loop.close()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+    # Serve on this thread until interrupted (no Tk); on_ready(port) is called once listening
+    def serve_forever(self, on_ready=None):
+        self.engine.tasks.build_search_index()
+
+        async def serve():
+            self._loop = asyncio.get_running_loop()
+            server = await asyncio.start_server(self._handle, HOST, self.port)
+            self.port = server.sockets[0].getsockname()[1]
+            if on_ready:
+                on_ready(self.port)
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve())
+
+    def stop(self):
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2)
+
+    # On the Tk thread: apply the queued requests as one batch, within the time budget
+    def _drain(self):
+        deadline = time.perf_counter() + self.BATCH_SECONDS
+
+        def arrived():
+            while time.perf_counter() < deadline:
+                try:
+                    yield self._requests.get_nowait()
+                except queue.Empty:
+                    return
+
+        if self._apply(arrived()):
+            self._last_busy = time.monotonic()
+        busy = time.monotonic() - self._last_busy < self.BUSY_SECONDS
+        self._timer = self.root.after(self.POLL_MS if busy else self.IDLE_POLL_MS, self._drain)
+
+    # Run each (function, future) pair; functions return (payload, changed tasks, removed tasks).
+    # Answers go back to the server loop once the batch's bookkeeping is done. Returns the number run.
+    def _apply(self, requests):
+        changed, removed, answers = [], [], []
+        for fn, future in requests:
+            try:
+                payload, done, gone = fn()
+                changed += done
+                removed += gone
+                answers.append((future, (200, payload)))
+            except ApiError as e:
+                answers.append((future, (e.args[0], {"error": e.args[1]})))
+            except TaskError as e:
+                answers.append((future, (400, {"error": f"{e.args[0]}: {e.args[1]}"})))
+            except re.error as e:
+                answers.append((future, (400, {"error": f"Invalid regular expression: {e}"})))
+            except Exception as e:
+                answers.append((future, (500, {"error": repr(e)})))
+        if (changed or removed) and self.on_change:
+            self.on_change(changed, removed)
+        for future, answer in answers:
+            self._loop.call_soon_threadsafe(self._answer, future, answer)
+        return len(answers)
+
+    @staticmethod
+    def _answer(future, answer):
+        if not future.done():   # the client may have gone away
+            future.set_result(answer)
+
+    # Run fn where the task list lives and wait for its (status, payload)
+    async def _call(self, fn):
+        future = self._loop.create_future()
+        if self.root is None:
+            self._apply([(fn, future)])
+            if self.engine.pending and self._flush_timer is None:
+                self._flush_timer = self._loop.call_later(self.FLUSH_SECONDS, self._flush)
+        else:
+            self._requests.put((fn, future))
+        return await future
+
+    def _flush(self):
+        self._flush_timer = None
+        self.engine.flush()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, query, body, keep_alive = request
+                    if method == "GET" and path == "/export.ics":
+                        await self._stream_export(writer)
+                        break
+                    status, payload = await self._call(self._route(method, path, query, body))
+                except ApiError as e:
+                    status, payload, keep_alive = e.args[0], {"error": e.args[1]}, False
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # (method, path, query, JSON body, keep-alive) for the next request, or None once the client is done
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise ApiError(400, "bad request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        # only local clients: a page in a browser cannot reach the API through a rebound host name
+        if headers.get("host", "").rsplit(":", 1)[0] not in LOCAL_HOSTS:
+            raise ApiError(403, "only requests to 127.0.0.1 or localhost are served")
+        # browsers send Origin with cross-site requests; only pages served from this machine get through
+        if "origin" in headers and urlsplit(headers["origin"]).hostname not in LOCAL_HOSTS:
+            raise ApiError(403, "requests from other sites are not served")
+        if method not in ("GET", "HEAD") and \
+                headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+            raise ApiError(415, "requests that change tasks must be sent as application/json")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ApiError(400, "Content-Length must be a number of bytes")
+        if length > self.MAX_BODY:
+            raise ApiError(413, "request body too large")
+        body = None
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise ApiError(400, "body is not valid JSON")
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        url = urlsplit(target)
+        return method, url.path.rstrip("/") or "/", parse_qs(url.query), body, keep_alive
+
+    def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=task_json, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    # Take a snapshot on the Tk thread, then build and send the calendar from this thread
+    async def _stream_export(self, writer):
+        _, tasks = await self._call(lambda: (tuple(self.engine.tasks), (), ()))
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/calendar; charset=utf-8\r\n"
+                     b"Content-Disposition: attachment; filename=tasks.ics\r\nConnection: close\r\n\r\n")
+        blocks = []
+        for block in iter_ics(tasks):
+            blocks.append(block)
+            if len(blocks) == self.EXPORT_BLOCKS:
+                writer.write("".join(blocks).encode("utf-8"))
+                blocks.clear()
+                await writer.drain()
+        writer.write("".join(blocks).encode("utf-8"))
+        await writer.drain()
+
+    # The function that serves a request on the Tk thread. Anything that can be checked without
+    # the task list is checked here, on the server thread.
+    def _route(self, method, path, query, body):
+        engine = self.engine
+        if path == "/tasks" and method == "GET":
+            match = query.get("match", [None])[0]
+            status = query.get("status", ["all"])[0]
+            if status not in ("open", "done", "all"):
+                raise ApiError(400, "status must be open, done or all")
+
+            def list_tasks():
+                tasks = engine.filter(match) if match else engine.tasks
+                if status != "all":
+                    tasks = [t for t in tasks if t.completed == (status == "done")]
+                return list(tasks), (), ()
+            return list_tasks
+
+        if path == "/tasks/due" and method == "GET":
+            try:
+                within = int(query.get("within", [DUE_SOON_SECONDS])[0])
+            except ValueError:
+                raise ApiError(400, "within must be a number of seconds")
+
+            def due():
+                overdue, due_soon = engine.due_events(within=within)
+                return {"overdue": overdue, "due_soon": due_soon}, (), ()
+            return due
+
+        if path == "/tasks" and method == "POST":
+            if isinstance(body, dict) and "tasks" in body:
+                body = body["tasks"]
+                if not isinstance(body, list):
+                    raise ApiError(400, 'expected {"tasks": [tasks]}')
+            items = body if isinstance(body, list) else [body]
+            if len(items) > self.MAX_TASKS:
+                raise ApiError(413, f"at most {self.MAX_TASKS} tasks per request")
+            if not all(isinstance(item, dict) for item in items):
+                raise ApiError(400, "each task must be a JSON object")
+            entries = [(str(item.get("name", "")).strip(), str(item.get("deadline", "")),
+                        str(item.get("time_str", "")), check_priority(item.get("priority", "Medium")),
+                        str(item.get("repeat", "")))
+                       for item in items]
+
+            def add():
+                tasks = engine.add_many(entries)
+                return {"ids": [t.id for t in tasks]}, tasks, ()
+            return add
+
+        if path == "/tasks/complete" and method == "POST":
+            ids = id_list(body)
+
+            def complete():
+                changed = engine.complete_many(ids)
+                return {"completed": [t.id for t in changed]}, changed, ()
+            return complete
+
+        if path == "/tasks/delete" and method == "POST":
+            ids = id_list(body)
+
+            def delete():
+                removed = engine.delete_many(ids)
+                return {"deleted": [t.id for t in removed]}, (), removed
+            return delete
+
+        parts = path.split("/")
+        if len(parts) == 3 and parts[1] == "tasks" and parts[2].isdigit() and method == "PATCH":
+            task_id = int(parts[2])
+            if not isinstance(body, dict) or not body or not set(body) <= set(EDITABLE):
+                raise ApiError(400, f"send an object with any of {', '.join(EDITABLE)}")
+            fields = {field: str(value) for field, value in body.items()}
+            if "priority" in fields:
+                check_priority(fields["priority"])
+
+            def update():
+                task = engine.edit(task_id, **fields)
+                if task is None:
+                    raise ApiError(404, f"no task with ID {task_id}")
+                return task, [task], ()
+            return update
+
+        raise ApiError(404, f"no route for {method} {path}")
@@ -0,0 +1,243 @@
+# Command-line access to the saved tasks, for scripts and machines without a display.
+# Uses the same journal/SQLite files as the apps, e.g.
+#   python task_cli.py list --match report --status open
+#   python task_cli.py --db tasks.db complete --match "^nightly"
+#   python task_cli.py import backlog.csv
+#   python task_cli.py add "Water plants" 2026-06-01 08:00 --repeat "FREQ=WEEKLY;BYDAY=MO,TH"
+#   python task_cli.py serve --port 8765          (the HTTP/JSON API in task_api.py, without a window)
+import argparse
+import queue
+import re
+import sys
+from datetime import datetime, timedelta
+from task_engine import TaskEngine, TaskError
+from tree_sync import task_row
+
+
+def open_store(args):
+    if args.db:
+        from task_store import TaskStore
+        return TaskStore(args.db)
+    from task_journal import TaskJournal, DEFAULT_JOURNAL
+    return TaskJournal(args.journal or DEFAULT_JOURNAL)
+
+
+# Tasks picked by ID and/or by a name pattern, without duplicates, in list order
+def pick(engine, args):
+    missing = [task_id for task_id in args.ids if engine.get(task_id) is None]
+    for task_id in missing:
+        print(f"No task with ID {task_id}", file=sys.stderr)
+    wanted = set(args.ids)
+    if args.match:
+        wanted.update(task.id for task in engine.filter(args.match))
+    return [task for task in engine.tasks if task.id in wanted], bool(missing)
+
+
+def print_tasks(tasks):
+    for task in tasks:
+        values, _ = task_row(task)
+        print(task.id, *values, sep="\t")
+
+
+def cmd_list(engine, args):
+    tasks = engine.filter(args.match) if args.match else engine.tasks
+    if args.status != "all":
+        tasks = [t for t in tasks if t.completed == (args.status == "done")]
+    print_tasks(tasks)
+
+
+def cmd_add(engine, args):
+    task = engine.add(args.name, args.date, args.time, args.priority, args.repeat)
+    print(task.id)
+
+
+def cmd_edit(engine, args):
+    fields = {field: value for field, value in
+              (("name", args.name), ("deadline", args.date), ("time_str", args.time), ("priority", args.priority),
+               ("repeat", args.repeat))
+              if value is not None}
+    if engine.edit(args.id, **fields) is None:
+        print(f"No task with ID {args.id}", file=sys.stderr)
+        return 1
+
+
+def cmd_complete(engine, args):
+    tasks, missing = pick(engine, args)
+    engine.complete_many([task.id for task in tasks])
+    print(f"Completed {len(tasks)} tasks.")
+    return 1 if missing else 0
+
+
+def cmd_delete(engine, args):
+    tasks, missing = pick(engine, args)
+    engine.delete_many([task.id for task in tasks])
+    print(f"Deleted {len(tasks)} tasks.")
+    return 1 if missing else 0
+
+
+def cmd_move(engine, args):
+    old = engine.tasks.index(args.id)
+    if old is None:
+        print(f"No task with ID {args.id}", file=sys.stderr)
+        return 1
+    engine.move(old, min(max(args.position, 1), len(engine.tasks)) - 1)
+
+
+def cmd_sort(engine, args):
+    engine.sort(args.by)
+
+
+def cmd_due(engine, args):
+    overdue, due_soon = engine.due_events(within=args.within * 60)
+    for label, tasks in (("overdue", overdue), ("due soon", due_soon)):
+        for task in tasks:
+            print(label, task.id, task.name, task.deadline, task.time_str, task.priority, sep="\t")
+
+
+# Every occurrence in the next few days, repeating tasks expanded one occurrence at a time
+def cmd_agenda(engine, args):
+    start = datetime.now().replace(second=0, microsecond=0)
+    end = start + timedelta(days=args.days)
+    for when, task in engine.agenda(start, end):
+        print(f"{when:%Y-%m-%d}", f"{when:%H:%M}", task.id, task.name, task.priority, sep="\t")
+
+
+def cmd_stats(engine, args):
+    tasks = engine.tasks
+    print(f"total\t{len(tasks)}")
+    print(f"completed\t{tasks.completed_count}")
+    print(f"overdue\t{tasks.overdue_count}")
+    for priority in ("High", "Medium", "Low"):
+        print(f"open {priority.lower()}\t{tasks.priority_counts.get(priority, 0)}")
+
+
+def cmd_import(engine, args):
+    job = engine.import_file(args.file)
+    job.run()
+    while True:
+        try:
+            engine.add_tasks(job.batches.get_nowait())
+        except queue.Empty:
+            break
+    if job.error:
+        print(f"Could not read {args.file}: {job.error}", file=sys.stderr)
+        return 1
+    print(f"Imported {job.imported} tasks.")
+    for line, reason in job.rejected:
+        print(f"line {line}: {reason}", file=sys.stderr)
+    return 1 if job.rejected_count else 0
+
+
+def cmd_export(engine, args):
+    job = engine.export(args.file)
+    job.run()
+    if job.error:
+        print(f"Could not write {args.file}: {job.error}", file=sys.stderr)
+        return 1
+    print(f"Exported {job.total} tasks.")
+
+
+def cmd_serve(engine, args):
+    from task_api import TaskApiServer
+    server = TaskApiServer(engine, port=args.port)
+    try:
+        server.serve_forever(lambda port: print(f"Serving http://127.0.0.1:{port}/ (Ctrl+C to stop)", flush=True))
+    except KeyboardInterrupt:
+        pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Group 10 Task Manager (command line)")
+    parser.add_argument("--journal", help="journal file tasks are saved in (the default)")
+    parser.add_argument("--db", help="use this SQLite file instead of a journal")
+    parser.add_argument("--columnar", action="store_true", help="vectorised deadline checks and sorts (needs numpy)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("list", help="print tasks as tab-separated rows")
+    p.add_argument("--match", help="keyword or regex the name must match")
+    p.add_argument("--status", choices=("open", "done", "all"), default="all")
+    p.set_defaults(run=cmd_list, writes=False)
+
+    p = commands.add_parser("add", help="add a task and print its ID")
+    p.add_argument("name")
+    p.add_argument("date", help="YYYY-MM-DD")
+    p.add_argument("time", help="HH:MM")
+    p.add_argument("--priority", choices=("Low", "Medium", "High"), default="Medium")
+    p.add_argument("--repeat", default="", help="daily, weekly, monthly, yearly or an RRULE (FREQ=WEEKLY;BYDAY=MO,WE)")
+    p.set_defaults(run=cmd_add, writes=True)
+
+    p = commands.add_parser("edit", help="change fields of a task")
+    p.add_argument("id", type=int)
+    p.add_argument("--name")
+    p.add_argument("--date")
+    p.add_argument("--time")
+    p.add_argument("--priority", choices=("Low", "Medium", "High"))
+    p.add_argument("--repeat", help="new repeat rule (\"none\" to stop repeating)")
+    p.set_defaults(run=cmd_edit, writes=True)
+
+    for name, run in (("complete", cmd_complete), ("delete", cmd_delete)):
+        p = commands.add_parser(name, help=f"{name} tasks by ID and/or name pattern")
+        p.add_argument("ids", type=int, nargs="*")
+        p.add_argument("--match", help="also every task whose name matches this keyword or regex")
+        p.set_defaults(run=run, writes=True)
+
+    p = commands.add_parser("move", help="move a task to a position in the list (1 = top)")
+    p.add_argument("id", type=int)
+    p.add_argument("position", type=int)
+    p.set_defaults(run=cmd_move, writes=True)
+
+    p = commands.add_parser("sort", help="sort the saved list")
+    p.add_argument("by", choices=("priority", "date"))
+    p.set_defaults(run=cmd_sort, writes=True)
+
+    p = commands.add_parser("due", help="print overdue tasks and tasks due soon")
+    p.add_argument("--within", type=int, default=10, help="minutes ahead that count as due soon")
+    p.set_defaults(run=cmd_due, writes=False)
+
+    p = commands.add_parser("agenda", help="print every occurrence of the open tasks over the next days")
+    p.add_argument("--days", type=int, default=7)
+    p.set_defaults(run=cmd_agenda, writes=False)
+
+    p = commands.add_parser("stats", help="print task counts")
+    p.set_defaults(run=cmd_stats, writes=False)
+
+    p = commands.add_parser("import", help="add tasks from a CSV or .ics file")
+    p.add_argument("file")
+    p.set_defaults(run=cmd_import, writes=True)
+
+    p = commands.add_parser("export", help="write tasks to an .ics calendar file")
+    p.add_argument("file")
+    p.set_defaults(run=cmd_export, writes=False)
+
+    p = commands.add_parser("serve", help="serve the local HTTP/JSON API until interrupted")
+    p.add_argument("--port", type=int, default=8765)
+    p.set_defaults(run=cmd_serve, writes=True)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.columnar:
+        import task_columns
+        if task_columns.np is None:
+            parser.error("--columnar needs numpy (pip install numpy)")
+    engine = TaskEngine(open_store(args), args.columnar)
+    try:
+        engine.load_all()
+        status = args.run(engine, args) or 0
+        if args.writes:
+            engine.flush()
+    except TaskError as e:
+        print(f"{e.args[0]}: {e.args[1]}", file=sys.stderr)
+        status = 1
+    except re.error as e:
+        print(f"Invalid regular expression: {e}", file=sys.stderr)
+        status = 1
+    finally:
+        engine.close()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# Optional column store for very large lists (needs numpy): one array per field, so overdue and
+# due-soon checks, per-priority counts and sorting are single vectorised passes instead of Python loops.
+# A TaskList built with columnar=True keeps one of these in step with its tasks (TaskList.columns).
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from task_model import PRIORITY_RANK
+
+
+class TaskColumns:
+    # Rows allocated up front; arrays grow by half again when full
+    MIN_CAPACITY = 1024
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("columnar mode needs numpy (pip install numpy)")
+        self.size = 0                   # rows in use, including removed ones not yet compacted
+        self._dead = 0
+        self._row = {}                  # task id -> row
+        self.names = []                 # string table, one entry per row (None once removed)
+        self._allocate(self.MIN_CAPACITY)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "ids", None)
+        arrays = {
+            "ids": np.int64, "due": np.int64, "has_due": np.bool_, "priority": np.uint8,
+            "completed": np.bool_, "notified": np.bool_, "live": np.bool_,
+        }
+        for field, dtype in arrays.items():
+            array = np.zeros(capacity, dtype)
+            if old is not None:
+                array[:self.size] = getattr(self, field)[:self.size]
+            setattr(self, field, array)
+
+    def _write(self, row, task):
+        due = task.due
+        self.ids[row] = task.id
+        self.has_due[row] = due is not None
+        self.due[row] = due or 0
+        self.priority[row] = PRIORITY_RANK.get(task.priority, 3)
+        self.completed[row] = task.completed
+        self.notified[row] = task.notified
+        self.live[row] = True
+        self.names[row] = task.name
+
+    # Add a task, or rewrite its row if it is already here
+    def put(self, task):
+        row = self._row.get(task.id)
+        if row is not None:
+            self._write(row, task)
+            return
+        if self.size == len(self.ids):
+            self._allocate(len(self.ids) * 3 // 2)
+        row = self.size
+        self.size += 1
+        self._row[task.id] = row
+        self.names.append(None)
+        self._write(row, task)
+
+    # Rows are only marked dead here; the arrays are compacted once half of them are
+    def remove(self, task_id):
+        row = self._row.pop(task_id)
+        self.live[row] = False
+        self.names[row] = None
+        self._dead += 1
+        if self._dead * 2 > self.size > self.MIN_CAPACITY:
+            self.compact()
+
+    def compact(self):
+        keep = self.live[:self.size]
+        count = int(keep.sum())
+        for field in ("ids", "due", "has_due", "priority", "completed", "notified", "live"):
+            array = getattr(self, field)
+            array[:count] = array[:self.size][keep]
+            array[count:self.size] = 0
+        self.names = [name for name, alive in zip(self.names, keep.tolist()) if alive]
+        self.size = count
+        self._dead = 0
+        self._row = dict(zip(self.ids[:count].tolist(), range(count)))
+
+    # Mask of rows holding an open (live, not completed) task with a valid deadline
+    def _open_dated(self):
+        s = self.size
+        return self.live[:s] & ~self.completed[:s] & self.has_due[:s]
+
+    def overdue_ids(self, now):
+        s = self.size
+        return self.ids[:s][self._open_dated() & (self.due[:s] < now)]
+
+    def due_soon_ids(self, now, within):
+        s = self.size
+        due = self.due[:s]
+        return self.ids[:s][self._open_dated() & (due >= now) & (due <= now + within)]
+
+    # Task ids in SORT_KEYS order: (priority rank, id) or (dated first, epoch, id)
+    def order(self, by):
+        s = self.size
+        rows = np.flatnonzero(self.live[:s])
+        ids = self.ids[rows]
+        if by == "priority":
+            keys = (ids, self.priority[rows])
+        elif by == "date":
+            keys = (ids, self.due[rows], ~self.has_due[rows])
+        else:
+            raise KeyError(by)
+        return ids[np.lexsort(keys)]
+
+    # (completed, {priority rank: open tasks}) counted in one pass
+    def counts(self):
+        s = self.size
+        live = self.live[:s]
+        done = live & self.completed[:s]
+        per_rank = np.bincount(self.priority[:s][live & ~done], minlength=4)
+        return int(done.sum()), {rank: int(per_rank[rank]) for rank in (1, 2, 3)}
@@ -0,0 +1,410 @@
+# Task logic with no GUI: the Tk apps and the command line (task_cli.py) all drive a TaskEngine.
+# Nothing here imports tkinter, so it runs on machines without a display.
+import heapq
+import time
+from datetime import datetime
+from task_model import Task, TaskList, SORT_KEYS, DUE_SOON_SECONDS, validate_task
+from recurrence import advance, normalize, occurrences, validate_repeat
+from undo import History, id_array
+
+
+# Fields copied onto a task when another program changed it (see sync)
+SYNCED_FIELDS = ("name", "deadline", "time_str", "priority", "completed", "notified", "repeat")
+# More tasks than this to put in place during a sync and the list is re-sorted instead
+SYNC_INSERTS = 32
+
+
+# A task could not be added or changed; args are (title, message) like validate_task's result
+class TaskError(ValueError):
+    pass
+
+
+class TaskEngine:
+    # store is a TaskJournal or TaskStore that saves every change (None keeps tasks in memory only).
+    # Changes are recorded in the store straight away; flush() writes them out.
+    # columnar=True keeps numpy columns next to the list for vectorised scans and sorts (needs numpy).
+    def __init__(self, store=None, columnar=False):
+        self.store = store
+        self.columnar = columnar
+        self.tasks = TaskList(columnar=columnar)
+        # every change made through the engine can be undone (see undo.py); loading is not a change
+        self.history = History()
+        self.writing = None     # changes being written on a worker thread (see take_pending())
+
+    # Add the saved tasks chunk by chunk, yielding each chunk once it is in the list
+    def load(self):
+        if not self.store:
+            return
+        for chunk in self.store.load():
+            for task in chunk:
+                self.tasks.append(task)
+            yield chunk
+
+    def load_all(self):
+        for _ in self.load():
+            pass
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def _put(self, task):
+        if self.store:
+            self.store.put(task)
+
+    # repeat is a recurrence rule ("daily", "weekly", an RRULE, ...); deadline/time_str is the first occurrence
+    def add(self, name, deadline, time_str, priority="Medium", repeat=""):
+        error = validate_task(name, deadline, time_str) or validate_repeat(repeat)
+        if error:
+            raise TaskError(*error)
+        task = Task(name, deadline, time_str, priority, repeat=normalize(repeat))
+        self.add_tasks([task])
+        return task
+
+    # Add several new tasks from (name, deadline, time_str, priority, repeat) entries.
+    # Every entry is checked before any is added; returns the new tasks.
+    def add_many(self, entries):
+        for number, (name, deadline, time_str, priority, repeat) in enumerate(entries, 1):
+            error = validate_task(name, deadline, time_str) or validate_repeat(repeat)
+            if error:
+                raise TaskError(error[0], f"Task {number}: {error[1]}")
+        tasks = [Task(name, deadline, time_str, priority, repeat=normalize(repeat))
+                 for name, deadline, time_str, priority, repeat in entries]
+        self.add_tasks(tasks)
+        return tasks
+
+    # Add tasks that are already built and checked (an import batch)
+    def add_tasks(self, tasks):
+        start = len(self.tasks)
+        for task in tasks:
+            self.tasks.append(task)
+            self._put(task)
+        if tasks:
+            self.history.record(("remove", list(enumerate(tasks, start))))
+
+    # Change any of name, deadline, time_str, priority, repeat; returns the task (None if there is no such task)
+    def edit(self, task_id, **fields):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        if fields.keys() & {"name", "deadline", "time_str"}:
+            error = validate_task(fields.get("name", task.name), fields.get("deadline", task.deadline),
+                                  fields.get("time_str", task.time_str))
+            if error:
+                raise TaskError(*error)
+        if "repeat" in fields:
+            error = validate_repeat(fields["repeat"])
+            if error:
+                raise TaskError(*error)
+            fields["repeat"] = normalize(fields["repeat"])
+        old = {field: getattr(task, field) for field in fields}
+        if old != fields:
+            self.history.record(("fields", [(task, old)]))
+        self.tasks.update(task, **fields)
+        self._put(task)
+        return task
+
+    def complete(self, task_id):
+        changed = self.complete_many([task_id])
+        return changed[0] if changed else self.tasks.get(task_id)
+
+    # Bulk changes for a multi-row selection: the whole batch goes through the list and the store at once,
+    # so the caller refreshes the view a single time afterwards.
+    # A repeating task moves on to its next occurrence after now instead, until its rule runs out.
+    # Returns the tasks that were completed or moved on.
+    def complete_many(self, task_ids, now=None):
+        after = datetime.now() if now is None else datetime.fromtimestamp(now)
+        changed, old = [], []
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            if task is None or task.completed:
+                continue
+            following = advance(task.repeat, task.deadline, task.time_str, after) if task.repeat else None
+            if following:
+                old.append((task, {"deadline": task.deadline, "time_str": task.time_str, "repeat": task.repeat,
+                                   "notified": task.notified}))
+                deadline, time_str, repeat = following
+                self.tasks.update(task, deadline=deadline, time_str=time_str, repeat=repeat, notified=False)
+            else:
+                old.append((task, {"completed": False}))
+                self.tasks.update(task, completed=True)
+            self._put(task)
+            changed.append(task)
+        if old:
+            self.history.record(("fields", old))
+        return changed
+
+    # Set the same fields (a new priority, or a new deadline and/or time) on several tasks.
+    # Every task is checked before any is changed, so a bad date leaves them all as they were.
+    def edit_many(self, task_ids, **fields):
+        tasks = [task for task in map(self.tasks.get, task_ids) if task is not None]
+        if fields.keys() & {"name", "deadline", "time_str"}:
+            for task in tasks:
+                error = validate_task(fields.get("name", task.name), fields.get("deadline", task.deadline),
+                                      fields.get("time_str", task.time_str))
+                if error:
+                    raise TaskError(*error)
+        if tasks:
+            self.history.record(("fields", [(task, {field: getattr(task, field) for field in fields})
+                                            for task in tasks]))
+        for task in tasks:
+            self.tasks.update(task, **fields)
+            self._put(task)
+        return tasks
+
+    # Remember that the user has been alerted about this task
+    def mark_notified(self, task):
+        self.tasks.update(task, notified=True)
+        self._put(task)
+
+    def delete(self, task_id):
+        removed = self.delete_many([task_id])
+        return removed[0] if removed else None
+
+    # Returns the removed tasks
+    def delete_many(self, task_ids):
+        placed = sorted((self.tasks.index(task_id), task) for task_id, task in
+                        {task_id: self.tasks.get(task_id) for task_id in task_ids}.items() if task is not None)
+        if not placed:
+            return []
+        removed = self.tasks.remove_many(task.id for _, task in placed)
+        if self.store:
+            for task in removed:
+                self.store.delete(task.id)
+        self.history.record(("insert", placed))
+        return removed
+
+    # Move the task at position old to position new
+    def move(self, old, new):
+        self.tasks.move(old, new)
+        if self.store:
+            self.store.moved(self.tasks, new)
+        self.history.record(("move", new, old))
+
+    # Move several tasks so they sit together, in their current order, starting at position index
+    def move_many(self, task_ids, index):
+        tasks = [task for task in map(self.tasks.get, task_ids) if task is not None]
+        if not tasks:
+            return
+        tasks.sort(key=lambda t: self.tasks.index(t.id))
+        before = id_array(self.tasks)
+        index = self.tasks.move_many(tasks, index)
+        if self.store:
+            self.store.moved(self.tasks, index, len(tasks))
+        self._record_order(before)
+
+    # Sort by a SORT_KEYS name ("priority" or "date")
+    def sort(self, by):
+        if by not in SORT_KEYS:
+            raise TaskError("Invalid Sort", f"Can only sort by {', '.join(SORT_KEYS)}.")
+        before = id_array(self.tasks)
+        self.tasks.sort_by(by)
+        if self.store:
+            self.store.reordered(self.tasks, by)
+        self._record_order(before)
+
+    # Replace the list with the same tasks in a new order
+    def reorder(self, tasks):
+        before = id_array(self.tasks)
+        self.tasks = tasks if isinstance(tasks, TaskList) else TaskList(tasks, self.columnar)
+        if self.store:
+            self.store.reordered(self.tasks)
+        self._record_order(before)
+
+    # Keep only the stretch of the old order (task IDs) that differs from the list now
+    def _record_order(self, before):
+        start, end = 0, len(before)
+        while start < end and before[start] == self.tasks[start].id:
+            start += 1
+        while end > start and before[end - 1] == self.tasks[end - 1].id:
+            end -= 1
+        if start < end:
+            self.history.record(("window", start, before[start:end]))
+
+    # Undo the last change (redo() puts it back); returns (changed, removed) tasks like sync(),
+    # or None when there is nothing to undo
+    def undo(self):
+        return self.history.undo(self._apply)
+
+    def redo(self):
+        return self.history.redo(self._apply)
+
+    # Carry out an undo.py command; returns (its inverse, (changed, removed))
+    def _apply(self, command):
+        kind = command[0]
+        if kind == "insert":
+            placed = command[1]
+            for position, task in placed:
+                self.tasks.insert(position, task)
+            if self.store:
+                for _, task in placed:
+                    self.store.put(task)
+                # rank each run of neighbouring positions between the tasks around it
+                run = 0
+                for i, (position, _) in enumerate(placed):
+                    if i + 1 == len(placed) or placed[i + 1][0] != position + 1:
+                        self.store.moved(self.tasks, position - run, run + 1)
+                        run = 0
+                    else:
+                        run += 1
+            return ("remove", placed), ([task for _, task in placed], [])
+        if kind == "remove":
+            placed = command[1]
+            removed = self.tasks.remove_many(task.id for _, task in placed)
+            if self.store:
+                for task in removed:
+                    self.store.delete(task.id)
+            return ("insert", placed), ([], removed)
+        if kind == "fields":
+            inverse = []
+            for task, values in command[1]:
+                inverse.append((task, {field: getattr(task, field) for field in values}))
+                self.tasks.update(task, **values)
+                self._put(task)
+            return ("fields", inverse), ([task for task, _ in command[1]], [])
+        if kind == "move":
+            _, old, new = command
+            self.tasks.move(old, new)
+            if self.store:
+                self.store.moved(self.tasks, new)
+            return ("move", new, old), ([], [])
+        _, start, ids = command
+        current = id_array(self.tasks[start:start + len(ids)])
+        self.tasks.place(start, [self.tasks.get(task_id) for task_id in ids])
+        if self.store:
+            self.store.moved(self.tasks, start, len(ids))
+        return ("window", start, current), ([], [])
+
+    # Tasks whose name matches a keyword or regex, in list order (raises re.error for a bad pattern).
+    # scan=False returns None when the search index cannot help, so the caller can scan elsewhere.
+    def filter(self, pattern, scan=True):
+        return self.tasks.search(pattern, scan)
+
+    # Open tasks that are overdue and open tasks due within the next `within` seconds
+    def due_events(self, now=None, within=DUE_SOON_SECONDS):
+        if now is None:
+            now = time.time()
+        columns = self.tasks.columns
+        if columns is not None:
+            get = self.tasks.get
+            return ([get(i) for i in columns.overdue_ids(now).tolist()],
+                    [get(i) for i in columns.due_soon_ids(now, within).tolist()])
+        overdue, due_soon = [], []
+        for task in self.tasks:
+            due = task.due
+            if task.completed or due is None:
+                continue
+            if due < now:
+                overdue.append(task)
+            elif due <= now + within:
+                due_soon.append(task)
+        return overdue, due_soon
+
+    # Bring the list up to date with what other programs saved to a shared TaskStore since the last sync.
+    # Pending changes are written first (the last write wins); only the changed tasks are read and touched.
+    # Returns (changed, removed) tasks.
+    def sync(self):
+        if self.writing is not None or not self.store.changed_elsewhere():
+            return [], []  # the store is busy writing; look again next time
+        self.flush()
+        fresh, moved, deleted = self.store.pull()
+        removed = self.tasks.remove_many(deleted) if deleted else []
+        changed, placed = [], []
+        for new in fresh:
+            task = self.tasks.get(new.id)
+            if task is None:
+                placed.append(new)
+                changed.append(new)
+                continue
+            fields = {f: getattr(new, f) for f in SYNCED_FIELDS if getattr(new, f) != getattr(task, f)}
+            if fields:
+                self.tasks.update(task, **fields)
+            if task.id in moved:
+                placed.append(task)
+            if fields or task.id in moved:
+                changed.append(task)
+        if moved:
+            self.tasks.remove_many(moved)
+        if changed or removed:
+            # positions and tasks held for undo no longer match the list
+            self.history.clear()
+        if len(placed) > SYNC_INSERTS:
+            # a sort or a big move elsewhere: cheaper to re-sort once than to insert one by one
+            for task in placed:
+                self.tasks.append(task)
+            self.tasks.sort(key=self.store.sort_key)
+        else:
+            for task in placed:
+                self._insert_in_order(task)
+        return changed, removed
+
+    # Insert a task where the store's order puts it (the list is kept in that order)
+    def _insert_in_order(self, task):
+        key = self.store.sort_key
+        target = key(task)
+        lo, hi = 0, len(self.tasks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(self.tasks[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.tasks.insert(lo, task)
+
+    # Yield (datetime, task) for every occurrence of the open tasks from start up to (not including) end,
+    # in time order. Repeating tasks are expanded lazily, one occurrence at a time, so a long range costs
+    # memory for one pending occurrence per task rather than for the whole range.
+    def agenda(self, start, end):
+        def expand(task):
+            try:
+                first = datetime.strptime(f"{task.deadline} {task.time_str}", "%Y-%m-%d %H:%M")
+            except ValueError:
+                return
+            for when in occurrences(task.repeat, first) if task.repeat else (first,):
+                if when >= end:
+                    return
+                if when >= start:
+                    yield when, task.id, task
+
+        streams = [expand(task) for task in self.tasks if not task.completed]
+        for when, _, task in heapq.merge(*streams):
+            yield when, task
+
+    # An ExportJob over a snapshot of the list; run() it on a worker (or right here)
+    def export(self, path):
+        from ics_export import ExportJob
+        return ExportJob(path, tuple(self.tasks))
+
+    # An ImportJob for a CSV or .ics file; run() it on a worker and pass its batches to add_tasks()
+    def import_file(self, path):
+        from task_import import ImportJob
+        return ImportJob(path)
+
+    @property
+    def pending(self):
+        return bool(self.store) and self.store.pending
+
+    def flush(self):
+        if self.store:
+            self.store.flush(self.tasks)
+
+    # Saving without blocking the window: take the pending changes here, run self.store.write(batch)
+    # on a worker, then call saved(result) or save_failed() back here. Returns None when there is
+    # nothing to write or a write is still running (only one at a time; sync() waits for it).
+    def take_pending(self):
+        if not self.store or self.writing is not None:
+            return None
+        self.writing = self.store.take()
+        return self.writing
+
+    def saved(self, result):
+        self.writing = None
+        self.store.wrote(result, self.tasks)
+
+    # The changes are kept and written with the next batch
+    def save_failed(self):
+        self.store.restore(self.writing)
+        self.writing = None
+
+    def close(self):
+        if self.store:
+            self.store.close()
@@ -0,0 +1,185 @@
+# Streams tasks in from CSV or iCalendar (.ics) files; run() is meant for a worker thread
+import csv
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from task_model import Task, validate_task
+from recurrence import normalize, validate_repeat
+
+# Header names accepted for each CSV column (case-insensitive)
+CSV_COLUMNS = {
+    "name": ("name", "task", "task name", "summary"),
+    "deadline": ("deadline", "date"),
+    "time_str": ("time", "time_str"),
+    "priority": ("priority",),
+    "status": ("status", "completed"),
+    "repeat": ("repeat", "repeats", "rrule", "recurrence"),
+}
+PRIORITIES = ("Low", "Medium", "High")
+PRIORITY_NAMES = {level.lower(): level for level in PRIORITIES}
+
+
+# Decode a binary file line by line, counting the bytes read for progress
+def _lines(f, counter):
+    for raw in f:
+        counter[0] += len(raw)
+        yield raw.decode("utf-8-sig", errors="replace")
+
+
+# Yield (line number, name, deadline, time, priority, completed, repeat) for each CSV data row.
+# Without a recognised header the columns are taken as name, date, time, priority, status, repeat.
+def iter_csv(lines):
+    reader = csv.reader(lines)
+    columns = None
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        if columns is None:
+            header = [cell.strip().lower() for cell in row]
+            columns = {}
+            for field, names in CSV_COLUMNS.items():
+                for i, cell in enumerate(header):
+                    if cell in names:
+                        columns[field] = i
+                        break
+            if "name" in columns:
+                continue
+            columns = dict(zip(CSV_COLUMNS, range(len(CSV_COLUMNS))))
+
+        def cell(field, default=""):
+            i = columns.get(field)
+            return row[i].strip() if i is not None and i < len(row) else default
+
+        status = cell("status").lower()
+        # a blank priority cell means the default; any other value must name a priority ("high" is High)
+        priority = cell("priority") or "Medium"
+        priority = PRIORITY_NAMES.get(priority.lower(), priority)
+        yield (reader.line_num, cell("name"), cell("deadline"), cell("time_str"), priority,
+               status in ("completed", "true", "yes", "1", "x"), cell("repeat"))
+
+
+def _unescape(value):
+    out = []
+    chars = iter(value)
+    for ch in chars:
+        if ch == "\\":
+            nxt = next(chars, "")
+            out.append("\n" if nxt in "nN" and nxt else nxt)
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+# Turn a DTSTART value into (YYYY-MM-DD, HH:MM) local time; date-only values get 00:00
+def _ics_datetime(value, params):
+    if "VALUE=DATE" in params.upper() or len(value) == 8:
+        dt = datetime.strptime(value[:8], "%Y%m%d")
+    else:
+        dt = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+        if value.endswith("Z"):
+            dt = dt.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
+
+
+# Yield one row per VEVENT, in the same shape as iter_csv; folded lines are joined first
+def iter_ics(lines):
+    # Yield (line number, unfolded content line)
+    def content_lines():
+        pending, pending_num = None, 0
+        for line_num, line in enumerate(lines, 1):
+            line = line.rstrip("\r\n")
+            if line[:1] in (" ", "\t") and pending is not None:
+                pending += line[1:]
+                continue
+            if pending is not None:
+                yield pending_num, pending
+            pending, pending_num = line, line_num
+        if pending is not None:
+            yield pending_num, pending
+
+    event = None
+    start_line = 0
+    for line_num, line in content_lines():
+        key, _, value = line.partition(":")
+        name, _, params = key.partition(";")
+        name = name.upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+            start_line = line_num
+        elif name == "END" and value.upper() == "VEVENT" and event is not None:
+            try:
+                deadline, time_str = _ics_datetime(*event["DTSTART"]) if "DTSTART" in event else ("", "")
+            except ValueError:
+                deadline, time_str = event["DTSTART"][0], "?"
+            priority = "Medium"
+            description = event.get("DESCRIPTION", ("", ""))[0]
+            for level in PRIORITIES:
+                if description == f"Priority - {level}":
+                    priority = level
+            completed = event.get("STATUS", ("", ""))[0].upper() == "COMPLETED"
+            yield (start_line, _unescape(event.get("SUMMARY", ("", ""))[0]), deadline, time_str, priority, completed,
+                   event.get("RRULE", ("", ""))[0])
+            event = None
+        elif event is not None:
+            event[name] = (value, params)
+
+
+class ImportJob:
+    # Tasks handed to the Tk thread at a time
+    BATCH = 2000
+    # Rejected rows kept for the summary
+    MAX_REJECTS = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self.total = os.path.getsize(path) or 1
+        self.batches = queue.Queue()    # lists of new Task objects, drained on the Tk thread
+        self.imported = 0
+        self.rejected = []              # (line number, reason)
+        self.rejected_count = 0
+        self.error = None
+        self.finished = False
+        self._read = [0]
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return min(self._read[0], self.total)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _reject(self, line, reason):
+        self.rejected_count += 1
+        if len(self.rejected) < self.MAX_REJECTS:
+            self.rejected.append((line, reason))
+
+    def run(self):
+        rows = iter_ics if self.path.lower().endswith((".ics", ".ical")) else iter_csv
+        batch = []
+        try:
+            with open(self.path, "rb") as f:
+                for line, name, deadline, time_str, priority, completed, repeat in rows(_lines(f, self._read)):
+                    if self._cancel.is_set():
+                        break
+                    error = validate_task(name, deadline, time_str) or validate_repeat(repeat)
+                    if not error and priority not in PRIORITIES:
+                        error = "Invalid Priority", f"Priority must be {', '.join(PRIORITIES)}, not '{priority}'."
+                    if error:
+                        self._reject(line, error[1])
+                        continue
+                    task = Task(name, deadline, time_str, priority, repeat=normalize(repeat))
+                    task.completed = completed
+                    batch.append(task)
+                    if len(batch) >= self.BATCH:
+                        self.batches.put(batch)
+                        self.imported += len(batch)
+                        batch = []
+            if batch:
+                self.batches.put(batch)
+                self.imported += len(batch)
+        except (OSError, csv.Error) as e:
+            self.error = e
+        finally:
+            self.finished = True
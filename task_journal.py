@@ -0,0 +1,207 @@
+# File persistence for tasks: an append-only journal of changes plus a periodic snapshot.
+# Same interface as task_store.TaskStore, so the app can use either one.
+import json
+import os
+import threading
+from task_model import Task, TaskList, SORT_KEYS, reserve_ids
+
+DEFAULT_JOURNAL = os.path.join(os.path.expanduser("~"), ".group10_tasks.journal")
+
+
+# Task fields as stored in a "put" record or a snapshot line.
+# The repeat rule is only written for repeating tasks (and files from before it existed have none).
+def task_fields(task):
+    fields = [task.id, task.name, task.deadline, task.time_str, task.priority, int(task.completed),
+              int(task.notified)]
+    if task.repeat:
+        fields.append(task.repeat)
+    return fields
+
+
+def task_from_fields(fields):
+    task_id, name, deadline, time_str, priority, completed, notified = fields[:7]
+    task = Task(name, deadline, time_str, priority, task_id, fields[7] if len(fields) > 7 else "")
+    task.completed = bool(completed)
+    task.notified = bool(notified)
+    return task
+
+
+class TaskJournal:
+    # Compact into a new snapshot once the journal grows past this many bytes
+    COMPACT_BYTES = 4 * 1024 * 1024
+    # Tasks per chunk handed back by load()
+    LOAD_CHUNK = 5000
+
+    def __init__(self, path):
+        self.path = path                    # the journal; older records live in path + ".old"
+        self.snapshot_path = path + ".snapshot"
+        self.loading = False
+        self._seq = 0                       # sequence number of the last record written
+        self._buffer = []                   # records not yet written to disk
+        self._file = open(path, "a", encoding="utf-8")
+        self._compactor = None
+
+    # Read the snapshot, replay the journal records written after it, and yield the tasks in chunks
+    def load(self, chunk=LOAD_CHUNK):
+        self.loading = True
+        try:
+            tasks = TaskList()
+            covered = 0
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, encoding="utf-8") as f:
+                    covered = json.loads(f.readline())["seq"]
+                    for line in f:
+                        tasks.append(task_from_fields(json.loads(line)))
+            self._seq = covered
+            for path in (self.path + ".old", self.path):
+                if os.path.exists(path):
+                    self._replay(path, tasks, covered)
+            if len(tasks):
+                reserve_ids(max(task.id for task in tasks))
+            if os.path.exists(self.path + ".old"):
+                # the last compaction was interrupted; finish it now
+                self._write_snapshot(list(tasks), self._seq)
+            for start in range(0, len(tasks), chunk):
+                yield tasks[start:start + chunk]
+        finally:
+            self.loading = False
+
+    # Apply the records in one journal file that are newer than the snapshot
+    def _replay(self, path, tasks, covered):
+        good = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    record = json.loads(line)
+                except ValueError:
+                    # torn last line from a crash mid-write: cut it off so new records start cleanly
+                    if path == self.path:
+                        self._file.truncate(good)
+                    break
+                good += len(line)
+                seq, op = record[0], record[1]
+                if seq <= covered:
+                    continue
+                self._seq = seq
+                if op == "put":
+                    fields = record[2:]
+                    task = tasks.get(fields[0])
+                    if task is None:
+                        tasks.append(task_from_fields(fields))
+                    else:
+                        _, name, deadline, time_str, priority, completed, notified = fields[:7]
+                        tasks.update(task, name=name, deadline=deadline, time_str=time_str, priority=priority,
+                                     completed=bool(completed), notified=bool(notified),
+                                     repeat=fields[7] if len(fields) > 7 else "")
+                elif op == "del":
+                    tasks.remove(record[2])
+                elif op == "move":
+                    task = tasks.remove(record[2])
+                    if task is not None:
+                        tasks.insert(record[3], task)
+                elif op == "moves":
+                    tasks.move_many([t for t in map(tasks.get, record[2]) if t is not None], record[3])
+                elif op == "sort":
+                    tasks.sort_by(record[2])
+                elif op == "order":
+                    order = {task_id: i for i, task_id in enumerate(record[2])}
+                    tasks.sort(key=lambda t: order.get(t.id, len(order)))
+
+    def _append(self, *record):
+        self._seq += 1
+        self._buffer.append(json.dumps([self._seq, *record], ensure_ascii=False, separators=(",", ":")))
+
+    @property
+    def pending(self):
+        return bool(self._buffer)
+
+    # Record a new or changed task (add, edit, complete, notified)
+    def put(self, task):
+        self._append("put", *task_fields(task))
+
+    def delete(self, task_id):
+        self._append("del", task_id)
+
+    # The count tasks starting at tasks[index] were moved there
+    def moved(self, tasks, index, count=1):
+        if count == 1:
+            self._append("move", tasks[index].id, index)
+        else:
+            self._append("moves", [task.id for task in tasks[index:index + count]], index)
+
+    # The whole list was reordered; a named sort replays from its key, anything else stores the order
+    def reordered(self, tasks, by=None):
+        if by in SORT_KEYS:
+            self._append("sort", by)
+        else:
+            self._append("order", [task.id for task in tasks])
+
+    # Write buffered records with a single fsync, then compact if the journal has grown too big
+    def flush(self, tasks=None):
+        text = self.take()
+        if text is None:
+            return
+        try:
+            size = self.write(text)
+        except Exception:
+            self.restore(text)
+            raise
+        self.wrote(size, tasks)
+
+    # flush() in steps, as in TaskStore: take() the buffered records, write(text) them on a worker
+    # thread, then wrote(size) or restore(text) back on the thread that changes tasks
+    def take(self):
+        if self.loading or not self._buffer:
+            return None
+        text = "\n".join(self._buffer) + "\n"
+        self._buffer.clear()
+        return text
+
+    # Returns the journal's size afterwards
+    def write(self, text):
+        self._file.write(text)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def wrote(self, size, tasks=None):
+        if tasks is not None and size > self.COMPACT_BYTES:
+            self.compact(tasks)
+
+    def restore(self, text):
+        self._buffer.insert(0, text[:-1])
+
+    # Start writing a snapshot of tasks on a background thread.
+    # The current journal becomes path.old and new records go to a fresh journal.
+    def compact(self, tasks):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if os.path.exists(self.path + ".old"):
+            return  # an earlier compaction did not finish; its records are still needed
+        self._file.close()
+        os.replace(self.path, self.path + ".old")
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Shallow copy of the list: later changes are in the new journal and replay over the snapshot
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(list(tasks), self._seq), daemon=True)
+        self._compactor.start()
+
+    def _write_snapshot(self, tasks, seq):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"seq": seq}) + "\n")
+            for task in tasks:
+                f.write(json.dumps(task_fields(task), ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        os.remove(self.path + ".old")
+
+    def close(self):
+        self.loading = False  # closed part way through load(): everything was already read
+        self.flush()
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._file is not None:
+            self._file.close()
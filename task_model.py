@@ -1,31 +1,333 @@
-person 1:  from datetime import datetime, timedelta
-
-class Task:
-    def _init_(self, name, deadline, time_str, priority):
-        self.name = name
-        self.deadline = deadline
-        self.time_str = time_str
-        self.priority = priority
-        self.completed = False
-        self.notified = False
-
-    def is_overdue(self):
-        try:
-            full_datetime = f"{self.deadline} {self.time_str}"
-            return datetime.strptime(full_datetime, "%Y-%m-%d %H:%M") < datetime.now()
-        except ValueError:
-            return False
-
-    def is_due_soon(self):
-        try:
-            full_datetime = f"{self.deadline} {self.time_str}"
-            task_time = datetime.strptime(full_datetime, "%Y-%m-%d %H:%M")
-            now = datetime.now()
-            return now <= task_time <= now + timedelta(minutes=10)
-        except ValueError:
-            return False
-
-if _name_ == "_main_":
-    t = Task("Demo", datetime.now().strftime("%Y-%m-%d"), datetime.now().strftime("%H:%M"), "Medium")
-    print(t.name, t.deadline, t.time_str, t.priority)
-    print("overdue:", t.is_overdue(), "due soon:", t.is_due_soon())
\ No newline at end of file
+import bisect
+from datetime import datetime
+import itertools
+import re
+import time
+from search_index import TrigramIndex, REGEX_META, fold, required_literals
+
+DUE_SOON_SECONDS = 10 * 60
+PRIORITY_RANK = {"High": 1, "Medium": 2, "Low": 3}
+_UNPARSED = object()
+_task_ids = itertools.count(1)
+
+
+# Make sure newly created tasks get IDs above last_id (called after loading saved tasks)
+def reserve_ids(last_id):
+    global _task_ids
+    _task_ids = itertools.count(max(last_id + 1, next(_task_ids)))
+
+
+# Take the IDs of newly created tasks from this iterator instead (a shared task database hands them out)
+def use_ids(ids):
+    global _task_ids
+    _task_ids = ids
+
+
+# Check a new task against the Add Task rules; returns (title, message) for an error, or None
+def validate_task(name, deadline, time_str):
+    if not name or not deadline or not time_str:
+        return "Error", "Please fill all fields."
+    try:
+        datetime.strptime(deadline, "%Y-%m-%d")
+        datetime.strptime(time_str, "%H:%M")
+    except ValueError:
+        return "Invalid Format", "Use YYYY-MM-DD for date and HH:MM for time."
+    return None
+
+
+# Parse a YYYY-MM-DD date and HH:MM time into a local epoch, or None if invalid
+def parse_due(deadline, time_str):
+    try:
+        return int(datetime.strptime(f"{deadline} {time_str}", "%Y-%m-%d %H:%M").timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+class Task:
+    # fixed attribute layout, no per-task __dict__
+    __slots__ = ("id", "name", "_deadline", "_time_str", "priority", "completed", "notified", "repeat", "_due")
+
+    # every task gets a unique id, used as its row IID in the table
+    # (task_id is only passed when loading a saved task)
+    # repeat is a recurrence.py rule ("" for a one-off task); deadline and time_str are then its current occurrence
+    def __init__(self, name, deadline, time_str, priority, task_id=None, repeat=""):
+        self.id = next(_task_ids) if task_id is None else task_id
+        self.name = name
+        self._deadline = deadline
+        self._time_str = time_str
+        self.priority = priority
+        self.completed = False
+        self.notified = False
+        self.repeat = repeat
+        self._due = _UNPARSED
+
+    # Changing the date or time drops the cached epoch so it is parsed again on next use
+    @property
+    def deadline(self):
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, value):
+        self._deadline = value
+        self._due = _UNPARSED
+
+    @property
+    def time_str(self):
+        return self._time_str
+
+    @time_str.setter
+    def time_str(self, value):
+        self._time_str = value
+        self._due = _UNPARSED
+
+    # Deadline as a local epoch in seconds (None if the date/time is invalid), parsed once
+    @property
+    def due(self):
+        if self._due is _UNPARSED:
+            self._due = parse_due(self._deadline, self._time_str)
+        return self._due
+
+    def is_overdue(self, now=None):
+        due = self.due
+        if due is None:
+            return False
+        return due < (time.time() if now is None else now)
+
+    def is_due_soon(self, now=None):
+        due = self.due
+        if due is None:
+            return False
+        if now is None:
+            now = time.time()
+        return now <= due <= now + DUE_SOON_SECONDS
+
+
+# Sort keys by name, shared by the app and by journal replay.
+# Keys end with the ID so every key is unique and ties keep creation order.
+# Tasks without a valid date/time sort after all the dated ones.
+SORT_KEYS = {
+    "priority": lambda t: (PRIORITY_RANK.get(t.priority, 3), t.id),
+    "date": lambda t: (0, t.due, t.id) if t.due is not None else (1, 0, t.id),
+}
+
+
+class TaskList:
+    # Ordered list of tasks with an ID -> task index and an ID -> position index.
+    # columnar=True also keeps a numpy column copy (task_columns.TaskColumns) for vectorised scans and sorts.
+    def __init__(self, tasks=(), columnar=False):
+        self._items = []
+        self._by_id = {}
+        self._pos = {}
+        self._valid = 0  # positions below this index are known to be current
+        self._search = None  # TrigramIndex over names, built on the first search
+        self._sorted = {}    # sort name -> sorted list of SORT_KEYS keys, built on the first sort_by
+        # running counts, so totals never need a pass over the list
+        self.completed_count = 0
+        self.priority_counts = {}  # priority -> number of open (not completed) tasks
+        self._overdue = set()      # ids of open tasks past their deadline
+        self.columns = None
+        if columnar:
+            from task_columns import TaskColumns
+            self.columns = TaskColumns()
+        for task in tasks:
+            self.append(task)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    @property
+    def overdue_count(self):
+        return len(self._overdue)
+
+    # Count a task as overdue (called when the deadline scheduler reports it)
+    def mark_overdue(self, task):
+        if self._by_id.get(task.id) is task and not task.completed:
+            self._overdue.add(task.id)
+
+    # Return the task with this ID, or None
+    def get(self, task_id):
+        return self._by_id.get(task_id)
+
+    # Return the position of the task with this ID, or None
+    def index(self, task_id):
+        pos = self._pos.get(task_id)
+        if pos is None or pos >= self._valid:
+            # positions from _valid onwards shifted since they were recorded
+            for i in range(self._valid, len(self._items)):
+                self._pos[self._items[i].id] = i
+            self._valid = len(self._items)
+            pos = self._pos.get(task_id)
+        return pos
+
+    def append(self, task):
+        self._by_id[task.id] = task
+        self._pos[task.id] = len(self._items)
+        if self._valid == len(self._items):
+            self._valid += 1
+        self._items.append(task)
+        self._index(task)
+
+    def insert(self, index, task):
+        if index < 0:
+            index = max(0, index + len(self._items))
+        index = min(index, len(self._items))
+        self._items.insert(index, task)
+        self._by_id[task.id] = task
+        self._valid = min(self._valid, index)
+        self._index(task)
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += len(self._items)
+        task = self._items.pop(index)
+        del self._by_id[task.id]
+        self._pos.pop(task.id, None)
+        self._valid = min(self._valid, index)
+        self._unindex(task)
+        if self.columns is not None:
+            self.columns.remove(task.id)
+        return task
+
+    # Remove the task with this ID and return it (None if there is no such task)
+    def remove(self, task_id):
+        index = self.index(task_id)
+        return None if index is None else self.pop(index)
+
+    # Remove every task with one of these IDs in a single pass; returns the removed tasks in list order
+    def remove_many(self, task_ids):
+        unwanted = set(task_ids)
+        kept, removed = [], []
+        for task in self._items:
+            (removed if task.id in unwanted else kept).append(task)
+        if not removed:
+            return removed
+        self._items = kept
+        self._valid = 0
+        for task in removed:
+            del self._by_id[task.id]
+            self._pos.pop(task.id, None)
+            self._unindex(task)
+            if self.columns is not None:
+                self.columns.remove(task.id)
+        return removed
+
+    # Move the task at position old to position new
+    def move(self, old, new):
+        self._items.insert(new, self._items.pop(old))
+        self._valid = min(self._valid, old, new)
+
+    # Take these tasks out and put them back together, in the order given, starting at position index.
+    # Returns the position they ended up at (index is capped at the end of the list).
+    def move_many(self, tasks, index):
+        moving = {task.id for task in tasks}
+        items = [task for task in self._items if task.id not in moving]
+        index = min(index, len(items))
+        items[index:index] = tasks
+        self._items = items
+        self._valid = 0
+        return index
+
+    # Put these tasks (already in the list) at positions start, start + 1, ... in this order
+    def place(self, start, tasks):
+        self._items[start:start + len(tasks)] = tasks
+        self._valid = min(self._valid, start)
+
+    def sort(self, key, reverse=False):
+        self._items.sort(key=key, reverse=reverse)
+        self._valid = 0
+
+    # Reorder the list by a SORT_KEYS name, reading the kept-sorted index instead of sorting
+    def sort_by(self, by):
+        if self.columns is not None:
+            self._items = [self._by_id[task_id] for task_id in self.columns.order(by).tolist()]
+            self._valid = 0
+            return
+        keys = self._sorted.get(by)
+        if keys is None:
+            keys = self._sorted[by] = sorted(map(SORT_KEYS[by], self._items))
+        self._items = [self._by_id[key[-1]] for key in keys]
+        self._valid = 0
+
+    # Change fields of a task in the list (name, deadline, time_str, priority, completed, ...)
+    # keeping the indexes and counts current
+    def update(self, task, **fields):
+        self._unindex(task)
+        for field, value in fields.items():
+            setattr(task, field, value)
+        self._index(task)
+
+    # Add a task to the counts and to the search and sort indexes that have been built
+    def _index(self, task):
+        if task.completed:
+            self.completed_count += 1
+        else:
+            self.priority_counts[task.priority] = self.priority_counts.get(task.priority, 0) + 1
+            if task.is_overdue():
+                self._overdue.add(task.id)
+        if self._search is not None:
+            self._search.add(task.id, task.name)
+        for by, keys in self._sorted.items():
+            bisect.insort(keys, SORT_KEYS[by](task))
+        if self.columns is not None:
+            self.columns.put(task)
+
+    def _unindex(self, task):
+        if task.completed:
+            self.completed_count -= 1
+        else:
+            self.priority_counts[task.priority] -= 1
+            self._overdue.discard(task.id)
+        if self._search is not None:
+            self._search.remove(task.id, task.name)
+        for by, keys in list(self._sorted.items()):
+            key = SORT_KEYS[by](task)
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+            else:
+                # the task was changed without update(); rebuild this index next time
+                del self._sorted[by]
+
+    # Build the search index now rather than on the first search (it is kept current afterwards)
+    def build_search_index(self):
+        if self._search is None:
+            self._search = TrigramIndex()
+            for task in self._items:
+                self._search.add(task.id, task.name)
+
+    # Return the tasks whose name matches the regex pattern (case-insensitive), in list order.
+    # The trigram index narrows the candidates; the regex (or substring test) then checks each one.
+    # When the index cannot narrow the pattern, scan=False returns None instead of checking every name.
+    # Raises re.error for an invalid pattern.
+    def search(self, pattern, scan=True):
+        regex = re.compile(pattern, re.IGNORECASE)
+        self.build_search_index()
+        if REGEX_META.isdisjoint(pattern):
+            keyword = fold(pattern)
+            literals = [keyword]
+            matches = lambda name: keyword in fold(name)
+        else:
+            literals = required_literals(pattern)
+            matches = regex.search
+        ids = self._search.candidates(literals)
+        if ids is None:
+            if not scan:
+                return None
+            return [t for t in self._items if matches(t.name)]
+        if len(ids) * 8 > len(self._items):
+            # most of the list: one pass in order is cheaper than sorting by position
+            return [t for t in self._items if t.id in ids and matches(t.name)]
+        found = [self._by_id[i] for i in ids if matches(self._by_id[i].name)]
+        found.sort(key=lambda t: self.index(t.id))
+        return found
+
+if __name__ == "__main__":
+    t = Task("Demo", datetime.now().strftime("%Y-%m-%d"), datetime.now().strftime("%H:%M"), "Medium")
+    print(t.name, t.deadline, t.time_str, t.priority)
+    print("overdue:", t.is_overdue(), "due soon:", t.is_due_soon())
@@ -0,0 +1,335 @@
+# SQLite persistence for tasks, with changes batched into one transaction per flush.
+# A shared database (TaskStore(path, shared=True)) can be open in several windows or programs at once:
+# every write to the tasks table is numbered in a changes table, so each one can read just the tasks
+# changed since it last looked (pull()), and new task IDs are handed out in blocks so none collide.
+import os
+import sqlite3
+import threading
+from task_model import Task, reserve_ids, use_ids
+
+DEFAULT_DB = os.path.join(os.path.expanduser("~"), ".group10_tasks.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL,
+    deadline  TEXT NOT NULL,
+    time_str  TEXT NOT NULL,
+    priority  TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    notified  INTEGER NOT NULL DEFAULT 0,
+    rank      REAL NOT NULL,
+    repeat    TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS tasks_deadline ON tasks (deadline, time_str);
+CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (completed);
+CREATE INDEX IF NOT EXISTS tasks_rank ON tasks (rank);
+"""
+
+# Added the first time a database is opened shared; from then on every program writing it logs its changes
+SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) SELECT 'next_id', COALESCE(MAX(id), 0) + 1 FROM tasks;
+CREATE TRIGGER IF NOT EXISTS tasks_inserted AFTER INSERT ON tasks
+    BEGIN INSERT INTO changes (task_id) VALUES (new.id); END;
+CREATE TRIGGER IF NOT EXISTS tasks_updated AFTER UPDATE ON tasks
+    BEGIN INSERT INTO changes (task_id) VALUES (new.id); END;
+CREATE TRIGGER IF NOT EXISTS tasks_deleted AFTER DELETE ON tasks
+    BEGIN INSERT INTO changes (task_id) VALUES (old.id); END;
+"""
+
+COLUMNS = "id, name, deadline, time_str, priority, completed, notified, rank, repeat"
+
+
+# Build a task from a row of COLUMNS; returns (task, rank)
+def _row_task(row):
+    task_id, name, deadline, time_str, priority, completed, notified, rank, repeat = row
+    task = Task(name, deadline, time_str, priority, task_id, repeat)
+    task.completed = bool(completed)
+    task.notified = bool(notified)
+    return task, rank
+
+
+# Task IDs for a shared database: blocks of BLOCK IDs are claimed from its meta table as they run out.
+# Tasks can be created on worker threads (imports), so claiming uses its own connection under a lock.
+class SharedIds:
+    BLOCK = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ids = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            task_id = next(self._ids, None)
+            if task_id is None:
+                task_id = self._claim()
+                self._ids = iter(range(task_id + 1, task_id + self.BLOCK))
+            return task_id
+
+    def _claim(self):
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # also past any task saved by a program that did not claim its IDs (it never loaded)
+            start = conn.execute("SELECT MAX(value, (SELECT COALESCE(MAX(id), 0) + 1 FROM tasks)) "
+                                 "FROM meta WHERE key = 'next_id'").fetchone()[0]
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (start + self.BLOCK,))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return start
+
+
+class TaskStore:
+    # Rows read per query while loading
+    LOAD_CHUNK = 5000
+    # Renumber every rank once two neighbours get closer than this
+    MIN_RANK_GAP = 1e-9
+    # Change records kept in a shared database; a program further behind than this reads every task again
+    MAX_CHANGES = 100000
+
+    # shared=True sets the database up for use by several programs at once (see pull())
+    def __init__(self, path, shared=False):
+        self.path = path
+        # write() may run on a worker thread; callers make sure only one thread uses the connection at a time
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if "repeat" not in {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}:
+            # a database from before repeating tasks
+            self.conn.execute("ALTER TABLE tasks ADD COLUMN repeat TEXT NOT NULL DEFAULT ''")
+        if shared:
+            self.conn.executescript(SHARED_SCHEMA)
+        # a database opened shared once stays shared for every program that writes it
+        self.shared = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'").fetchone() is not None
+        self.seen = self._last_seq() if self.shared else 0  # last change number read or written here
+        self._own = []                                         # (first, last) change numbers written here
+        self._version = self._data_version()
+        self.loading = False
+        self._ranks = {}        # task id -> rank (list order is by rank)
+        self._puts = {}         # task id -> task to insert or update
+        self._deletes = set()   # task ids to delete
+        self._reranked = set()  # task ids whose rank changed
+        self._retry = []        # taken changes whose write failed, written before newer ones
+        self._last_rank = self.conn.execute("SELECT COALESCE(MAX(rank), 0) FROM tasks").fetchone()[0]
+
+    # Yield the saved tasks in list order, one chunk at a time.
+    # Flushes wait until loading has finished so the chunks read a stable table.
+    def load(self, chunk=LOAD_CHUNK):
+        self.loading = True
+        last = (float("-inf"), 0)
+        # tasks can be added while the chunks are still coming in; they must not reuse a saved ID
+        if self.shared:
+            use_ids(SharedIds(self.path))
+        else:
+            reserve_ids(self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0])
+        try:
+            while True:
+                rows = self.conn.execute(
+                    f"SELECT {COLUMNS} FROM tasks WHERE (rank, id) > (?, ?) ORDER BY rank, id LIMIT ?",
+                    (*last, chunk)).fetchall()
+                if not rows:
+                    break
+                tasks = []
+                for row in rows:
+                    task, rank = _row_task(row)
+                    self._ranks[task.id] = rank
+                    tasks.append(task)
+                last = (rows[-1][7], rows[-1][0])
+                yield tasks
+        finally:
+            self.loading = False
+
+    # List order: tasks are kept sorted by this key (their rank, then ID)
+    def sort_key(self, task):
+        return self._ranks[task.id], task.id
+
+    def _last_seq(self):
+        return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    # Changes when another connection commits to the database (our own commits leave it alone)
+    def _data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # True when another program may have saved changes since the last pull(); a cheap check to poll
+    def changed_elsewhere(self):
+        return self.shared and self._data_version() != self._version
+
+    # Read the tasks other programs changed since the last pull. Returns (tasks, moved, deleted):
+    # fresh Task objects for new or changed rows, the IDs among them whose rank changed, and deleted IDs.
+    # Reads only the changed rows, unless this program fell more than MAX_CHANGES behind.
+    def pull(self):
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self._version = self._data_version()
+            first = self.conn.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+            if first is not None and first > self.seen + 1:
+                # the change records we needed were pruned
+                ids = None
+                rows = self.conn.execute(f"SELECT {COLUMNS} FROM tasks").fetchall()
+                last = self._last_seq()
+            else:
+                own = self._own
+                ids, last = set(), self.seen
+                for seq, task_id in self.conn.execute(
+                        "SELECT seq, task_id FROM changes WHERE seq > ?", (self.seen,)):
+                    last = seq
+                    if not any(a <= seq <= b for a, b in own):
+                        ids.add(task_id)
+                rows = []
+                wanted = list(ids)
+                for i in range(0, len(wanted), 500):
+                    part = wanted[i:i + 500]
+                    rows += self.conn.execute(
+                        f"SELECT {COLUMNS} FROM tasks WHERE id IN ({','.join('?' * len(part))})", part).fetchall()
+        self.seen = last
+        self._own = []
+        tasks, moved = [], set()
+        for row in rows:
+            task, rank = _row_task(row)
+            old = self._ranks.get(task.id)
+            if old is not None and old != rank:
+                moved.add(task.id)
+            self._ranks[task.id] = rank
+            self._last_rank = max(self._last_rank, rank)
+            tasks.append(task)
+        found = {task.id for task in tasks}
+        deleted = (self._ranks.keys() - found) if ids is None else (ids - found)
+        for task_id in deleted:
+            self._ranks.pop(task_id, None)
+        return tasks, moved, deleted
+
+    @property
+    def pending(self):
+        return bool(self._puts or self._deletes or self._reranked or self._retry)
+
+    # Record a new or changed task
+    def put(self, task):
+        if task.id not in self._ranks:
+            self._last_rank += 1
+            self._ranks[task.id] = self._last_rank
+        self._deletes.discard(task.id)
+        self._puts[task.id] = task
+
+    def delete(self, task_id):
+        self._ranks.pop(task_id, None)
+        self._puts.pop(task_id, None)
+        self._reranked.discard(task_id)
+        self._deletes.add(task_id)
+
+    # The count tasks starting at tasks[index] were moved there; space their ranks evenly between
+    # the new neighbours
+    def moved(self, tasks, index, count=1):
+        before = self._ranks[tasks[index - 1].id] if index > 0 else None
+        after = self._ranks[tasks[index + count].id] if index + count < len(tasks) else None
+        if before is None and after is None:
+            # the whole list
+            first, step = 1.0, 1
+        elif after is None:
+            first, step = before + 1, 1
+        elif before is None:
+            first, step = after - count, 1
+        else:
+            step = (after - before) / (count + 1)
+            first = before + step
+            if after - before < self.MIN_RANK_GAP * count:
+                self.reordered(tasks)
+                return
+        for i in range(count):
+            task_id = tasks[index + i].id
+            self._ranks[task_id] = first + i * step
+            self._reranked.add(task_id)
+        self._last_rank = max(self._last_rank, first + (count - 1) * step)
+
+    # The whole list was reordered (sorting); renumber every rank
+    def reordered(self, tasks, by=None):
+        for rank, task in enumerate(tasks, 1):
+            self._ranks[task.id] = float(rank)
+            self._reranked.add(task.id)
+        self._last_rank = float(len(tasks))
+
+    # Write every pending change in a single transaction
+    def flush(self, tasks=None):
+        batch = self.take()
+        if batch is None:
+            return
+        try:
+            result = self.write(batch)
+        except Exception:
+            self.restore(batch)
+            raise
+        self.wrote(result, tasks)
+
+    # flush() in three steps, so the apps can write on a worker thread while the list keeps changing:
+    # take() copies the pending changes into plain rows (on the thread that changes tasks), write(batch)
+    # does the I/O (one batch at a time, with nothing else using the store meanwhile), then wrote(result)
+    # or restore(batch) back on the first thread. take() returns None when there is nothing to write.
+    def take(self):
+        if self.loading or not self.pending:
+            return None
+        batch, self._retry = self._retry, []
+        if self._puts or self._deletes or self._reranked:
+            ranks = self._ranks
+            batch.append((list(self._deletes),
+                          [(t.id, t.name, t.deadline, t.time_str, t.priority, t.completed, t.notified, ranks[t.id],
+                            t.repeat) for t in self._puts.values()],
+                          [(ranks[i], i) for i in self._reranked - self._puts.keys()]))
+            self._puts.clear()
+            self._deletes.clear()
+            self._reranked.clear()
+        return batch
+
+    # Returns the change numbers written (see wrote())
+    def write(self, batch):
+        with self.conn:
+            # IMMEDIATE takes the write lock up front, so another program cannot commit in between
+            self.conn.execute("BEGIN IMMEDIATE")
+            before = self._last_seq() if self.shared else 0
+            for deletes, puts, moved in batch:
+                if deletes:
+                    self.conn.executemany("DELETE FROM tasks WHERE id = ?", ((i,) for i in deletes))
+                if puts:
+                    self.conn.executemany(
+                        f"INSERT OR REPLACE INTO tasks ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", puts)
+                if moved:
+                    self.conn.executemany("UPDATE tasks SET rank = ? WHERE id = ?", moved)
+            after = self._last_seq() if self.shared else 0
+            # trim the oldest change records every thousand or so changes
+            if after > self.MAX_CHANGES and after // 1000 > before // 1000:
+                self.conn.execute("DELETE FROM changes WHERE seq <= ?", (after - self.MAX_CHANGES,))
+        return before, after
+
+    # Our write made change records before+1..after; pull() skips them unless nothing came in between
+    def wrote(self, result, tasks=None):
+        if not self.shared:
+            return
+        before, after = result
+        if before == self.seen:
+            self.seen = after
+        else:
+            self._own.append((before + 1, after))
+
+    # The write of a taken batch failed; its changes go out again with the next one
+    def restore(self, batch):
+        self._retry = batch + self._retry
+
+    # Closing part way through load() still writes what changed; the rows not read yet are left alone
+    def close(self):
+        self.loading = False
+        self.flush()
+        self.conn.close()
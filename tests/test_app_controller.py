@@ -0,0 +1,116 @@
+import time
+from app_controller import AppController
+from task_engine import TaskEngine
+from task_store import TaskStore
+
+
+# Stands in for the Tk root: after() callbacks run when the test calls run()
+class FakeRoot:
+    def __init__(self):
+        self.calls = []
+        self.bells = 0
+        self.destroyed = False
+
+    def after(self, ms, fn, *args):
+        self.calls.append((fn, args))
+        return len(self.calls)
+
+    def after_idle(self, fn, *args):
+        return self.after(0, fn, *args)
+
+    def after_cancel(self, timer):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def unbind(self, *args):
+        pass
+
+    def protocol(self, *args):
+        pass
+
+    def bell(self):
+        self.bells += 1
+
+    def destroy(self):
+        self.destroyed = True
+
+    # Run the queued callbacks until nothing new is queued or rounds run out
+    def run(self, rounds=200):
+        for _ in range(rounds):
+            if not self.calls:
+                return
+            calls, self.calls = self.calls, []
+            for fn, args in calls:
+                fn(*args)
+            time.sleep(0.005)
+
+
+class Mapped:
+    def __init__(self, root):
+        self.widget = root
+
+
+def controller(path):
+    root = FakeRoot()
+    app = AppController(root, TaskEngine(TaskStore(str(path))))
+    app.render.add("tree", lambda: None)
+    return root, app
+
+
+def reload(path):
+    engine = TaskEngine(TaskStore(str(path)))
+    engine.load_all()
+    names = [t.name for t in engine.tasks]
+    engine.close()
+    return names
+
+
+def test_changes_are_written_by_the_worker_and_kept(tmp_path):
+    path = tmp_path / "tasks.db"
+    root, app = controller(path)
+    app.on_first_map(Mapped(root))
+    root.run()
+    first = app.add("a", "2099-01-01", "10:00", "High")
+    app.add("b", "2099-01-02", "11:00", "Low")
+    app.complete([first.id])
+    app.undo()
+    app.delete([first.id])
+    root.run()
+    assert not app.engine.pending
+    assert reload(path) == ["b"]
+    app.close()
+    assert root.destroyed
+
+
+def test_close_waits_for_the_write_in_progress(tmp_path):
+    path = tmp_path / "tasks.db"
+    root, app = controller(path)
+    app.on_first_map(Mapped(root))
+    root.run()
+    app.add("a", "2099-01-01", "10:00", "High")
+    app.flush_store()
+    assert app._save_job is not None
+    app.add("b", "2099-01-02", "11:00", "Low")
+    app.close()
+    assert reload(path) == ["a", "b"]
+
+
+def test_close_before_loading_finished(tmp_path):
+    path = tmp_path / "tasks.db"
+    engine = TaskEngine(TaskStore(str(path)))
+    engine.add_many([(f"t{i}", "2099-01-01", "10:00", "Low", "") for i in range(3)])
+    engine.close()
+    root, app = controller(path)
+    app.on_first_map(Mapped(root))
+    app.close()
+    assert reload(path) == ["t0", "t1", "t2"]
+
+
+def test_undo_with_nothing_to_undo_rings_the_bell(tmp_path):
+    root, app = controller(tmp_path / "tasks.db")
+    app.undo()
+    app.redo()
+    assert root.bells == 2
+    app.close()
@@ -0,0 +1,114 @@
+from datetime import datetime
+import pytest
+from ics_export import ExportJob
+from recurrence import advance, normalize, occurrences, parse_rule
+from task_import import ImportJob
+from task_model import Task
+
+
+@pytest.mark.parametrize("text, canonical", [
+    ("", ""), ("none", ""), ("Daily", "FREQ=DAILY"), ("weekly", "FREQ=WEEKLY"),
+    ("RRULE:freq=weekly;byday=th,mo;interval=2", "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH"),
+    ("FREQ=MONTHLY;COUNT=3", "FREQ=MONTHLY;COUNT=3"),
+    ("FREQ=YEARLY;UNTIL=20350101", "FREQ=YEARLY;UNTIL=20350101T235959"),
+    ("FREQ=DAILY;WKST=MO", "FREQ=DAILY"),
+])
+def test_parse_rule_canonical_form(text, canonical):
+    assert normalize(text) == canonical
+
+
+@pytest.mark.parametrize("text", [
+    "FREQ=HOURLY", "COUNT=3", "FREQ=DAILY;COUNT=0", "FREQ=DAILY;INTERVAL=x", "FREQ=DAILY;COUNT=2;UNTIL=20300101",
+    "FREQ=DAILY;BYDAY=MO", "FREQ=WEEKLY;BYDAY=1MO", "FREQ=DAILY;BYHOUR=9", "FREQ",
+])
+def test_parse_rule_rejects(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+def dates(rule, start, count):
+    found = []
+    for dt in occurrences(rule, start):
+        found.append(dt.strftime("%Y-%m-%d %a"))
+        if len(found) == count:
+            break
+    return found
+
+
+def test_weekly_byday():
+    start = datetime(2030, 1, 2, 9)  # a Wednesday
+    assert dates("FREQ=WEEKLY;BYDAY=MO,WE,FR", start, 5) == [
+        "2030-01-02 Wed", "2030-01-04 Fri", "2030-01-07 Mon", "2030-01-09 Wed", "2030-01-11 Fri"]
+    assert dates("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO", start, 3) == [
+        "2030-01-02 Wed", "2030-01-14 Mon", "2030-01-28 Mon"]
+
+
+# Months without the 31st (and years without February 29th) are skipped, as in RFC 5545
+def test_day_31_and_february_29():
+    assert dates("FREQ=MONTHLY", datetime(2030, 1, 31, 9), 4) == [
+        "2030-01-31 Thu", "2030-03-31 Sun", "2030-05-31 Fri", "2030-07-31 Wed"]
+    assert dates("FREQ=YEARLY", datetime(2028, 2, 29, 9), 3) == [
+        "2028-02-29 Tue", "2032-02-29 Sun", "2036-02-29 Fri"]
+
+
+def test_count_and_until_end_the_rule():
+    start = datetime(2030, 1, 1, 9)
+    assert len(list(occurrences("FREQ=DAILY;COUNT=3", start))) == 3
+    assert len(list(occurrences("FREQ=DAILY;UNTIL=20300105", start))) == 5
+    assert list(occurrences("FREQ=DAILY;UNTIL=20291231", start)) == []
+
+
+def test_advance_reduces_count_by_the_occurrences_passed():
+    assert advance("FREQ=DAILY;COUNT=5", "2030-01-01", "09:00", datetime(2030, 1, 3, 12)) == (
+        "2030-01-04", "09:00", "FREQ=DAILY;COUNT=2")
+    # completed on time: just the next one
+    assert advance("FREQ=DAILY;COUNT=5", "2030-01-01", "09:00", datetime(2029, 12, 31)) == (
+        "2030-01-02", "09:00", "FREQ=DAILY;COUNT=4")
+    assert advance("FREQ=DAILY;COUNT=1", "2030-01-01", "09:00", datetime(2029, 12, 31)) is None
+    assert advance("FREQ=DAILY;COUNT=3", "2030-01-01", "09:00", datetime(2030, 2, 1)) is None
+
+
+def test_advance_until_and_bad_input():
+    assert advance("FREQ=WEEKLY;UNTIL=20300115", "2030-01-01", "09:00", datetime(2030, 1, 1, 10)) == (
+        "2030-01-08", "09:00", "FREQ=WEEKLY;UNTIL=20300115T235959")
+    assert advance("FREQ=WEEKLY;UNTIL=20300115", "2030-01-15", "09:00", datetime(2030, 1, 15, 10)) is None
+    assert advance("FREQ=MONTHLY", "2030-01-31", "09:00", datetime(2030, 2, 1)) == (
+        "2030-03-31", "09:00", "FREQ=MONTHLY")
+    assert advance("FREQ=DAILY", "not a date", "09:00", datetime(2030, 1, 1)) is None
+    assert advance("", "2030-01-01", "09:00", datetime(2030, 1, 1)) is None
+
+
+def import_tasks(path):
+    job = ImportJob(path)
+    job.run()
+    assert job.error is None and not job.rejected
+    tasks = []
+    while not job.batches.empty():
+        tasks += job.batches.get()
+    return tasks
+
+
+# Open repeating tasks are exported as one event with an RRULE and come back with the same rule
+def test_ics_round_trip(tmp_path):
+    rules = ["FREQ=DAILY", "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH", "FREQ=MONTHLY;COUNT=4",
+             "FREQ=YEARLY;UNTIL=20350101T235959", ""]
+    tasks = [Task(f"Task {i}", "2030-01-06", "08:30", "Medium", i + 1, rule) for i, rule in enumerate(rules)]
+    done = Task("Done repeating", "2030-01-06", "08:30", "Low", 99, "FREQ=DAILY")
+    done.completed = True
+    path = str(tmp_path / "tasks.ics")
+    job = ExportJob(path, tuple(tasks + [done]))
+    job.run()
+    assert job.error is None
+    back = import_tasks(path)
+    assert [(t.name, t.deadline, t.time_str, t.repeat) for t in back] == [
+        (t.name, t.deadline, t.time_str, t.repeat) for t in tasks] + [("Done repeating", "2030-01-06", "08:30", "")]
+
+
+def test_csv_repeat_column(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("name,date,time,priority,repeat\n"
+                    "Water plants,2030-01-06,08:00,Low,weekly\n"
+                    "Standup,2030-01-06,09:30,High,\"RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR\"\n"
+                    "One-off,2030-01-06,10:00,Medium,\n", encoding="utf-8")
+    assert [t.repeat for t in import_tasks(str(path))] == [
+        "FREQ=WEEKLY", "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR", ""]
@@ -0,0 +1,39 @@
+import re
+import pytest
+from search_index import required_literals
+from task_model import Task, TaskList
+
+NAMES = ["Apple pie", "apple tart", "Pineapple", "Buy apples x2", "Report 2024", "report 1999 draft",
+         "a.b.c", "abc", "x{2} braces", "xx", "Call Bob\\Alice", "path/to/file.txt", "ſun dial", "Sun room",
+         "İstanbul trip", "istanbul map", "µm scale", "μm ruler", "Σίσυφος", "σίσυφος notes", "ΣΙΣΥΦΟΣ",
+         "Kelvin (K) units", "kelvin", "Tab\there", "aaa", "aaaa bbb", "Deploy v1.2.3", "deploy v10"]
+
+PATTERNS = [r"\x41pple", r"Apple", r"\U00000041pple", r"\N{LATIN CAPITAL LETTER A}pple", r"\101pple",
+            r"\x70ie", r"\0", r"(a)\1a", r"(p)\1le", "apple", "APPLE", "pie", "ple pie", "sun", "SUN dial",
+            "ist", "ISTANBUL", "μm", "µm sc", "σίσ", "ΣΊΣΥΦΟΣ", "ς", "kelvin", "rep.rt", r"\d{4}", r"report \d+",
+            r"a\.b", r"x\{2\}", r"x{2}", "pie$", "^apple", "p+le", "ap?ple", "app*le", "[ap]ple", "(?i)apple",
+            "apple|pie", r"\bapp", r"Bob\\Alice", r"file\.txt", r"\tHere", "aaa+", r"v\d+\.\d", "deploy v1",
+            r"\x20pie", r"µm", r"\w+pple", r"apple\d?", "(apple) pie", "[^x]{3}ple"]
+
+
+@pytest.fixture(scope="module")
+def tasks():
+    return TaskList([Task(name, "2030-01-01", "09:00", "Medium", i) for i, name in enumerate(NAMES, 1)])
+
+
+# The index only narrows the scan; results must be exactly what re.search over every name finds
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_search_matches_full_scan(tasks, pattern):
+    regex = re.compile(pattern, re.IGNORECASE)
+    expected = [t.name for t in tasks if regex.search(t.name)]
+    assert [t.name for t in tasks.search(pattern)] == expected
+
+
+# The whole escape is skipped, not just its first letter or digit
+@pytest.mark.parametrize("pattern, literals", [
+    (r"\x41pple", ["pple"]), (r"\u0041pple", ["pple"]), (r"\U00000041pple", ["pple"]),
+    (r"\N{LATIN CAPITAL LETTER A}pple", ["pple"]), (r"\101pple", ["pple"]), (r"(a)\1bcd", ["bcd"]),
+    (r"report \d+ draft", ["report ", " draft"]),
+])
+def test_escapes_are_not_literal_text(pattern, literals):
+    assert required_literals(pattern) == literals
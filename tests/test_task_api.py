@@ -0,0 +1,107 @@
+import http.client
+import json
+import socket
+import threading
+import pytest
+from task_api import TaskApiServer
+from task_engine import TaskEngine
+
+
+# A headless server (as task_cli.py serve runs it) on a free port, with an empty task list
+@pytest.fixture
+def api():
+    engine = TaskEngine(None)
+    server = TaskApiServer(engine, port=0)
+    ready = threading.Event()
+
+    def serve():
+        try:
+            server.serve_forever(lambda port: ready.set())
+        except RuntimeError:
+            pass  # the loop was stopped below
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield engine, server.port
+    server._loop.call_soon_threadsafe(server._loop.stop)
+    thread.join(5)
+
+
+def request(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request(method, path, body=None if body is None else json.dumps(body),
+                     headers=headers or {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+# Send raw request bytes and return the status line of the reply
+def raw_status(port, data):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(data)
+        reply = sock.makefile("rb").readline()
+    return reply.decode("latin-1").split()[1] if reply else None
+
+
+TASK = {"name": "Report", "deadline": "2030-01-01", "time_str": "09:00"}
+
+
+def test_bad_content_length_is_a_400(api):
+    _, port = api
+    for length in (b"abc", b"-5"):
+        data = (b"POST /tasks HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+                b"Content-Length: " + length + b"\r\n\r\n{}")
+        assert raw_status(port, data) == "400"
+
+
+def test_priority_that_is_not_a_string_is_a_400(api):
+    engine, port = api
+    status, payload = request(port, "POST", "/tasks", dict(TASK, priority=["High"]))
+    assert status == 400
+    assert "priority" in payload["error"]
+    status, ids = request(port, "POST", "/tasks", TASK)
+    assert status == 200
+    status, _ = request(port, "PATCH", f"/tasks/{ids['ids'][0]}", {"priority": {"High": 1}})
+    assert status == 400
+    assert [t.priority for t in engine.tasks] == ["Medium"]
+
+
+def test_post_accepts_object_list_and_tasks_wrapper(api):
+    engine, port = api
+    assert request(port, "POST", "/tasks", TASK)[0] == 200
+    assert request(port, "POST", "/tasks", [TASK, TASK])[0] == 200
+    status, payload = request(port, "POST", "/tasks", {"tasks": [TASK, dict(TASK, priority="High")]})
+    assert status == 200
+    assert len(payload["ids"]) == 2
+    assert len(engine.tasks) == 5
+    assert request(port, "POST", "/tasks", {"tasks": "Report"})[0] == 400
+    assert request(port, "POST", "/tasks", {"tasks": ["Report"]})[0] == 400
+
+
+# A web page can send a "simple" text/plain POST without a preflight; it must not change anything
+def test_write_that_is_not_json_is_refused(api):
+    engine, port = api
+    request(port, "POST", "/tasks", TASK)
+    status, _ = request(port, "POST", "/tasks/delete", {"ids": [engine.tasks[0].id]},
+                        {"Content-Type": "text/plain", "Origin": "https://evil.example"})
+    assert status in (403, 415)
+    status, _ = request(port, "POST", "/tasks/delete", {"ids": [engine.tasks[0].id]}, {"Content-Type": "text/plain"})
+    assert status == 415
+    assert len(engine.tasks) == 1
+
+
+def test_other_origins_are_refused(api):
+    engine, port = api
+    for origin in ("https://evil.example", "null", "http://127.0.0.1.evil.example"):
+        status, _ = request(port, "POST", "/tasks", TASK, {"Content-Type": "application/json", "Origin": origin})
+        assert status == 403
+        assert request(port, "GET", "/tasks", headers={"Origin": origin})[0] == 403
+    assert len(engine.tasks) == 0
+    for origin in ("http://localhost:3000", "http://127.0.0.1:8765"):
+        status, _ = request(port, "POST", "/tasks", TASK, {"Content-Type": "application/json", "Origin": origin})
+        assert status == 200
+    assert len(engine.tasks) == 2
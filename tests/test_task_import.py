@@ -0,0 +1,30 @@
+from task_import import ImportJob
+
+
+def run_import(tmp_path, text):
+    path = tmp_path / "tasks.csv"
+    path.write_text(text, encoding="utf-8")
+    job = ImportJob(str(path))
+    job.run()
+    tasks = []
+    while not job.batches.empty():
+        tasks += job.batches.get()
+    return tasks, job
+
+
+def test_csv_priority_is_checked(tmp_path):
+    tasks, job = run_import(tmp_path, "name,date,time,priority\n"
+                                      "Blank,2030-01-01,09:00,\n"
+                                      "Lower case,2030-01-01,09:00,high\n"
+                                      "Urgent,2030-01-01,09:00,urgent\n"
+                                      "Low,2030-01-01,09:00,Low\n")
+    assert [(t.name, t.priority) for t in tasks] == [("Blank", "Medium"), ("Lower case", "High"), ("Low", "Low")]
+    assert job.rejected_count == 1
+    line, reason = job.rejected[0]
+    assert line == 4 and "urgent" in reason
+
+
+def test_csv_without_priority_column_defaults_to_medium(tmp_path):
+    tasks, job = run_import(tmp_path, "name,date,time\nReport,2030-01-01,09:00\n")
+    assert [t.priority for t in tasks] == ["Medium"]
+    assert job.rejected_count == 0
@@ -0,0 +1,128 @@
+import os
+from task_engine import TaskEngine
+from task_journal import TaskJournal
+
+
+def open_engine(path):
+    engine = TaskEngine(TaskJournal(path))
+    engine.load_all()
+    return engine
+
+
+def state(engine):
+    return [(t.id, t.name, t.deadline, t.time_str, t.priority, t.completed, t.notified, t.repeat)
+            for t in engine.tasks]
+
+
+def reopened_state(path):
+    engine = open_engine(path)
+    try:
+        return state(engine)
+    finally:
+        engine.close()
+
+
+# A few tasks and one of every kind of record
+def make_changes(engine):
+    for i in range(8):
+        engine.add(f"Task {i}", f"2030-01-{i + 1:02d}", "09:00", ("Low", "Medium", "High")[i % 3])
+    ids = [t.id for t in engine.tasks]
+    engine.add("Water plants", "2030-02-01", "08:00", "Low", "weekly")
+    engine.edit(ids[1], name="Renamed", priority="High")
+    engine.complete(ids[2])
+    engine.delete(ids[3])
+    engine.move(0, 5)
+    engine.move_many([ids[4], ids[6]], 1)
+    engine.sort("priority")
+    engine.move(len(engine.tasks) - 1, 0)
+    engine.mark_notified(engine.get(ids[5]))
+
+
+def test_replay_restores_every_change(tmp_path):
+    path = str(tmp_path / "tasks.journal")
+    engine = open_engine(path)
+    make_changes(engine)
+    expected = state(engine)
+    engine.close()
+    assert reopened_state(path) == expected
+
+
+# A crash in the middle of writing leaves a last line without its newline; it is dropped and cut off
+def test_torn_last_line_is_dropped_and_truncated(tmp_path):
+    path = str(tmp_path / "tasks.journal")
+    engine = open_engine(path)
+    make_changes(engine)
+    expected = state(engine)
+    engine.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('[999,"put",999,"Half writ')
+
+    engine = open_engine(path)
+    assert state(engine) == expected
+    engine.add("After the crash", "2030-03-01", "10:00")
+    expected = state(engine)
+    engine.close()
+    assert reopened_state(path) == expected
+    with open(path, encoding="utf-8") as f:
+        assert "Half writ" not in f.read()
+
+
+# Records before a compaction are in the snapshot; later ones are replayed on top of it
+def test_snapshot_plus_journal_tail(tmp_path):
+    path = str(tmp_path / "tasks.journal")
+    engine = open_engine(path)
+    make_changes(engine)
+    engine.flush()
+    engine.store.compact(engine.tasks)
+    engine.store._compactor.join()
+    assert os.path.exists(path + ".snapshot")
+    assert not os.path.exists(path + ".old")
+    assert os.path.getsize(path) == 0
+    engine.add("After the snapshot", "2030-03-01", "10:00")
+    engine.delete(engine.tasks[0].id)
+    engine.edit(engine.tasks[1].id, name="Edited after")
+    expected = state(engine)
+    engine.close()
+    assert reopened_state(path) == expected
+
+
+# The journal was moved to .old but the snapshot was never written (the program stopped):
+# loading replays .old and the new journal, then finishes the snapshot
+def test_interrupted_compaction_is_finished_on_load(tmp_path):
+    path = str(tmp_path / "tasks.journal")
+    engine = open_engine(path)
+    make_changes(engine)
+    engine.flush()
+    engine.store._write_snapshot = lambda tasks, seq: None
+    engine.store.compact(engine.tasks)
+    engine.store._compactor.join()
+    assert os.path.exists(path + ".old")
+    engine.add("After the move", "2030-03-01", "10:00")
+    engine.sort("date")
+    expected = state(engine)
+    engine.close()
+
+    assert reopened_state(path) == expected
+    assert not os.path.exists(path + ".old")
+    assert os.path.exists(path + ".snapshot")
+    assert reopened_state(path) == expected
+
+
+# Closing before the apps have taken every chunk still writes the changes made so far
+def test_close_while_loading_keeps_new_task(tmp_path):
+    path = str(tmp_path / "tasks.journal")
+    engine = open_engine(path)
+    for i in range(12):
+        engine.add(f"Task {i}", "2030-01-01", "09:00")
+    engine.close()
+
+    engine = TaskEngine(TaskJournal(path))
+    loader = engine.store.load(chunk=5)
+    for task in next(loader):
+        engine.tasks.append(task)
+    engine.add("Added while loading", "2030-01-02", "10:00")
+    engine.close()
+
+    names = [name for _, name, *_ in reopened_state(path)]
+    assert len(names) == 13
+    assert "Added while loading" in names
@@ -0,0 +1,57 @@
+import itertools
+import task_model
+from task_engine import TaskEngine
+from task_store import TaskStore
+
+
+def saved_tasks(path):
+    store = TaskStore(path)
+    try:
+        return [task for chunk in store.load() for task in chunk]
+    finally:
+        store.close()
+
+
+# A task added while the apps are still loading chunks must not take the ID of a task not loaded yet
+def test_task_added_between_chunks_keeps_every_saved_row(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    engine = TaskEngine(TaskStore(path))
+    for i in range(12):
+        engine.add(f"Task {i}", "2030-01-01", "09:00")
+    engine.flush()
+    engine.close()
+
+    task_model.use_ids(itertools.count(1))  # a new program starts counting from 1 again
+    engine = TaskEngine(TaskStore(path))
+    for chunk in engine.store.load(chunk=5):
+        for task in chunk:
+            engine.tasks.append(task)
+        if len(engine.tasks) == 5:
+            added = engine.add("Added while loading", "2030-01-02", "10:00")
+    engine.flush()
+    engine.close()
+
+    tasks = saved_tasks(path)
+    assert len(tasks) == 13
+    assert len({task.id for task in tasks}) == 13
+    assert added.id > 12
+
+
+# Closing before loading finishes still writes the changes made so far
+def test_close_while_loading_keeps_new_task(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    engine = TaskEngine(TaskStore(path))
+    for i in range(12):
+        engine.add(f"Task {i}", "2030-01-01", "09:00")
+    engine.close()
+
+    engine = TaskEngine(TaskStore(path))
+    loader = engine.store.load(chunk=5)
+    for task in next(loader):
+        engine.tasks.append(task)
+    engine.add("Added while loading", "2030-01-02", "10:00")
+    engine.close()
+
+    names = [task.name for task in saved_tasks(path)]
+    assert len(names) == 13
+    assert "Added while loading" in names
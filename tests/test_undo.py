@@ -0,0 +1,139 @@
+import random
+import pytest
+from task_engine import TaskEngine
+from task_journal import TaskJournal
+from task_store import TaskStore
+from undo import History
+
+
+def state(engine):
+    return [(t.id, t.name, t.deadline, t.priority, t.completed, t.repeat) for t in engine.tasks]
+
+
+def filled(store=None, count=10):
+    engine = TaskEngine(store)
+    engine.load_all()
+    for i in range(count):
+        engine.add(f"Task {i}", f"2030-01-{count - i:02d}", "09:00", ("Low", "Medium", "High")[i % 3])
+    engine.history.clear()
+    return engine
+
+
+def test_undo_delete_puts_tasks_back_where_they_were():
+    engine = filled()
+    before = state(engine)
+    ids = [t.id for t in engine.tasks]
+    engine.delete_many([ids[7], ids[0], ids[3], ids[4]])
+    after = state(engine)
+    assert engine.undo() is not None
+    assert state(engine) == before
+    engine.redo()
+    assert state(engine) == after
+
+
+def test_undo_sort_and_moves_restore_the_order():
+    engine = filled()
+    ids = [t.id for t in engine.tasks]
+    steps = [state(engine)]
+    engine.sort("date")
+    steps.append(state(engine))
+    engine.move_many([ids[1], ids[8]], 0)
+    steps.append(state(engine))
+    engine.move(9, 2)
+    steps.append(state(engine))
+    engine.sort("priority")
+    steps.append(state(engine))
+    for expected in reversed(steps[:-1]):
+        engine.undo()
+        assert state(engine) == expected
+    for expected in steps[1:]:
+        engine.redo()
+        assert state(engine) == expected
+
+
+# A sort keeps only the stretch of the list whose order changed
+def test_window_command_is_trimmed():
+    engine = filled()
+    engine.move(3, 5)
+    engine.history.clear()
+    engine.move_many([engine.tasks[6].id], 4)
+    (command, _), = engine.history._undo
+    assert command[0] == "window"
+    assert command[1] == 4
+    assert len(command[2]) == 3
+
+
+def test_undo_fields_and_complete():
+    engine = filled()
+    engine.add("Water plants", "2030-02-01", "08:00", "Low", "daily")
+    engine.history.clear()
+    before = state(engine)
+    task = engine.tasks[-1]
+    engine.complete_many([engine.tasks[0].id, task.id])
+    assert engine.tasks[0].completed and not task.completed and task.deadline == "2030-02-02"
+    engine.edit_many([t.id for t in engine.tasks[:3]], priority="High")
+    engine.undo()
+    engine.undo()
+    assert state(engine) == before
+    assert engine.tasks.completed_count == 0
+
+
+def test_new_change_ends_the_redo_chain():
+    engine = filled()
+    engine.delete(engine.tasks[0].id)
+    engine.undo()
+    engine.add("New", "2030-01-01", "09:00")
+    assert engine.redo() is None
+    assert engine.undo() is not None
+    assert engine.undo() is None
+
+
+def test_history_is_capped_by_steps_and_bytes():
+    history = History()
+    history.MAX_STEPS = 5
+    for i in range(8):
+        history.record(("move", i, i + 1))
+    assert len(history._undo) == 5
+    assert history._undo[0][0] == ("move", 3, 4)
+    history.MAX_BYTES = 64 * 3
+    history.record(("move", 0, 1))
+    assert len(history._undo) == 3
+    assert history._bytes == sum(size for _, size in history._undo)
+
+
+# Undo and redo are written through like any other change: a reopened store shows the same list
+@pytest.mark.parametrize("kind", ["journal", "sqlite"])
+def test_undo_is_saved_to_the_store(tmp_path, kind):
+    path = str(tmp_path / "tasks")
+    make_store = (lambda: TaskJournal(path)) if kind == "journal" else (lambda: TaskStore(path + ".db"))
+    rnd = random.Random(7)
+    engine = filled(make_store(), 30)
+    for step in range(60):
+        ids = [t.id for t in engine.tasks]
+        op = rnd.randrange(7)
+        if op == 0:
+            engine.add(f"New {step}", "2030-03-01", "10:00")
+        elif op == 1:
+            engine.edit(rnd.choice(ids), name=f"Edit {step}")
+        elif op == 2:
+            engine.complete_many(rnd.sample(ids, 2))
+        elif op == 3:
+            engine.delete_many(rnd.sample(ids, 3))
+        elif op == 4:
+            engine.move_many(rnd.sample(ids, 3), rnd.randrange(len(ids) - 3))
+        elif op == 5:
+            engine.sort(rnd.choice(["priority", "date"]))
+        else:
+            engine.move(rnd.randrange(len(ids)), rnd.randrange(len(ids)))
+        for _ in range(rnd.randrange(3)):
+            engine.undo()
+        for _ in range(rnd.randrange(2)):
+            engine.redo()
+        if step % 10 == 9:
+            engine.flush()
+            expected = state(engine)
+            reopened = TaskEngine(make_store())
+            reopened.load_all()
+            assert state(reopened) == expected
+            reopened.close()
+    engine.close()
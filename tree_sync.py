@@ -0,0 +1,126 @@
+# Keeps a ttk.Treeview in step with a list of tasks by only touching rows that changed
+from bisect import bisect_left
+from recurrence import describe
+
+
+# Build the column values and tag for one task row
+def task_row(task):
+    status = "Completed" if task.completed else "Pending"
+    if task.repeat and not task.completed:
+        status = f"Pending ({describe(task.repeat)})"
+    tag = "completed" if task.completed else ("overdue" if task.is_overdue() else "")
+    return (task.name, task.deadline, task.time_str, task.priority, status), (tag,)
+
+
+# Return the set of positions in seq that form a longest increasing subsequence
+def _increasing_run(seq):
+    tails = []      # smallest tail value of a run of each length
+    tail_pos = []   # position in seq of that tail
+    parent = [-1] * len(seq)
+    for i, value in enumerate(seq):
+        k = bisect_left(tails, value)
+        if k:
+            parent[i] = tail_pos[k - 1]
+        if k == len(tails):
+            tails.append(value)
+            tail_pos.append(i)
+        else:
+            tails[k] = value
+            tail_pos[k] = i
+    keep = set()
+    i = tail_pos[-1] if tail_pos else -1
+    while i != -1:
+        keep.add(i)
+        i = parent[i]
+    return keep
+
+
+class TreeSync:
+    # Above this many moved rows a single set_children call is cheaper than moving one by one
+    MOVE_LIMIT = 64
+
+    def __init__(self, tree, row=task_row):
+        self.tree = tree
+        self.row = row
+        self._order = []    # item IIDs in the order they appear in the tree
+        self._rows = {}     # IID -> (values, tags) last written to the tree
+        self._tasks = {}    # IID -> task
+
+    # Rows are keyed by the task's stable ID
+    def iid_for(self, task):
+        iid = str(task.id)
+        self._tasks[iid] = task
+        return iid
+
+    # Return the IID of a task currently in the tree, or None
+    def find(self, task):
+        if task is None:
+            return None
+        iid = str(task.id)
+        return iid if self._tasks.get(iid) is task else None
+
+    # Return the task shown on a tree row, or None
+    def task_for(self, iid):
+        return self._tasks.get(iid)
+
+    # IDs of the tasks on the selected rows
+    def selected_ids(self):
+        return [int(iid) for iid in self.tree.selection()]
+
+    # Select just these tasks' rows
+    def select(self, task_ids):
+        self.tree.selection_set([str(task_id) for task_id in task_ids])
+
+    # Select every row shown (the whole list, or the current filter results)
+    def select_all(self):
+        self.tree.selection_set(self._order)
+
+    # Make the tree show exactly these tasks in this order
+    def sync(self, tasks):
+        wanted = []
+        rows = {}
+        for task in tasks:
+            iid = self.iid_for(task)
+            wanted.append(iid)
+            rows[iid] = self.row(task)
+
+        # Remove rows whose task is no longer shown
+        gone = [iid for iid in self._order if iid not in rows]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self._rows[iid]
+                del self._tasks[iid]
+            self._order = [iid for iid in self._order if iid in rows]
+
+        # Insert new rows at the end and rewrite rows whose values changed
+        for iid in wanted:
+            values, tags = row = rows[iid]
+            old = self._rows.get(iid)
+            if old is None:
+                self.tree.insert("", "end", iid=iid, values=values, tags=tags)
+                self._order.append(iid)
+            elif old != row:
+                self.tree.item(iid, values=values, tags=tags)
+            self._rows[iid] = row
+
+        if self._order != wanted:
+            self._reorder(wanted)
+
+    # Move rows into the wanted order, leaving the longest already-ordered run in place
+    def _reorder(self, wanted):
+        position = {iid: i for i, iid in enumerate(self._order)}
+        keep = _increasing_run([position[iid] for iid in wanted])
+        if len(wanted) - len(keep) > self.MOVE_LIMIT:
+            self.tree.set_children("", *wanted)
+        else:
+            order = self._order
+            for i, iid in enumerate(wanted):
+                if i in keep:
+                    continue
+                # Put the row straight after the row that should precede it
+                order.remove(iid)
+                index = order.index(wanted[i - 1]) + 1 if i else 0
+                order.insert(index, iid)
+                self.tree.move(iid, "", index)
+        self._order = list(wanted)
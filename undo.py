@@ -0,0 +1,81 @@
+# Undo/redo for the task engine. Each change is kept as a small command holding only what it touched:
+#   ("insert", [(position, task), ...])  put these tasks back at these positions (undoes a delete)
+#   ("remove", [(position, task), ...])  take these tasks out again (undoes an add)
+#   ("fields", [(task, {field: value}), ...])  set these fields back
+#   ("move", old, new)                   move one task back
+#   ("window", start, ids)               restore the order of the part of the list a sort or drag changed
+# Applying a command (TaskEngine._apply) returns its inverse, which goes on the other stack, so undo and
+# redo cost the size of the change and the list is never copied.
+from array import array
+from collections import deque
+
+
+# Rough memory held by a command, for the history's byte cap
+def command_size(command):
+    kind = command[0]
+    if kind == "window":
+        return 64 + command[2].itemsize * len(command[2])
+    if kind == "move":
+        return 64
+    # insert/remove keep the task objects alive; fields keep a small dict per task
+    return 64 + 200 * len(command[1])
+
+
+# Task IDs in a compact array (8 bytes each) for "window" commands
+def id_array(tasks):
+    return array("q", (task.id for task in tasks))
+
+
+class History:
+    # Oldest steps are dropped past either limit
+    MAX_STEPS = 200
+    MAX_BYTES = 16 * 1024 * 1024
+
+    def __init__(self):
+        self._undo = deque()    # (command, size), newest last
+        self._redo = []
+        self._bytes = 0
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    # Remember how to undo a change just made; a new change ends the redo chain
+    def record(self, command):
+        for _, size in self._redo:
+            self._bytes -= size
+        self._redo.clear()
+        self._push(self._undo, command)
+        while self._undo and (len(self._undo) > self.MAX_STEPS or self._bytes > self.MAX_BYTES):
+            self._bytes -= self._undo.popleft()[1]
+
+    def _push(self, stack, command):
+        size = command_size(command)
+        stack.append((command, size))
+        self._bytes += size
+
+    # apply(command) makes the change and returns (inverse command, result); returns the result,
+    # or None when there is nothing to undo/redo
+    def undo(self, apply):
+        return self._step(self._undo, self._redo, apply)
+
+    def redo(self, apply):
+        return self._step(self._redo, self._undo, apply)
+
+    def _step(self, source, target, apply):
+        if not source:
+            return None
+        command, size = source.pop()
+        self._bytes -= size
+        inverse, result = apply(command)
+        self._push(target, inverse)
+        return result
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
@@ -0,0 +1,129 @@
+# Treeview that only creates rows for the tasks currently in view
+import tkinter as tk
+from tkinter import ttk
+from tree_sync import TreeSync, task_row
+
+
+class VirtualTreeview:
+    # Extra rows kept below the visible area so small scrolls reuse existing rows
+    OVERSCAN = 10
+
+    def __init__(self, master, row=task_row, **options):
+        self.frame = tk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, yscrollcommand=self._on_tree_scroll, **options)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.rows = TreeSync(self.tree, row)
+        self.tasks = []
+        self.offset = 0     # model index of the first row in view
+        self.visible = 10   # number of rows that fit in the widget
+        self.selected = set()  # IDs of selected tasks, including ones scrolled out of the window
+        self._pending = None
+
+        self.tree.bind("<Configure>", self._on_resize, add="+")
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self.visible))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        # A plain click starts a new selection; this tag runs after widget bindings, before the Treeview class
+        tag = f"VirtualTreeview{id(self)}"
+        tags = self.tree.bindtags()
+        self.tree.bindtags(tags[:1] + (tag,) + tags[1:])
+        self.tree.bind_class(tag, "<ButtonPress-1>", self._on_click)
+
+    # Anything not handled here goes to the real Treeview
+    def __getattr__(self, name):
+        return getattr(self.tree, name)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    # Show this list of tasks, keeping the current scroll position
+    def sync(self, tasks):
+        self.tasks = tasks
+        self._render()
+
+    # IDs of the selected tasks that are in the list, in list order
+    def selected_ids(self):
+        return [task.id for task in self.tasks if task.id in self.selected]
+
+    def select(self, task_ids):
+        self.selected = set(task_ids)
+        self._render()
+
+    def select_all(self):
+        self.select(task.id for task in self.tasks)
+
+    # Shift/Control clicks add to the selection
+    def _on_click(self, event):
+        if not event.state & 0x0005:
+            self.selected.clear()
+
+    # The window's rows are the only ones the user can (de)select directly
+    def _on_select(self, event):
+        shown = {int(iid) for iid in self.tree.get_children()}
+        self.selected = (self.selected - shown) | {int(iid) for iid in self.tree.selection()}
+
+    # Model index of a row (the real widget only knows its position in the window)
+    def index(self, item):
+        return self.offset + self.tree.index(item)
+
+    # Scrollbar command: "moveto fraction" or "scroll n units|pages"
+    def yview(self, *args):
+        if not args:
+            return self.scrollbar.get()
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.tasks))
+            self._render()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._scroll_by(step * self.visible if args[2] == "pages" else step)
+
+    def _scroll_by(self, rows):
+        self.offset += rows
+        self._render()
+        return "break"
+
+    def _on_wheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    # Work out how many rows fit whenever the widget is resized
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    # The Treeview scrolled itself (keyboard focus moved into the overscan rows)
+    def _on_tree_scroll(self, first, last):
+        shift = round(float(first) * len(self.tree.get_children()))
+        if shift and self._pending is None:
+            self.offset += shift
+            self._pending = self.tree.after_idle(self._render)
+
+    # Materialize the rows for [offset, offset + visible + OVERSCAN) and update the scrollbar
+    def _render(self):
+        self._pending = None
+        total = len(self.tasks)
+        self.offset = max(0, min(self.offset, total - self.visible))
+        end = min(total, self.offset + self.visible + self.OVERSCAN)
+
+        focused = self.rows.task_for(self.tree.focus())
+        shown = self.tasks[self.offset:end]
+        self.rows.sync(shown)
+        self.tree.yview_moveto(0)
+        # Keep the focus and the selection on the same tasks while they stay in the window
+        iid = self.rows.find(focused)
+        if iid is not None:
+            self.tree.focus(iid)
+        self.tree.selection_set([str(task.id) for task in shown if task.id in self.selected])
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
@@ -0,0 +1,116 @@
+# Runs blocking or CPU-heavy work off the Tk thread and hands results back on it.
+# Workers never touch widgets: finished jobs go into a queue that the Tk thread drains with root.after.
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+
+class Job:
+    def __init__(self, key, on_done, on_error, on_cancel):
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel      # asks the running work to stop early (e.g. ExportJob.cancel)
+        self.future = None
+        self.cancelled = False
+
+    # Drop the result; the work itself is stopped if it has not started (or if on_cancel can stop it)
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+        if self.on_cancel is not None:
+            self.on_cancel()
+
+
+class WorkerPool:
+    # How often the Tk thread checks for finished jobs while any are outstanding
+    POLL_MS = 50
+
+    def __init__(self, root, threads=2, processes=1):
+        self.root = root
+        self._threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="task-worker")
+        self._process_count = processes
+        self._processes = None          # started on the first cpu=True job
+        self._finished = queue.Queue()  # jobs whose future is done, filled from worker threads
+        self._latest = {}               # key -> the only job with that key whose result is still wanted
+        self._outstanding = 0
+        self._timer = None
+
+    # Run fn(*args) in the background and call on_done(result) or on_error(exception) on the Tk thread.
+    # A new job with the same key supersedes the old one ("latest wins"): the old result is never delivered.
+    # cpu=True uses a process pool, so fn and its arguments must be picklable module-level objects.
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None, cpu=False, on_cancel=None):
+        job = Job(key, on_done, on_error, on_cancel)
+        if key is not None:
+            old = self._latest.get(key)
+            if old is not None:
+                old.cancel()
+            self._latest[key] = job
+        job.future = self._executor(cpu).submit(fn, *args)
+        self._outstanding += 1
+        job.future.add_done_callback(lambda future: self._finished.put(job))
+        if self._timer is None:
+            self._timer = self.root.after(self.POLL_MS, self._drain)
+        return job
+
+    def cancel(self, key):
+        job = self._latest.pop(key, None)
+        if job is not None:
+            job.cancel()
+
+    def busy(self, key):
+        return key in self._latest
+
+    def _executor(self, cpu):
+        if not cpu or not self._process_count:
+            return self._threads
+        if self._processes is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: a forked copy of a process holding a Tk/X connection is not safe
+            self._processes = ProcessPoolExecutor(max_workers=self._process_count,
+                                                  mp_context=multiprocessing.get_context("spawn"))
+        return self._processes
+
+    # On the Tk thread: deliver results of finished jobs that are still wanted
+    def _drain(self):
+        self._timer = None
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            if job.key is not None and self._latest.get(job.key) is job:
+                del self._latest[job.key]
+            if job.cancelled:
+                continue
+            try:
+                result = job.future.result()
+            except CancelledError:
+                continue
+            except Exception as e:
+                if job.on_error is not None:
+                    job.on_error(e)
+                else:
+                    traceback.print_exception(e)
+                continue
+            if job.on_done is not None:
+                job.on_done(result)
+        if self._outstanding:
+            self._timer = self.root.after(self.POLL_MS, self._drain)
+
+    # Cancel everything still queued; running thread work finishes on its own (threads are not killed)
+    def shutdown(self):
+        for job in list(self._latest.values()):
+            job.cancel()
+        self._latest.clear()
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)